@@ -0,0 +1,124 @@
+from simpleeval import simple_eval
+
+from backend.runner import RunArgs, Runner
+from backend.results import RunLog
+from backend.cache import ResultCache, getConfigHash, getParetoFront
+from backend.seeding import getSeedKey
+from utils.defines import (PARAMETERS_ARGS_DICT, OPERATORS, CLASS_KEY, CONVERT_KEY, WRITABLE_ARG_KEY, PROB_KEY, ALGO_KEY,
+                           PI_KEY, TERM_KEY, SEEDS_KEY, MOO_KEY, RUN_OPTIONS_KEYS, RESULT_CACHE_FOLDER, RESULT_CACHE_MAX_SIZE,
+                           RECORDING_POLICY, DEFER_PI_COMPUTATION, PROFILE_PHASES)
+
+def convertString(string: str, convert_dict: dict):
+    """Convert a string with the convertible keys (see CONVERTIBLES) to its value, evaluating the mathematical expression
+    if needed (e.g. 'n_obj' -> 3, 'n_var*2' -> 20). Raises an exception if the expression is not valid"""
+
+    for key, value in convert_dict.items():
+        if string == key:
+            return value
+        elif key in string:
+            string = string.replace(key, str(value))
+
+    return simple_eval(string)
+
+def getObjectFromID(parameters: dict, key: str, object_id: str, convert_dict: dict):
+    """Get the object with the given ID from the parameters dictionary (as returned by EditWindow.tabsToDict or
+    Defaults), the same way EditTab.getObjectFromID gets it from the table, without any widgets"""
+
+    if object_id not in parameters[key]:
+        raise ValueError(f"Object ID '{object_id}' not found in the '{key}' parameters")
+
+    get_function = PARAMETERS_ARGS_DICT[key][2]
+    args_dict = {}
+    for arg, value in parameters[key][object_id].items():
+        if arg == CLASS_KEY:
+            continue
+        arg = arg[:-len(WRITABLE_ARG_KEY)] if arg.endswith(WRITABLE_ARG_KEY) else arg
+
+        # OPERATOR
+        if key == ALGO_KEY and arg in OPERATORS:
+            value = getObjectFromID(parameters, arg, value, convert_dict)
+        elif isinstance(value, str):
+            # IGNORE EMPTY STRING ARGS
+            if value == '':
+                continue
+            # NONE
+            elif value == 'None':
+                value = None
+            # CONVERT STRING
+            elif value.endswith(CONVERT_KEY):
+                value = convertString(value[:-len(CONVERT_KEY)], convert_dict)
+        args_dict[arg] = value
+
+    try:
+        return get_function(parameters[key][object_id][CLASS_KEY], **args_dict) #@IgnoreException
+    except Exception as e:
+        raise ValueError(f"Error trying to get '{object_id}' from the '{key}' parameters:\n{e}") from e
+
+def getRunArgsList(run_options: dict, parameters: dict, use_cache: bool = False, recording: tuple = RECORDING_POLICY,
+                   defer_pis: bool = DEFER_PI_COMPUTATION, profile: bool = PROFILE_PHASES) -> list:
+    """Get the RunArgs of every (problem, algorithm) pair in the run options (as returned by
+    MainTabsWidget.tablesToDict), the same way MainTabsWidget.getRunThread gets them from the tables.
+    If use_cache, the RunArgs have the config_hash used by the ResultCache. The recording is the policy of the
+    callback, defer_pis whether it computes the performance indicators after the run (see MyCallback) and profile
+    whether the phases of the generations are timed (see backend/profiling.py)"""
+
+    for key in [PROB_KEY, ALGO_KEY, PI_KEY, TERM_KEY]:
+        if len(run_options.get(key, [])) == 0:
+            raise ValueError(f"The run options must have at least one '{key}' ID")
+        if len(run_options[key]) != len(set(run_options[key])):
+            raise ValueError(f"The '{key}' IDs of the run options must be different")
+
+    term_id = run_options[TERM_KEY][0]
+    pi_ids = list(run_options[PI_KEY])
+    run_args_list = []
+
+    # PROBLEMS
+    for prob_id in run_options[PROB_KEY]:
+        convert_dict = {} # dictionary to convert the arguments of the classes to the correct values
+        prob_object = getObjectFromID(parameters, PROB_KEY, prob_id, convert_dict)
+
+        n_var = prob_object.n_var if hasattr(prob_object,'n_var') else None
+        n_obj = prob_object.n_obj if hasattr(prob_object,'n_obj') else None
+        convert_dict.update({'n_obj':n_obj,'n_var':n_var,'prob_id':prob_id, 'prob_object':prob_object})
+        # the reference pareto front of the problem, the same for all its algorithms (see getParetoFront)
+        pf = getParetoFront(prob_object)
+
+        # ALGOS
+        for algo_id in run_options[ALGO_KEY]:
+            algo_object = getObjectFromID(parameters, ALGO_KEY, algo_id, convert_dict)
+
+            convert_dict.update({'prob_pf':pf,'algo_id':algo_id,'algo_object':algo_object,'get_problem_pf':pf})
+
+            # TERMINATIONS
+            term_object = getObjectFromID(parameters, TERM_KEY, term_id, convert_dict)
+            convert_dict.update({'term_id':term_id,'term_object':term_object})
+
+            # PERFORMANCE INDICATORS
+            pi_objects = [getObjectFromID(parameters, PI_KEY, pi_id, convert_dict) for pi_id in pi_ids]
+
+            config_hash = getConfigHash(parameters, prob_id, algo_id, term_id, pi_ids, recording, defer_pis, profile) if use_cache else None
+            seed_key = getSeedKey(parameters, prob_id, algo_id)
+            run_args_list.append(RunArgs(prob_id, prob_object, algo_id, algo_object, pi_ids, pi_objects, term_object, config_hash, 
+                                         seed_key, recording, defer_pis, profile))
+
+    return run_args_list
+
+def getRunner(run_options: dict, parameters: dict, runner_class: type = Runner, fixed_seeds: bool = True, n_workers: int = 1,
+              run_log: RunLog = None, use_cache: bool = False, shard: tuple = None, recording: tuple = RECORDING_POLICY, 
+              defer_pis: bool = DEFER_PI_COMPUTATION, profile: bool = PROFILE_PHASES, **kwargs) -> Runner:
+    """Get the Runner (or subclass of Runner, with the extra kwargs) of the run defined by the run options and
+    parameters dictionaries, without any widgets"""
+
+    missing_keys = set(RUN_OPTIONS_KEYS) - set(run_options.keys())
+    if missing_keys:
+        raise ValueError(f"The run options are missing the keys {sorted(missing_keys)}")
+    if run_options.get(MOO_KEY, parameters[MOO_KEY]) != parameters[MOO_KEY]:
+        raise ValueError("The run options and the parameters do not match in MOO/SOO mode")
+
+    moo = parameters[MOO_KEY]
+    run_options = {**run_options, MOO_KEY: moo}
+    run_args_list = getRunArgsList(run_options, parameters, use_cache, recording, defer_pis, profile)
+    result_cache = ResultCache(RESULT_CACHE_FOLDER, RESULT_CACHE_MAX_SIZE) if use_cache else None
+
+    return runner_class(run_args_list, run_options[TERM_KEY][0], run_options[SEEDS_KEY], moo, parameters, run_options,
+                        fixed_seeds, n_workers, run_log, result_cache, shard, **kwargs)
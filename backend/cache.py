@@ -0,0 +1,221 @@
+import os
+import json
+import pickle
+import hashlib
+import threading
+
+import numpy as np
+
+from utils.defines import (PROB_KEY, ALGO_KEY, TERM_KEY, PI_KEY, CLASS_KEY, REF_DIR_KEY, OPERATORS, RESULT_CACHE_EXCLUDED_PROBLEMS,
+                           RECORD_EVERY_GEN, PF_CACHE_FOLDER, USE_PF_CACHE, SAMP_KEY, SURV_KEY, SEL_KEY, CROSS_KEY, MUT_KEY,
+                           DECOMP_KEY)
+
+def stableHash(obj) -> str:
+    """Hash of a json serializable object that is the same across sessions (unlike the built-in hash)"""
+
+    string = json.dumps(obj, sort_keys=True, default=repr)
+    return hashlib.sha1(string.encode()).hexdigest()
+
+def loadArray(path: str):
+    """Get the 2D array of the .npy file memory-mapped (read-only), None if there is no valid file"""
+
+    try:
+        array = np.load(path, mmap_mode='r') #@IgnoreException
+    except (OSError, ValueError):
+        return None
+    # a plain ndarray view of the mapped file, so it is not told apart from the computed arrays
+    return np.asarray(array) if array.ndim == 2 else None
+
+def saveArray(path: str, array: np.ndarray):
+    """Write the array to the .npy file. Nothing is written if the folder can not be written"""
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True) #@IgnoreException
+        # written to a temporary file and renamed, so another process never reads half a file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            np.save(file, np.ascontiguousarray(array))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def getAlgorithmEntry(parameters: dict, algo_id: str) -> dict:
+    """Get the entry of the algorithm in the parameters with the ids of its operators replaced by their entries"""
+
+    return {arg: parameters[arg][value] if arg in OPERATORS and value in parameters.get(arg, {}) else value
+            for arg, value in parameters[ALGO_KEY][algo_id].items()}
+
+def getClassSources(parameters: dict, prob_id: str, algo_id: str, term_id: str, pi_ids: list) -> dict:
+    """Get the source hash (see getClassSourceHash in backend/get.py) of the classes of the problem, algorithm, its
+    operators, termination and performance indicators that are from this repository, by parameters key"""
+    from backend.get import (getClassSourceHash, PROBLEMS, ALGORITHMS, SAMPLINGS, SURVIVALS, SELECTIONS, CROSSOVERS,
+                             MUTATIONS, DECOMPOSITIONS, REFERENCE_DIRECTIONS, TERMINATIONS, PERFORMANCE_INDICATORS)
+
+    registries = {SAMP_KEY: SAMPLINGS, SURV_KEY: SURVIVALS, SEL_KEY: SELECTIONS, CROSS_KEY: CROSSOVERS, MUT_KEY: MUTATIONS,
+                  DECOMP_KEY: DECOMPOSITIONS, REF_DIR_KEY: REFERENCE_DIRECTIONS}
+    entries = {PROB_KEY: (PROBLEMS, parameters[PROB_KEY][prob_id]), ALGO_KEY: (ALGORITHMS, parameters[ALGO_KEY][algo_id]),
+               TERM_KEY: (TERMINATIONS, parameters[TERM_KEY][term_id])}
+    entries.update({arg: (registries[arg], parameters[arg][value]) for arg, value in parameters[ALGO_KEY][algo_id].items()
+                    if arg in OPERATORS and value in parameters.get(arg, {})})
+    entries.update({f"{PI_KEY}_{i}": (PERFORMANCE_INDICATORS, parameters[PI_KEY][pi_id]) for i, pi_id in enumerate(pi_ids)})
+
+    sources = {key: getClassSourceHash(registry, entry[CLASS_KEY]) for key, (registry, entry) in entries.items()}
+    return {key: source for key, source in sources.items() if source is not None}
+
+def getConfigHash(parameters: dict, prob_id: str, algo_id: str, term_id: str, pi_ids: list, recording: tuple = None, 
+                  defer_pis: bool = False, profile: bool = False):
+    """Get the hash of the parameters that define the results of a (problem, algorithm) pair for any seed: the
+    problem, algorithm (with its operators), termination and performance indicators entries of the parameters,
+    the source of their classes that are from this repository, the recording policy of the callback, whether the
+    indicators are deferred or the phases profiled and the pymoo version. The ids are not used, so renaming an entry
+    does not change its hash.
+    Returns None if the problem is generated at random without a seed, since its results can not be reused"""
+
+    from pymoo import __version__ as pymoo_version
+
+    prob = parameters[PROB_KEY][prob_id]
+    if prob[CLASS_KEY] in RESULT_CACHE_EXCLUDED_PROBLEMS and prob.get('seed') in (None, 'None', ''):
+        return None
+
+    config = {'pymoo': pymoo_version,
+              PROB_KEY: prob,
+              ALGO_KEY: getAlgorithmEntry(parameters, algo_id),
+              TERM_KEY: parameters[TERM_KEY][term_id],
+              PI_KEY: [parameters[PI_KEY][pi_id] for pi_id in pi_ids]}
+    # only added if it is not the default, so the hashes of the results cached before it existed do not change
+    if recording is not None and recording[0] != RECORD_EVERY_GEN:
+        config['recording'] = list(recording)
+    # deferred indicators are computed from float32 snapshots, so their values are not exactly the same
+    if defer_pis:
+        config['defer_pis'] = True
+    # the indicators use the default front of the problem (see getParetoFront), while before they used the front of the
+    # ref_dirs of the first algorithm of the run, so the results of algorithms with ref_dirs cached before are not reused
+    if REF_DIR_KEY in config[ALGO_KEY]:
+        config['pf'] = 'default'
+    # profiled results have the times of the phases as extra columns
+    if profile:
+        config['profile'] = True
+    # editing a class of this repository changes its results, only added if there are any so the hashes of the
+    # results of pymoo classes do not change
+    sources = getClassSources(parameters, prob_id, algo_id, term_id, pi_ids)
+    if sources:
+        config['sources'] = sources
+
+    return stableHash(config)
+
+class ResultCache():
+    """
+        On-disk cache of the results of (problem, algorithm, seed) units, so that a unit that was already run with
+        the same parameters does not need to call minimize again.
+
+        Each entry is a pickle file with the callback data, X, F, front snapshots (if any) and resources of the unit, named after the hash of the
+        configuration of the unit (see getConfigHash) and the seed. When the files in the folder exceed max_size
+        bytes, the least recently used entries are removed. Reading an entry updates its modification time,
+        which is used as the time of the last use.
+
+        Important Methods
+        -----------------
+        - get(config_hash, seed) -> tuple: The (callback_data, X, F, snapshots, resources) of the unit, or None if it is not in the cache.
+        - put(config_hash, seed, callback_data, X, F, snapshots, resources): Stores the unit and removes the least recently used entries.
+    """
+    def __init__(self, folder: str, max_size: int):
+        self.folder = os.path.abspath(folder)
+        self.max_size = max_size
+
+    def path(self, config_hash: str, seed: int):
+        return os.path.join(self.folder, f"{stableHash([config_hash, int(seed)])}.pickle")
+
+    def get(self, config_hash: str, seed: int):
+
+        path = self.path(config_hash, seed)
+        try:
+            with open(path, 'rb') as file: #@IgnoreException
+                result = pickle.load(file)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        return result
+
+    def put(self, config_hash: str, seed: int, callback_data: dict, X, F, snapshots=None, resources: dict = None):
+
+        os.makedirs(self.folder, exist_ok=True)
+        path = self.path(config_hash, seed)
+        tmp_path = path + f'.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as file:
+            pickle.dump((callback_data, X, F, snapshots, resources), file)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache is smaller than max_size"""
+
+        entries = []
+        for entry in os.scandir(self.folder):
+            if entry.name.endswith('.pickle'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path) #@IgnoreException
+            except OSError:
+                pass
+            size -= entry_size
+
+PARETO_FRONTS = {} # hash of the problem (see getParetoFrontHash) -> pareto front, shared by the runs and plots of a process
+PARETO_FRONTS_LOCK = threading.Lock()
+
+def getParetoFrontHash(prob_object):
+    """Get the hash of the default pareto front of the problem: the ID and arguments the problem was created with (see
+    get_problem in backend/get.py), the source of its class if it is from this repository and the pymoo version. Returns None if the problem was not created by get_problem or is generated at random without a
+    seed, since then its arguments do not define it"""
+    from pymoo import __version__ as pymoo_version
+    from backend.get import getSourceHash
+
+    constructor = getattr(prob_object, 'constructor', None)
+    if constructor is None:
+        return None
+    prob_id, args, kwargs = constructor
+    if prob_id in RESULT_CACHE_EXCLUDED_PROBLEMS and kwargs.get('seed') in (None, 'None', ''):
+        return None
+
+    return stableHash({'pymoo': pymoo_version,
+                       'class': f"{type(prob_object).__module__}:{type(prob_object).__qualname__}",
+                       'source': getSourceHash(type(prob_object).__module__),
+                       'problem': [prob_id, list(args), kwargs]})
+
+def getParetoFront(prob_object, folder: str = PF_CACHE_FOLDER):
+    """Get the default pareto front of the problem, the same as its pareto_front method, only computed the first time,
+    since pymoo keeps the first front of the problem object (see pymoo.util.cache.Cache). The runs and plots use it as
+    the reference front of each problem, so all the algorithms of a problem are compared with the same front, whatever
+    their ref_dirs and the other algorithms of the run.
+    With USE_PF_CACHE each front is computed once for each problem: it is kept in memory for the process and saved as a
+    .npy file in the folder, memory-mapped (read-only) when loaded. The fronts are read-only, since they are shared"""
+
+    problem_cache = prob_object.__dict__.get('cache', {})
+    pf_hash = getParetoFrontHash(prob_object) if USE_PF_CACHE and 'pareto_front' not in problem_cache else None
+    if pf_hash is None:
+        return prob_object.pareto_front()
+
+    with PARETO_FRONTS_LOCK:
+        cached, pf = pf_hash in PARETO_FRONTS, PARETO_FRONTS.get(pf_hash)
+    if not cached:
+        path = os.path.join(folder, f"{pf_hash}.npy")
+        pf = loadArray(path)
+        if pf is None:
+            pf = prob_object.pareto_front(use_cache=False, set_cache=False)
+            if pf is not None:
+                saveArray(path, pf)
+                pf = pf.view()
+                pf.flags.writeable = False
+        with PARETO_FRONTS_LOCK:
+            pf = PARETO_FRONTS.setdefault(pf_hash, pf)
+
+    # kept as the front of the problem object, as if pymoo had computed it
+    prob_object.__dict__.setdefault('cache', {})['pareto_front'] = pf
+    return pf
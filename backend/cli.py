@@ -0,0 +1,229 @@
+"""
+    Command line runner, to run the (problem, algorithm, seed) units of a run without the app (and without Qt),
+    e.g. on headless compute nodes.
+
+    The run is defined by a run options file, as saved by 'Save Run Options' in the Run Tab, and optionally a parameters
+    file, as saved by 'Save Parameters' in the Edit Window. Without a parameters file, the Defaults are used.
+    The result is saved in the format of 'Save Run' of the History Tab, so it can be opened with 'Load Run'.
+
+    Large runs can be split in shards, e.g. one for each task of a cluster job array, and the saved shards merged afterwards.
+
+    Usage examples:
+        python -m backend.cli moo_run_options.pickle -p moo_parameters.pickle -o moo_run.pickle --workers 8
+        python -m backend.cli --resume run_logs/moo_run_2024-01-01_12-00-00_000000 -o moo_run.pickle
+        python -m backend.cli moo_run_options.pickle --shard 3/10 -o shards/moo_run_3.pickle
+        python -m backend.cli --merge shards/*.pickle -o moo_run.pickle
+        python -m backend.cli --resume run_logs/moo_run_2024-01-01_12-00-00_000000 --add-indicators igd -o moo_run.pickle
+        python -m backend.cli moo_run_options.pickle --profile --csv moo_run.csv
+"""
+import os
+import sys
+import pickle
+import argparse
+
+from backend.runner import Runner
+from backend.build import getRunner, getRunArgsList
+from backend.results import RunLog, getRunLogFolder, getSavedRun, mergeRuns
+from utils.defines import (MOO_KEY, SEEDS_KEY, PROB_KEY, ALGO_KEY, N_WORKERS, SAVE_RUN_LOGS, USE_RESULT_CACHE, UNIT_RETRIES,
+                           RECORDING_POLICY, RECORDING_POLICIES, RECORD_EVERY_GEN, DEFER_PI_COMPUTATION, PROFILE_PHASES, PI_KEY)
+
+class CommandLineRunner(Runner):
+    """Runner that prints the progress to the terminal"""
+    def __init__(self, *args, quiet: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.quiet = quiet
+        self.error = None
+
+    def emitProgress(self, text: str, percentage: float):
+        if percentage == -1:
+            self.error = text
+            print(text, file=sys.stderr, flush=True)
+        elif not self.quiet:
+            print(f"{percentage:5.1f}% - {text}", flush=True)
+
+def loadPickle(file_path: str) -> dict:
+    with open(file_path, 'rb') as file:
+        loaded = pickle.load(file)
+    if isinstance(loaded, dict) and isinstance(loaded.get('data'), RunLog):
+        # the folder of the RunLog of a run log header is relative to the file
+        loaded['data'] = loaded['best_gen'] = loaded['data'].relativeTo(file_path)
+    return loaded
+
+def saveRun(runner: Runner, file_path: str):
+    """Save the run as 'Save Run' in the app does (see getSavedRun), so the file does not depend on the run log"""
+
+    with open(file_path, 'wb') as file:
+        pickle.dump(getSavedRun(runner), file)
+
+def parseShard(string: str) -> tuple:
+    """Parse a shard 'i/n' into (i, n), with 0 <= i < n"""
+    try:
+        shard_index, n_shards = (int(value) for value in string.split('/')) #@IgnoreException
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid shard '{string}', it must be 'i/n', e.g. 0/4")
+    if not 0 <= shard_index < n_shards:
+        raise argparse.ArgumentTypeError(f"invalid shard '{string}', the shard index must be between 0 and n-1")
+    return shard_index, n_shards
+
+def parseRecording(string: str) -> tuple:
+    """Parse a recording policy 'policy[:k]' into (policy, k), e.g. 'log_spaced:10' -> ('log_spaced', 10)"""
+    policy, _, k = string.partition(':')
+    if policy not in RECORDING_POLICIES:
+        raise argparse.ArgumentTypeError(f"invalid recording policy '{policy}', it must be one of {', '.join(RECORDING_POLICIES)}")
+    if policy == RECORD_EVERY_GEN:
+        return policy, None
+    try:
+        k = int(k) #@IgnoreException
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid recording '{string}', the policy '{policy}' needs a positive integer k, e.g. {policy}:10")
+    if k < 1:
+        raise argparse.ArgumentTypeError(f"invalid recording '{string}', k must be a positive integer")
+    return policy, k
+
+def merge(file_paths: list, output: str, quiet: bool = False):
+    """Merge the saved runs (or run log folders) of the shards of a run into one saved run"""
+
+    runs = []
+    for file_path in file_paths:
+        if os.path.isdir(file_path):
+            file_path = RunLog(file_path).path(RunLog.HEADER_FILE)
+        runs.append(loadPickle(file_path))
+    merged = mergeRuns(runs)
+    with open(output, 'wb') as file:
+        pickle.dump(merged, file)
+
+    n_units = len(merged['run_options'][PROB_KEY]) * len(merged['run_options'][ALGO_KEY]) * merged['run_options'][SEEDS_KEY]
+    if not quiet:
+        print(f"Merged {merged['run_counter']} of {n_units} runs from {len(runs)} files into '{output}'")
+    if merged['run_counter'] < n_units:
+        print(f"Warning: {n_units - merged['run_counter']} runs are missing from the merged files", file=sys.stderr)
+
+def getParser() -> argparse.ArgumentParser:
+
+    parser = argparse.ArgumentParser(prog="python -m backend.cli", description="Run the optimization without the app.")
+    parser.add_argument('run_options', nargs='?', help="run options file, as saved by 'Save Run Options'")
+    parser.add_argument('-p', '--parameters', help="parameters file, as saved by 'Save Parameters'. The Defaults are used if not given")
+    parser.add_argument('-o', '--output', help="file to save the run, that can be opened with 'Load Run'")
+    parser.add_argument('--csv', help="file to save the data of the run as csv")
+    parser.add_argument('-s', '--seeds', type=int, help="number of seeds, instead of the one in the run options")
+    parser.add_argument('--random-seeds', action='store_true', help="use random seeds instead of 0, 1, ..., n_seeds-1")
+    parser.add_argument('-w', '--workers', type=int, default=N_WORKERS, help=f"number of processes (default {N_WORKERS})")
+    parser.add_argument('--resume', metavar='RUN_LOG', help="resume the interrupted run of the given run log folder")
+    parser.add_argument('--shard', type=parseShard, help="only run the shard i/n of the run (units with index %% n == i)")
+    parser.add_argument('--merge', nargs='+', metavar='RUN', help="merge the saved runs or run log folders of the shards of a run into --output")
+    parser.add_argument('--retries', type=int, default=UNIT_RETRIES, help=f"times a failed unit is run again with another seed (default {UNIT_RETRIES})")
+    parser.add_argument('--stop-on-error', action='store_true', help="stop the run when a unit fails, instead of running the other units")
+    parser.add_argument('--errors', help="file to save the errors of the failed units as csv")
+    parser.add_argument('--resources', help="file to save the resources used by each unit (wall and cpu time, peak memory, "
+                        "evaluations per second) as csv")
+    parser.add_argument('--record', type=parseRecording, metavar='POLICY[:K]', help="generations recorded in the data: "
+                        "'every_gen', 'every_k_evals:K', 'log_spaced:K' (K points per decade of evaluations) or 'n_points:K' "
+                        f"(default {RECORDING_POLICY[0]})")
+    parser.add_argument('--defer-pis', action='store_true', help="store front snapshots and compute the performance indicators after "
+                        "each run, so more can be added later with --add-indicators")
+    parser.add_argument('--profile', action='store_true', help="record the wall and cpu time of the phases of each generation "
+                        "(evaluation, mating, survival, callback) as extra columns of the data, and print their share of the time")
+    parser.add_argument('--add-indicators', nargs='+', metavar='PI', help="compute these performance indicators (ids of the parameters) "
+                        "for the run of --resume from its front snapshots, without running it again")
+    parser.add_argument('--no-log', action='store_true', help="do not write a run log")
+    parser.add_argument('--no-cache', action='store_true', help="do not use the result cache")
+    parser.add_argument('-q', '--quiet', action='store_true', help="do not print the progress")
+
+    return parser
+
+def main(argv: list = None):
+
+    parser = getParser()
+    args = parser.parse_args(argv)
+    use_cache = USE_RESULT_CACHE and not args.no_cache
+    if args.merge is not None:
+        if args.output is None:
+            parser.error("--merge needs an --output file")
+        try:
+            merge(args.merge, args.output, args.quiet)
+        except (OSError, EOFError, pickle.UnpicklingError, KeyError, ValueError) as e:
+            parser.error(f"could not merge the runs: {e}")
+        return 0
+    if args.resume is None and args.run_options is None:
+        parser.error("a run options file or --resume is required")
+    if args.add_indicators is not None and args.resume is None:
+        parser.error("--add-indicators needs the run log of a run with deferred indicators in --resume")
+    if args.shard is not None and args.random_seeds:
+        parser.error("--shard needs fixed seeds, so that all the shards use the same ones")
+
+    try:
+        if args.resume is not None:
+            # the run options and parameters are the ones of the interrupted run
+            run_log = RunLog(args.resume)
+            header = loadPickle(run_log.path(RunLog.HEADER_FILE))
+            run_options, parameters = header['run_options'], header['parameters']
+            recording = header.get('recording') or RECORDING_POLICY
+            defer_pis = header.get('defer_pis', False)
+            profile = header.get('profile', False)
+        else:
+            run_options = loadPickle(args.run_options)
+            if args.parameters is not None:
+                parameters = loadPickle(args.parameters)
+            else:
+                from backend.defaults import Defaults
+                parameters = Defaults(run_options.get(MOO_KEY, False), plot_types=False).parameters
+            if args.seeds is not None:
+                run_options = {**run_options, SEEDS_KEY: args.seeds}
+            run_log = None if args.no_log or not SAVE_RUN_LOGS else RunLog(getRunLogFolder(parameters[MOO_KEY]))
+            recording, defer_pis, profile = RECORDING_POLICY, DEFER_PI_COMPUTATION, PROFILE_PHASES
+        defer_pis = defer_pis or args.defer_pis
+        profile = profile or args.profile
+        if args.record is not None:
+            recording = args.record
+    except (OSError, EOFError, pickle.UnpicklingError, KeyError) as e:
+        parser.error(f"could not load the run: {e}")
+
+    try:
+        runner = getRunner(run_options, parameters, CommandLineRunner, not args.random_seeds, args.workers, run_log, use_cache, 
+                           args.shard, recording, defer_pis, profile, quiet=args.quiet, retries=args.retries, 
+                           stop_on_error=args.stop_on_error)
+    except Exception as e:
+        print(f"Error while getting the run objects:\n{e}", file=sys.stderr)
+        return 2
+    if args.resume is not None:
+        runner.loadRunLog(run_log, resume=True)
+    if run_log is not None and not args.quiet:
+        print(f"Writing the run log to '{run_log.folder}'", flush=True)
+
+    try:
+        runner.run()
+    except KeyboardInterrupt:
+        runner.cancel()
+        print("Run interrupted." + (f" Resume it with --resume {run_log.folder}" if run_log is not None else ""), file=sys.stderr)
+        return 130
+
+    if runner.error is not None:
+        return 1
+    if runner.errors:
+        print(runner.getErrorsMessage(), file=sys.stderr)
+    if profile and not args.quiet:
+        print(f"Time: {runner.getTimeSummary()}", flush=True)
+    if args.add_indicators is not None:
+        try:
+            # the indicators can also be new entries of a parameters file
+            if args.parameters is not None:
+                parameters = {**parameters, PI_KEY: {**parameters[PI_KEY], **loadPickle(args.parameters)[PI_KEY]}}
+            runner.addIndicators(getRunArgsList({**run_options, PI_KEY: args.add_indicators}, parameters)) #@IgnoreException
+            runner.parameters = parameters
+        except Exception as e:
+            print(f"Error while adding the performance indicators:\n{e}", file=sys.stderr)
+            return 2
+
+    if args.output is not None:
+        saveRun(runner, args.output)
+    if args.csv is not None:
+        runner.data.to_csv(args.csv, index=False)
+    if args.errors is not None:
+        runner.getErrorTable().to_csv(args.errors, index=False)
+    if args.resources is not None:
+        runner.resources.to_csv(args.resources, index=False)
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
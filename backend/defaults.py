@@ -1,9 +1,56 @@
+import os
+import pickle
+import hashlib
 import inspect
 
 from utils.defines import (NO_DEFAULT, OPERATORS, VALUE_TYPES, PARAMETERS_ARGS_DICT, MUT_KEY, CROSS_KEY, CLASS_KEY, MOO_KEY,
                            SEL_KEY, SAMP_KEY, DECOMP_KEY, REF_DIR_KEY, PROB_KEY, ALGO_KEY, PI_KEY, TERM_KEY, SEEDS_KEY, 
-                           CONVERT_KEY)
+                           CONVERT_KEY, PLOT_TYPES_KEY, DEFAULTS_SNAPSHOT_FOLDER, USE_DEFAULTS_SNAPSHOT)
 from utils.utils import debug_print
+
+def getSnapshotPath(moo: bool, folder: str = DEFAULTS_SNAPSHOT_FOLDER) -> str:
+    """Get the path of the snapshot of the tables of default parameters, named after a hash of the pymoo version, the
+    registries of backend/get.py (see getRegistryHash) and this file, so a new one is generated when any of them changes"""
+    from pymoo import __version__ as pymoo_version
+    from backend.get import getRegistryHash
+    from backend.cache import stableHash
+
+    with open(os.path.abspath(__file__), 'rb') as file:
+        source = hashlib.sha1(file.read()).hexdigest()
+    snapshot_hash = stableHash({'pymoo': pymoo_version, 'registries': getRegistryHash(), 'defaults': source})
+
+    return os.path.join(folder, f"{'moo' if moo else 'soo'}_{snapshot_hash}.pickle")
+
+def loadSnapshot(path: str) -> dict:
+    """Get the tables of the snapshot (key -> table), empty if there is no valid snapshot"""
+
+    try:
+        with open(path, 'rb') as file: #@IgnoreException
+            tables = pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return {}
+
+    return tables if isinstance(tables, dict) else {}
+
+def saveSnapshot(path: str, tables: dict):
+    """Write the tables to the snapshot, removing the older snapshots of the same kind (soo or moo). Nothing is written
+    if the folder can not be written"""
+
+    folder, name = os.path.split(path)
+    prefix = name.split('_')[0] + '_'
+    try:
+        os.makedirs(folder, exist_ok=True) #@IgnoreException
+        # written to a temporary file and renamed, so another process never reads half a snapshot
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            pickle.dump(tables, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        for old_name in os.listdir(folder):
+            if old_name.startswith(prefix) and old_name.endswith('.pickle') and old_name != name:
+                os.remove(os.path.join(folder, old_name))
+    except OSError:
+        pass
+
 class Defaults():
     """
     This class is used to set up default values for various parameters in an optimization problem. 
@@ -20,17 +67,34 @@ class Defaults():
     Class arguments that call as a default value a function or other class are ommited in the app, and then called with their default value.
     The exception is if the argument is an operator the OPERATORS list. In that case, the value will be set to the ID of the
     correspondent operator, so it later can be retrived.
+    
+    If 'plot_types' is False, the plot types are not included, so that the frontend (and Qt) is not imported in headless runs.
+
+    Inspecting the signatures of all the classes is slow, so with USE_DEFAULTS_SNAPSHOT the tables of each key (before
+    the manual changes below) are kept in a snapshot in DEFAULTS_SNAPSHOT_FOLDER (see getSnapshotPath), and only the
+    tables missing from it are generated (and added to it).
     """
-    def __init__(self, moo: bool): 
+    def __init__(self, moo: bool, plot_types: bool = True): 
         
         self.get_str = 'moo_options' if moo else 'soo_options' 
         
         self.parameters = {}
         self.parameters[MOO_KEY] = moo
         self.get_dict = {}
+        snapshot_path = getSnapshotPath(moo) if USE_DEFAULTS_SNAPSHOT else None
+        tables = loadSnapshot(snapshot_path) if snapshot_path else {}
+        missing = False
         for key, (_, _, get_function) in PARAMETERS_ARGS_DICT.items():
-            self.parameters[key] = self.get_table_dict(get_function(self.get_str))
+            if key == PLOT_TYPES_KEY and not plot_types:
+                continue
             self.get_dict[key] = get_function
+            if key not in tables:
+                tables[key] = self.get_table_dict(get_function(self.get_str))
+                missing = True
+        if snapshot_path and missing:
+            saveSnapshot(snapshot_path, tables)
+        # the tables of the snapshot are only read here, so they are changed below without a copy
+        self.parameters.update({key: tables[key] for key in self.get_dict})
                                       
         # manualy changed MOO defaults
         if self.parameters[MOO_KEY]:
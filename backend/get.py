@@ -1,482 +1,421 @@
-def returnObjectOrOptions(name, single_dict, multi_dict, *args, **kwargs):
-    name = name.lower()
-
-    merged_dict = {**single_dict, **multi_dict}
-    
-    if name == "all_options":
-        return merged_dict
-    elif name == "soo_options":
-        return single_dict
-    elif name == "moo_options":
-        return multi_dict    
-    elif name in merged_dict:
-         return merged_dict[name](*args, **kwargs) 
-    else:
-        raise Exception("Object '%s' for not found in %s. If you want options, call with 'all_options', 'all_soo_options' or 'all_moo_options'" % (name, list(merged_dict.keys())))
-    
+"""
+    ID -> class maps of the objects of the app, one Registry for each kind of object, used through the get_* functions:
+
+    - get_*(object_id, *args, **kwargs): An object of the class of the ID, created with the args.
+    - get_*('soo_options' / 'moo_options' / 'all_options'): The ID -> class dict of the single, multi or all objectives.
+
+    The classes are declared by their import path, 'module:Class', and each one is only imported when its ID is first
+    requested (or an options dict that has it), then kept, so the get_* functions (called for each object of each unit
+    when a run is built, and by the Defaults and the edit window) do not run the imports or build the dicts every time.
+"""
+import os
+import hashlib
+import importlib
+import threading
+
+class Registry():
+    """
+        ID -> class map of one kind of object, with the IDs of the single and multi objective classes (the same ID can
+        be in both, with the class of the multi objective one when they are merged).
+
+        Attributes
+        ----------
+        - single, multi: ID -> import path ('module:Class') of the single and multi objective classes.
+        - classes: Import path -> class, of the classes already imported.
+
+        Important Methods
+        -----------------
+        - get(name, *args, **kwargs): The options dict if the name is an options query, otherwise an object of the
+        class of the ID, created with the args.
+        - getClass(object_id) -> type: The class of the ID, imported the first time.
+        - getOptions(query) -> dict: A copy of the ID -> class dict of 'soo_options', 'moo_options' or 'all_options'.
+    """
+    OPTIONS = ('soo_options', 'moo_options', 'all_options')
+
+    def __init__(self, single: dict, multi: dict):
+        self.single = single
+        self.multi = multi
+        self.merged = {**single, **multi}
+        self.classes = {}
+        self.options = {} # options query -> ID -> class, built the first time they are asked
+
+    def get(self, name: str, *args, **kwargs):
+
+        name = name.lower()
+        if name in self.OPTIONS:
+            return self.getOptions(name)
+        return self.getClass(name)(*args, **kwargs)
+
+    def getClass(self, object_id: str) -> type:
+
+        path = self.merged.get(object_id)
+        if path is None:
+            raise Exception("Object '%s' for not found in %s. If you want options, call with 'all_options', 'soo_options' or 'moo_options'" % (object_id, list(self.merged.keys())))
+
+        cls = self.classes.get(path)
+        if cls is None:
+            module, class_name = path.split(':')
+            cls = self.classes[path] = getattr(importlib.import_module(module), class_name)
+        return cls
+
+    def getOptions(self, query: str) -> dict:
+
+        if query not in self.options:
+            ids = {'soo_options': self.single, 'moo_options': self.multi, 'all_options': self.merged}[query]
+            self.options[query] = {object_id: self.getClass(object_id) for object_id in ids}
+        # a copy, so the kept dict is not changed by the caller
+        return dict(self.options[query])
+
+def getRegistryHash() -> str:
+    """Get a hash of the import paths of all the registries and of the source of the modules of this repository they
+    import (not pymoo's, see the pymoo version), which changes when a class is added, removed or edited"""
+    from backend.cache import stableHash
+
+    registries = {name: [registry.single, registry.multi] for name, registry in globals().items() if isinstance(registry, Registry)}
+    modules = sorted({path.split(':')[0] for single, multi in registries.values() for path in [*single.values(), *multi.values()]})
+    sources = {module: getSourceHash(module) for module in modules}
+
+    return stableHash([registries, {module: source for module, source in sources.items() if source is not None}])
+
+def getSourceHash(module: str):
+    """Get the sha1 of the source of a module of this repository, None if it is not one (e.g. a pymoo module)"""
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    file = os.path.join(root, *module.split('.')) + '.py'
+    if not os.path.isfile(file):
+        return None
+    with open(file, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def getClassSourceHash(registry: Registry, object_id: str):
+    """Get the hash of the source of the modules of this repository that define the class of the ID or one of its base
+    classes, None if they are all from other packages (e.g. pymoo, see the pymoo version)"""
+    from backend.cache import stableHash
+
+    modules = sorted({base.__module__ for base in registry.getClass(object_id.lower()).__mro__})
+    sources = {module: getSourceHash(module) for module in modules}
+    sources = {module: source for module, source in sources.items() if source is not None}
+
+    return stableHash(sources) if sources else None
+
 # =========================================================================================================
 # Algorithms
 # =========================================================================================================
 
+ALGORITHMS = Registry(
+    single={
+        "ga": "pymoo.algorithms.soo.nonconvex.ga:GA",
+        "de": "pymoo.algorithms.soo.nonconvex.de:DE",
+        "nelder-mead": "pymoo.algorithms.soo.nonconvex.nelder:NelderMead",
+        "pattern-search": "pymoo.algorithms.soo.nonconvex.pattern:PatternSearch",
+        "cmaes": "pymoo.algorithms.soo.nonconvex.cmaes:CMAES",
+        "pso": "pymoo.algorithms.soo.nonconvex.pso:PSO",
+        "brkga": "pymoo.algorithms.soo.nonconvex.brkga:BRKGA",
+    },
+    multi={
+        "nsga2": "pymoo.algorithms.moo.nsga2:NSGA2",
+        "nsga3": "pymoo.algorithms.moo.nsga3:NSGA3",
+        # RNSGA2 and RNSGA3 need a numpy array to set, cannot be done through the app
+        "unsga3": "pymoo.algorithms.moo.unsga3:UNSGA3",
+        "moead": "pymoo.algorithms.moo.moead:MOEAD",
+        "ctaea": "pymoo.algorithms.moo.ctaea:CTAEA",
+        "permutation_nsga2": "thesis.results_worst_case.algorithm:PermutationNSGA2",
+        "aco_nsga2": "thesis.results_worst_case.algorithm:ACO_NSGA2",
+    })
+
 def get_algorithm(name, *args, **kwargs):
-        
-    from pymoo.algorithms.moo.ctaea import CTAEA
-    from pymoo.algorithms.moo.moead import MOEAD
-    from pymoo.algorithms.moo.nsga2 import NSGA2
-    from pymoo.algorithms.moo.nsga3 import NSGA3
-    # from pymoo.algorithms.moo.rnsga2 import RNSGA2 # needs a numpy array to set, cannot be done through the app
-    # from pymoo.algorithms.moo.rnsga3 import RNSGA3 # needs a numpy array to set, cannot be done through the app
-    from pymoo.algorithms.moo.unsga3 import UNSGA3
-    from pymoo.algorithms.soo.nonconvex.cmaes import CMAES
-    from pymoo.algorithms.soo.nonconvex.de import DE
-    from pymoo.algorithms.soo.nonconvex.ga import GA
-    from pymoo.algorithms.soo.nonconvex.nelder import NelderMead
-    from pymoo.algorithms.soo.nonconvex.pattern import PatternSearch
-    from pymoo.algorithms.soo.nonconvex.pso import PSO
-    from pymoo.algorithms.soo.nonconvex.brkga import BRKGA
-    
-    from thesis.results_worst_case.algorithm import PermutationNSGA2, ACO_NSGA2
-
-    ALGORITHMS_SINGLE = {
-        "ga": GA,
-        "de": DE,
-        "nelder-mead": NelderMead,
-        "pattern-search": PatternSearch,
-        "cmaes": CMAES,
-        "pso": PSO,
-        "brkga": BRKGA,
-    }
-    
-    ALGORITHMS_MULTI = {
-        "nsga2": NSGA2,
-        "nsga3": NSGA3,
-        "unsga3": UNSGA3,
-        "moead": MOEAD,
-        "ctaea": CTAEA,
-        "permutation_nsga2": PermutationNSGA2, 
-        "aco_nsga2": ACO_NSGA2 
-    }
-
-    return returnObjectOrOptions(name, ALGORITHMS_SINGLE, ALGORITHMS_MULTI, *args, **kwargs)
+    return ALGORITHMS.get(name, *args, **kwargs)
 
 # =========================================================================================================
 # Sampling
 # =========================================================================================================
 
+SAMPLING = {
+    "real_random": "pymoo.operators.sampling.rnd:FloatRandomSampling",
+    "real_lhs": "pymoo.operators.sampling.lhs:LHS",
+    "bin_random": "pymoo.operators.sampling.rnd:BinaryRandomSampling",
+    "perm_random": "pymoo.operators.sampling.rnd:PermutationRandomSampling",
+    "mixed_perm_random": "thesis.results_worst_case.operators:MixedPermRandomSampling",
+}
+SAMPLINGS = Registry(single=SAMPLING, multi=SAMPLING)
+
 def get_sampling(name, *args, **kwargs):
-        
-    from pymoo.operators.sampling.lhs import LHS
-    from pymoo.operators.sampling.rnd import BinaryRandomSampling, FloatRandomSampling, PermutationRandomSampling
-    
-    from thesis.results_worst_case.operators import MixedPermRandomSampling
-    
-    SAMPLING = {
-        "real_random": FloatRandomSampling,
-        "real_lhs": LHS,
-        "bin_random": BinaryRandomSampling,
-        "perm_random": PermutationRandomSampling,
-        "mixed_perm_random": MixedPermRandomSampling 
-    }
-
-    return returnObjectOrOptions(name, SAMPLING, SAMPLING, *args, **kwargs)
+    return SAMPLINGS.get(name, *args, **kwargs)
 
 # =========================================================================================================
 # Survival
 # =========================================================================================================
 
+SURVIVALS = Registry(
+    single={
+        "fitness_survival": "pymoo.algorithms.soo.nonconvex.ga:FitnessSurvival", # ga
+    },
+    multi={
+        "rank_and_crowding": "pymoo.algorithms.moo.nsga2:RankAndCrowding", # nsga2
+        "rank_and_crowding_aco": "thesis.results_worst_case.algorithm:RankAndCrowdingACO", # aco_nsga2
+    })
+
 def get_survival(name, *args, **kwargs):
-    
-    from pymoo.algorithms.moo.nsga2 import RankAndCrowding
-    from pymoo.algorithms.soo.nonconvex.ga import FitnessSurvival
-    
-    from thesis.results_worst_case.algorithm import RankAndCrowdingACO
-    
-    SURVIVAL_SINGLE = {
-        "fitness_survival": FitnessSurvival, # ga
-    }
-    SURVIVAL_MULTI = {
-        "rank_and_crowding": RankAndCrowding, # nsga2
-        "rank_and_crowding_aco": RankAndCrowdingACO, # aco_nsga2
-    }
-
-    return returnObjectOrOptions(name, SURVIVAL_SINGLE, SURVIVAL_MULTI, *args, **kwargs)
+    return SURVIVALS.get(name, *args, **kwargs)
 
 # =========================================================================================================
 # Selection
 # =========================================================================================================
 
-def get_selection(name, *args, **kwargs):
-        
-    from pymoo.operators.selection.rnd import RandomSelection
-    from utils.useful_classes import (TournamentByCVAndFitness, RestrictedMatingCTAEA, BinaryTournament, 
-                                        TournamentByCVThenRandom, TournamentByRankAndRefLineDist)
-    
-    SELECTION_SINGLE = {
-        "random": RandomSelection,
-        "tournament_by_cv_and_fitness": TournamentByCVAndFitness  # ga
-    }
-    
-    SELECTION_MULTI = {
-        "restricted_mating_ctaea": RestrictedMatingCTAEA,  # ctaea
-        "binary_tournament": BinaryTournament,  # nsga2
-        "tournament_by_cv_then_random": TournamentByCVThenRandom,  # nsga3
-        "tournament_by_rank_and_ref_line_dist": TournamentByRankAndRefLineDist,  # unsga3
-    }
-
-    return returnObjectOrOptions(name, SELECTION_SINGLE, SELECTION_MULTI, *args, **kwargs)
+SELECTIONS = Registry(
+    single={
+        "random": "pymoo.operators.selection.rnd:RandomSelection",
+        "tournament_by_cv_and_fitness": "utils.useful_classes:TournamentByCVAndFitness", # ga
+    },
+    multi={
+        "restricted_mating_ctaea": "utils.useful_classes:RestrictedMatingCTAEA", # ctaea
+        "binary_tournament": "utils.useful_classes:BinaryTournament", # nsga2
+        "tournament_by_cv_then_random": "utils.useful_classes:TournamentByCVThenRandom", # nsga3
+        "tournament_by_rank_and_ref_line_dist": "utils.useful_classes:TournamentByRankAndRefLineDist", # unsga3
+    })
 
+def get_selection(name, *args, **kwargs):
+    return SELECTIONS.get(name, *args, **kwargs)
 
 # =========================================================================================================
 # Crossover
 # =========================================================================================================
 
+CROSSOVER = {
+    "real_sbx": "pymoo.operators.crossover.sbx:SBX",
+    "real_de": "pymoo.operators.crossover.dex:DEX",
+    "real_pcx": "pymoo.operators.crossover.pcx:PCX",
+    "(real|bin|int)_ux": "pymoo.operators.crossover.ux:UniformCrossover",
+    "(bin|int)_hux": "pymoo.operators.crossover.hux:HalfUniformCrossover",
+    "(real|bin|int)_exp": "pymoo.operators.crossover.expx:ExponentialCrossover",
+    "(real|bin|int)_k_point": "pymoo.operators.crossover.pntx:PointCrossover",
+    "perm_ox": "pymoo.operators.crossover.ox:OrderCrossover",
+    "perm_erx": "pymoo.operators.crossover.erx:EdgeRecombinationCrossover",
+    "none": "utils.useful_classes:MyNoCrossover",
+    "mixed_perm_ox": "thesis.results_worst_case.algorithm:MixedOrderCrossover",
+}
+CROSSOVERS = Registry(single=CROSSOVER, multi=CROSSOVER)
+
 def get_crossover(name, *args, **kwargs):
-        
-    from pymoo.operators.crossover.dex import DEX
-    from pymoo.operators.crossover.erx import EdgeRecombinationCrossover
-    from pymoo.operators.crossover.expx import ExponentialCrossover
-    from pymoo.operators.crossover.hux import HalfUniformCrossover
-    from pymoo.operators.crossover.ox import OrderCrossover
-    from pymoo.operators.crossover.pcx import PCX
-    from pymoo.operators.crossover.pntx import PointCrossover
-    from pymoo.operators.crossover.sbx import SBX
-    from pymoo.operators.crossover.ux import UniformCrossover
-    from utils.useful_classes import MyNoCrossover
-    from thesis.results_worst_case.algorithm import MixedOrderCrossover
-    
-    CROSSOVER = {
-        "real_sbx": SBX,
-        "real_de": DEX,
-        "real_pcx": PCX,
-        "(real|bin|int)_ux": UniformCrossover,
-        "(bin|int)_hux": HalfUniformCrossover,
-        "(real|bin|int)_exp": ExponentialCrossover,
-        "(real|bin|int)_k_point": PointCrossover,
-        "perm_ox": OrderCrossover,
-        "perm_erx": EdgeRecombinationCrossover,
-        "none": MyNoCrossover,
-        "mixed_perm_ox": MixedOrderCrossover
-    }
-
-    return returnObjectOrOptions(name, CROSSOVER, CROSSOVER, *args, **kwargs)
+    return CROSSOVERS.get(name, *args, **kwargs)
 
 # =========================================================================================================
 # Mutation
 # =========================================================================================================
 
-def get_mutation(name, *args, **kwargs):
-        
-    from pymoo.operators.mutation.bitflip import BitflipMutation
-    from pymoo.operators.mutation.inversion import InversionMutation
-    from pymoo.operators.mutation.nom import NoMutation
-    from pymoo.operators.mutation.pm import PM
-    from thesis.results_worst_case.algorithm import InversionFlipMutation 
-    
-    MUTATION = {
-        "none": NoMutation,
-        "real_pm": PM,
-        "bitflip": BitflipMutation,
-        "perm_inv": InversionMutation,
-        "perm_inv_flip": InversionFlipMutation,
-    }
-
-    return returnObjectOrOptions(name, MUTATION, MUTATION, *args, **kwargs)
+MUTATION = {
+    "none": "pymoo.operators.mutation.nom:NoMutation",
+    "real_pm": "pymoo.operators.mutation.pm:PM",
+    "bitflip": "pymoo.operators.mutation.bitflip:BitflipMutation",
+    "perm_inv": "pymoo.operators.mutation.inversion:InversionMutation",
+    "perm_inv_flip": "thesis.results_worst_case.algorithm:InversionFlipMutation",
+}
+MUTATIONS = Registry(single=MUTATION, multi=MUTATION)
 
+def get_mutation(name, *args, **kwargs):
+    return MUTATIONS.get(name, *args, **kwargs)
 
 # =========================================================================================================
 # Termination
 # =========================================================================================================
 
+TERMINATIONS = Registry(
+    single={
+        "n_eval": "pymoo.termination.max_eval:MaximumFunctionCallTermination",
+        "n_gen": "pymoo.termination.max_gen:MaximumGenerationTermination",
+        "fmin": "pymoo.termination.fmin:MinimumFunctionValueTermination",
+        "time": "pymoo.termination.max_time:TimeBasedTermination",
+        "soo": "pymoo.termination.default:DefaultSingleObjectiveTermination",
+        "min_fitness": "utils.useful_classes:MinFitnessTermination",
+        "staled_best": "utils.useful_classes:StaledBestTermination",
+        "pso_termination": "thesis.results_pso.pso_classes:PSOTermination",
+    },
+    multi={
+        "n_eval": "pymoo.termination.max_eval:MaximumFunctionCallTermination",
+        "n_gen": "pymoo.termination.max_gen:MaximumGenerationTermination",
+        "fmin": "pymoo.termination.fmin:MinimumFunctionValueTermination",
+        "time": "pymoo.termination.max_time:TimeBasedTermination",
+        "moo": "pymoo.termination.default:DefaultMultiObjectiveTermination",
+    })
+
 def get_termination(name, *args, **kwargs):
-            
-    from pymoo.termination.default import (DefaultMultiObjectiveTermination,
-                                           DefaultSingleObjectiveTermination)
-    from pymoo.termination.fmin import MinimumFunctionValueTermination
-    from pymoo.termination.max_eval import MaximumFunctionCallTermination
-    from pymoo.termination.max_gen import MaximumGenerationTermination
-    from pymoo.termination.max_time import TimeBasedTermination
-    from utils.useful_classes import MinFitnessTermination, StaledBestTermination
-    from thesis.results_pso.pso_classes import PSOTermination
-    
-    TERMINATION_SINGLE = {
-        "n_eval": MaximumFunctionCallTermination,
-        "n_gen": MaximumGenerationTermination,
-        "fmin": MinimumFunctionValueTermination,
-        "time": TimeBasedTermination,
-        "soo": DefaultSingleObjectiveTermination,
-        "min_fitness": MinFitnessTermination,
-        "staled_best": StaledBestTermination,
-        "pso_termination": PSOTermination
-    }
-
-    TERMINATION_MULTI = {
-        "n_eval": MaximumFunctionCallTermination,
-        "n_gen": MaximumGenerationTermination,
-        "fmin": MinimumFunctionValueTermination,
-        "time": TimeBasedTermination,
-        "moo": DefaultMultiObjectiveTermination,
-    }
-    
-    return returnObjectOrOptions(name, TERMINATION_SINGLE, TERMINATION_MULTI, *args, **kwargs) 
+    return TERMINATIONS.get(name, *args, **kwargs)
 
 # =========================================================================================================
 # Problems
 # =========================================================================================================
 
-def get_problem(name, *args, **kwargs):    
-
-    from pymoo.problems.dynamic.df import (DF1, DF2, DF3, DF4, DF5, DF6, DF7,
-                                           DF8, DF9, DF10, DF11, DF12, DF13,
-                                           DF14)
-    #InvertedDTLZ1 not well implemented
-    # ConvexDTLZ2 and ConvexDTLZ4 are just dtlz with different args
-    from pymoo.problems.many import (C1DTLZ1, C1DTLZ3, C2DTLZ2, C3DTLZ1,
-                                     C3DTLZ4, DC1DTLZ1, DC1DTLZ3, DC2DTLZ1,
-                                     DC2DTLZ3, DC3DTLZ1, DC3DTLZ3, DTLZ1,
-                                     DTLZ2, DTLZ3, DTLZ4, DTLZ5, DTLZ6, DTLZ7) #WFG not giving consistent pfs 
-    # MODAct needs to install module
-    from pymoo.problems.multi import (BNH, CTP1, CTP2, CTP3, CTP4, CTP5, CTP6,
-                                      CTP7, CTP8, DASCMOP1, DASCMOP2, DASCMOP3,
-                                      DASCMOP4, DASCMOP5, DASCMOP6, DASCMOP7,
-                                      DASCMOP8, DASCMOP9, MW1, MW2, MW3, MW4,
-                                      MW5, MW6, MW7, MW8, MW9, MW10, MW11,
-                                      MW12, MW13, MW14, OSY, SRN, TNK, ZDT1,
-                                      ZDT2, ZDT3, ZDT4, ZDT5, ZDT6, Carside,
-                                      Kursawe, Truss2D, WeldedBeam) 
-    from pymoo.problems.single import (G1, G2, G3, G4, G5, G6, G7, G8, G9, G10,
-                                       G11, G12, G13, G14, G15, G16, G17, G18,
-                                       G19, G20, G21, G22, G23, G24, Ackley,
-                                       CantileveredBeam, Himmelblau, PressureVessel,
-                                       Schwefel, Sphere, Zakharov) # Griewank, Rastrigin, Rosenbrock overwritten to set xl and xu
-    from utils.useful_classes import RandomKnapsackMulti, RandomKnapsackSingle, ScaledDTLZ, GriewankExplicitLimits, RastriginExplicitLimits, RosenbrockExplicitLimits
-    
-    from thesis.results_worst_case.problem import RandomMultiMixedTSP
-    
-    PROBLEM_SINGLE = {
-        "ackley": Ackley,
-        "g1": G1,
-        "g2": G2,
-        "g3": G3,
-        "g4": G4,
-        "g5": G5,
-        "g6": G6,
-        "g7": G7,
-        "g8": G8,
-        "g9": G9,
-        "g10": G10,
-        "g11": G11,
-        "g12": G12,
-        "g13": G13,
-        "g14": G14,
-        "g15": G15,
-        "g16": G16,
-        "g17": G17,
-        "g18": G18,
-        "g19": G19,
-        "g20": G20,
-        "g21": G21,
-        "g22": G22,
-        "g23": G23,
-        "g24": G24,
-        "cantilevered_beam": CantileveredBeam,
-        "griewank": GriewankExplicitLimits,
-        "himmelblau": Himmelblau,
-        "soo_knp": RandomKnapsackSingle,
-        "pressure_vessel": PressureVessel,
-        "rastrigin": RastriginExplicitLimits,
-        "rosenbrock": RosenbrockExplicitLimits,
-        "schwefel": Schwefel,
-        "sphere": Sphere,
-        "zakharov": Zakharov,
-    }
-
-    PROBLEM_MULTI = {
-        "bnh": BNH,
-        "moo_knp": RandomKnapsackMulti,
-        "carside": Carside,
-        "ctp1": CTP1,
-        "ctp2": CTP2,
-        "ctp3": CTP3,
-        "ctp4": CTP4,
-        "ctp5": CTP5,
-        "ctp6": CTP6,
-        "ctp7": CTP7,
-        "ctp8": CTP8,
-        "dascmop1": DASCMOP1,
-        "dascmop2": DASCMOP2,
-        "dascmop3": DASCMOP3,
-        "dascmop4": DASCMOP4,
-        "dascmop5": DASCMOP5,
-        "dascmop6": DASCMOP6,
-        "dascmop7": DASCMOP7,
-        "dascmop8": DASCMOP8,
-        "dascmop9": DASCMOP9,
-        "df1": DF1,
-        "df2": DF2,
-        "df3": DF3,
-        "df4": DF4,
-        "df5": DF5,
-        "df6": DF6,
-        "df7": DF7,
-        "df8": DF8,
-        "df9": DF9,
-        "df10": DF10,
-        "df11": DF11,
-        "df12": DF12,
-        "df13": DF13,
-        "df14": DF14,
-        "mw1": MW1,
-        "mw2": MW2,
-        "mw3": MW3,
-        "mw4": MW4,
-        "mw5": MW5,
-        "mw6": MW6,
-        "mw7": MW7,
-        "mw8": MW8,
-        "mw9": MW9,
-        "mw10": MW10,
-        "mw11": MW11,
-        "mw12": MW12,
-        "mw13": MW13,
-        "mw14": MW14,
-        "dtlz1": DTLZ1,
-        "dtlz2": DTLZ2,
-        "dtlz3": DTLZ3,
-        "dtlz4": DTLZ4,
-        "dtlz5": DTLZ5,
-        "dtlz6": DTLZ6,
-        "dtlz7": DTLZ7,
-        "scaled_dtlz": ScaledDTLZ,
-        "c1dtlz1": C1DTLZ1,
-        "c1dtlz3": C1DTLZ3,
-        "c2dtlz2": C2DTLZ2,
-        "c3dtlz1": C3DTLZ1,
-        "c3dtlz4": C3DTLZ4,
-        "dc1dtlz1": DC1DTLZ1,
-        "dc1dtlz3": DC1DTLZ3,
-        "dc2dtlz1": DC2DTLZ1,
-        "dc2dtlz3": DC2DTLZ3,
-        "dc3dtlz1": DC3DTLZ1,
-        "dc3dtlz3": DC3DTLZ3,
-        "kursawe": Kursawe,
-        "osy": OSY,
-        "srn": SRN,
-        "tnk": TNK,
-        "truss2d": Truss2D,
-        "welded_beam": WeldedBeam,
-        "zdt1": ZDT1,
-        "zdt2": ZDT2,
-        "zdt3": ZDT3,
-        "zdt4": ZDT4,
-        "zdt5": ZDT5,
-        "zdt6": ZDT6,
-        "moo_mixed_tsp": RandomMultiMixedTSP
-    }
-
-    return returnObjectOrOptions(name, PROBLEM_SINGLE, PROBLEM_MULTI, *args, **kwargs)
+# InvertedDTLZ1 not well implemented, ConvexDTLZ2 and ConvexDTLZ4 are just dtlz with different args, WFG not giving
+# consistent pfs, MODAct needs to install module. Griewank, Rastrigin and Rosenbrock are overwritten to set xl and xu
+PROBLEMS = Registry(
+    single={
+        "ackley": "pymoo.problems.single:Ackley",
+        **{f"g{i}": f"pymoo.problems.single:G{i}" for i in range(1, 25)},
+        "cantilevered_beam": "pymoo.problems.single:CantileveredBeam",
+        "griewank": "utils.useful_classes:GriewankExplicitLimits",
+        "himmelblau": "pymoo.problems.single:Himmelblau",
+        "soo_knp": "utils.useful_classes:RandomKnapsackSingle",
+        "pressure_vessel": "pymoo.problems.single:PressureVessel",
+        "rastrigin": "utils.useful_classes:RastriginExplicitLimits",
+        "rosenbrock": "utils.useful_classes:RosenbrockExplicitLimits",
+        "schwefel": "pymoo.problems.single:Schwefel",
+        "sphere": "pymoo.problems.single:Sphere",
+        "zakharov": "pymoo.problems.single:Zakharov",
+    },
+    multi={
+        "bnh": "pymoo.problems.multi:BNH",
+        "moo_knp": "utils.useful_classes:RandomKnapsackMulti",
+        "carside": "pymoo.problems.multi:Carside",
+        **{f"ctp{i}": f"pymoo.problems.multi:CTP{i}" for i in range(1, 9)},
+        **{f"dascmop{i}": f"pymoo.problems.multi:DASCMOP{i}" for i in range(1, 10)},
+        **{f"df{i}": f"pymoo.problems.dynamic.df:DF{i}" for i in range(1, 15)},
+        **{f"mw{i}": f"pymoo.problems.multi:MW{i}" for i in range(1, 15)},
+        **{f"dtlz{i}": f"pymoo.problems.many:DTLZ{i}" for i in range(1, 8)},
+        "scaled_dtlz": "utils.useful_classes:ScaledDTLZ",
+        "c1dtlz1": "pymoo.problems.many:C1DTLZ1",
+        "c1dtlz3": "pymoo.problems.many:C1DTLZ3",
+        "c2dtlz2": "pymoo.problems.many:C2DTLZ2",
+        "c3dtlz1": "pymoo.problems.many:C3DTLZ1",
+        "c3dtlz4": "pymoo.problems.many:C3DTLZ4",
+        "dc1dtlz1": "pymoo.problems.many:DC1DTLZ1",
+        "dc1dtlz3": "pymoo.problems.many:DC1DTLZ3",
+        "dc2dtlz1": "pymoo.problems.many:DC2DTLZ1",
+        "dc2dtlz3": "pymoo.problems.many:DC2DTLZ3",
+        "dc3dtlz1": "pymoo.problems.many:DC3DTLZ1",
+        "dc3dtlz3": "pymoo.problems.many:DC3DTLZ3",
+        "kursawe": "pymoo.problems.multi:Kursawe",
+        "osy": "pymoo.problems.multi:OSY",
+        "srn": "pymoo.problems.multi:SRN",
+        "tnk": "pymoo.problems.multi:TNK",
+        "truss2d": "pymoo.problems.multi:Truss2D",
+        "welded_beam": "pymoo.problems.multi:WeldedBeam",
+        **{f"zdt{i}": f"pymoo.problems.multi:ZDT{i}" for i in range(1, 7)},
+        "moo_mixed_tsp": "thesis.results_worst_case.problem:RandomMultiMixedTSP",
+    })
+
+def get_problem(name, *args, **kwargs):
+
+    problem = PROBLEMS.get(name, *args, **kwargs)
+    if not isinstance(problem, dict):
+        # the key of its pareto fronts in the cache (see getParetoFront in backend/cache.py)
+        problem.constructor = (name.lower(), args, kwargs)
+    return problem
 
 # =========================================================================================================
 # Reference Directions
 # =========================================================================================================
 
+REFERENCE_DIRECTIONS = Registry(
+    single={},
+    multi={
+        "das-dennis": "pymoo.util.reference_direction:UniformReferenceDirectionFactory",
+        "energy": "pymoo.util.ref_dirs.energy:RieszEnergyReferenceDirectionFactory",
+        "layer-energy": "pymoo.util.ref_dirs.energy_layer:LayerwiseRieszEnergyReferenceDirectionFactory",
+        "red": "pymoo.util.ref_dirs.reduction:ReductionBasedReferenceDirectionFactory",
+    })
+
+REF_DIRS = {} # hash of the factory ID and its args -> ref_dirs, shared by all the RunArgs built in a process
+REF_DIRS_LOCK = threading.Lock()
+
+def getRefDirsHash(name: str, args: tuple, kwargs: dict) -> str:
+    """Get the hash of a request of reference directions: the factory ID, its args (n_dim, n_points, seed, ...) and
+    the pymoo version, since the factories may compute other directions in another version"""
+    from pymoo import __version__ as pymoo_version
+    from backend.cache import stableHash
+
+    return stableHash({'pymoo': pymoo_version, 'name': name.lower(), 'path': REFERENCE_DIRECTIONS.merged.get(name.lower()),
+                       'args': list(args), 'kwargs': kwargs})
 
 def get_reference_directions(name, *args, **kwargs):
-        
-    from pymoo.util.ref_dirs.energy import RieszEnergyReferenceDirectionFactory
-    from pymoo.util.ref_dirs.energy_layer import \
-        LayerwiseRieszEnergyReferenceDirectionFactory
-    from pymoo.util.ref_dirs.reduction import \
-        ReductionBasedReferenceDirectionFactory
-    from pymoo.util.reference_direction import UniformReferenceDirectionFactory
-                
-    REFERENCE_DIRECTIONS = {
-        "das-dennis": UniformReferenceDirectionFactory,
-        "energy": RieszEnergyReferenceDirectionFactory,
-        "layer-energy": LayerwiseRieszEnergyReferenceDirectionFactory,
-        "red": ReductionBasedReferenceDirectionFactory,
-    }
-
-    ref_dirs = returnObjectOrOptions(name, {}, REFERENCE_DIRECTIONS, *args, **kwargs)
-    if isinstance(ref_dirs, dict):
+    """The options dict if the name is an options query, otherwise the ref_dirs of the factory of the ID created with
+    the args. The factories based on optimizations (e.g. energy, red) take from seconds to minutes with many objectives,
+    so with USE_REF_DIRS_CACHE the ref_dirs are computed once for each ID and args: they are kept in memory for the
+    process and saved as .npy files in REF_DIRS_CACHE_FOLDER, memory-mapped when loaded. The arrays are read-only,
+    since they are shared. The factories without a seed give random ref_dirs, and the first ones computed are reused"""
+    # imported here since utils.defines imports this module
+    from utils.defines import USE_REF_DIRS_CACHE, REF_DIRS_CACHE_FOLDER
+    from backend.cache import loadArray, saveArray
+
+    if name.lower() in Registry.OPTIONS:
+        return REFERENCE_DIRECTIONS.get(name)
+    if not USE_REF_DIRS_CACHE:
+        return REFERENCE_DIRECTIONS.get(name, *args, **kwargs).do()
+
+    ref_dirs_hash = getRefDirsHash(name, args, kwargs)
+    with REF_DIRS_LOCK:
+        ref_dirs = REF_DIRS.get(ref_dirs_hash)
+    if ref_dirs is not None:
         return ref_dirs
-    else:
-        return ref_dirs.do()
+
+    path = os.path.join(REF_DIRS_CACHE_FOLDER, f"{ref_dirs_hash}.npy")
+    ref_dirs = loadArray(path)
+    if ref_dirs is None:
+        ref_dirs = REFERENCE_DIRECTIONS.get(name, *args, **kwargs).do()
+        saveArray(path, ref_dirs)
+        ref_dirs = ref_dirs.view()
+        ref_dirs.flags.writeable = False
+
+    with REF_DIRS_LOCK:
+        return REF_DIRS.setdefault(ref_dirs_hash, ref_dirs)
 
 # =========================================================================================================
 # Performance Indicator
 # =========================================================================================================
 
+# rmetric removed, needs ref points. gd, gd+, igd and igd+ have the same values as pymoo's, computed with KD-trees and by chunks
+PERFORMANCE_INDICATORS = Registry(
+    single={
+        "best": "utils.useful_classes:BestFitness",
+        "avg_fitness": "utils.useful_classes:AvgPopFitness",
+        "-goal_achieved": "utils.useful_classes:MinusGoalAchieved",
+        "evals_on_goal": "utils.useful_classes:EvalsOnGoal",
+        "-goal_achieved_pso": "thesis.results_pso.pso_classes:MinusGoalAchievedPSO",
+        "evals_on_goal_pso": "thesis.results_pso.pso_classes:EvalsOnGoalPSO",
+    },
+    multi={
+        "gd": "utils.useful_classes:FastGD",
+        "gd+": "utils.useful_classes:FastGDPlus",
+        "igd": "utils.useful_classes:FastIGD",
+        "igd+": "utils.useful_classes:FastIGDPlus",
+        "-hv": "utils.useful_classes:minusHypervolume",
+    })
+
 def get_performance_indicator(name, *args, **kwargs):
-        
-    from pymoo.indicators.gd import GD
-    from pymoo.indicators.gd_plus import GDPlus
-    from pymoo.indicators.igd import IGD
-    from pymoo.indicators.igd_plus import IGDPlus # rmetric removed, needs ref points
-    from utils.useful_classes import BestFitness, minusHypervolume, AvgPopFitness, MinusGoalAchieved, EvalsOnGoal
-    from thesis.results_pso.pso_classes import EvalsOnGoalPSO, MinusGoalAchievedPSO
-                 
-    PERFORMANCE_INDICATOR_SINGLE = {
-        "best": BestFitness,
-        "avg_fitness": AvgPopFitness,
-        "-goal_achieved": MinusGoalAchieved,
-        "evals_on_goal": EvalsOnGoal,
-        "-goal_achieved_pso": MinusGoalAchievedPSO,
-        "evals_on_goal_pso": EvalsOnGoalPSO
-    }
-        
-    PERFORMANCE_INDICATOR_MULTI = {
-        "gd": GD,
-        "gd+": GDPlus,
-        "igd": IGD,
-        "igd+": IGDPlus,
-        "-hv": minusHypervolume,
-    }
-    
-    return returnObjectOrOptions(name, PERFORMANCE_INDICATOR_SINGLE, PERFORMANCE_INDICATOR_MULTI, *args, **kwargs)
+    return PERFORMANCE_INDICATORS.get(name, *args, **kwargs)
 
 # =========================================================================================================
 # Decomposition
 # =========================================================================================================
 
+DECOMPOSITIONS = Registry(
+    single={},
+    multi={
+        "weighted-sum": "pymoo.decomposition.weighted_sum:WeightedSum",
+        "tchebi": "pymoo.decomposition.tchebicheff:Tchebicheff",
+        "pbi": "pymoo.decomposition.pbi:PBI",
+        "asf": "pymoo.decomposition.asf:ASF",
+        "aasf": "pymoo.decomposition.aasf:AASF",
+        "perp_dist": "pymoo.decomposition.perp_dist:PerpendicularDistance",
+    })
+
 def get_decomposition(name, *args, **kwargs):
-        
-    from pymoo.decomposition.aasf import AASF
-    from pymoo.decomposition.asf import ASF
-    from pymoo.decomposition.pbi import PBI
-    from pymoo.decomposition.perp_dist import PerpendicularDistance
-    from pymoo.decomposition.tchebicheff import Tchebicheff
-    from pymoo.decomposition.weighted_sum import WeightedSum
-
-    DECOMPOSITION_MULTI = {
-        "weighted-sum": WeightedSum,
-        "tchebi": Tchebicheff,
-        "pbi": PBI,
-        "asf": ASF,
-        "aasf": AASF,
-        "perp_dist": PerpendicularDistance
-    }
-
-    return returnObjectOrOptions(name, {}, DECOMPOSITION_MULTI, *args, **kwargs)
+    return DECOMPOSITIONS.get(name, *args, **kwargs)
 
 # =========================================================================================================
 # PLOTTING TYPES
 # =========================================================================================================
 
+PLOT_TYPES = Registry(
+    single={
+        "fitness_landscape": "frontend.plotting:QFitnessLandscape",
+        "progress": "frontend.plotting:QProgress",
+    },
+    multi={
+        "pcp": "frontend.plotting:QPCP",
+        "pareto_sets": "frontend.plotting:QParetoSets",
+        "progress": "frontend.plotting:QProgress",
+        "tsp": "thesis.results_worst_case.plot:TSPplot",
+    })
+
 def get_plot_types(name, *args, **kwargs):
-        
-    from frontend.plotting import QFitnessLandscape, QPCP, QParetoSets, QProgress
-    from thesis.results_worst_case.plot import TSPplot
-    
-    PLOT_TYPES_SINGLE = {
-        "fitness_landscape": QFitnessLandscape,
-        "progress": QProgress,
-    }
-
-    PLOT_TYPES_MULTI = {
-        "pcp": QPCP,
-        "pareto_sets": QParetoSets,
-        "progress": QProgress,
-        "tsp": TSPplot
-    }
-    
-    return returnObjectOrOptions(name, PLOT_TYPES_SINGLE, PLOT_TYPES_MULTI, *args, **kwargs)
+    return PLOT_TYPES.get(name, *args, **kwargs)
@@ -0,0 +1,82 @@
+"""
+    Dispatch of the performance indicators of a run (see MyCallback in backend/runner.py and FrontSnapshots in
+    backend/snapshots.py).
+
+    An indicator is an object with a do(opt_feas, **inputs) method, where opt_feas is the F of the optimum and the
+    inputs are the ones in PI_INPUTS that it needs. It can declare them in an 'inputs' attribute, otherwise they are
+    the arguments of its do method that are in PI_INPUTS (none for the pymoo indicators). They are found once, when the
+    callback is created, so each generation only gets the arrays the indicators need and calls them directly.
+
+    An indicator can also have a doBatch(opt_feas_list, **inputs_lists) -> list method, to compute the values of many
+    generations at once when they are computed from the front snapshots.
+
+    With PI_THREADS > 1, the indicators of a generation are computed at the same time in a pool of threads shared by
+    all the callbacks of the process. It helps with indicators that spend their time in numpy or scipy code that
+    releases the GIL (e.g. the KD-tree queries of GD and IGD), not with pure python ones.
+"""
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from utils.defines import PI_INPUTS
+
+PI_THREAD_POOL = None # pool of the threads that compute the indicators, created when first needed
+PI_THREAD_POOL_LOCK = threading.Lock()
+
+def getPIThreadPool(n_threads: int) -> ThreadPoolExecutor:
+    """Get the thread pool of the process, created the first time with n_threads threads"""
+
+    global PI_THREAD_POOL
+    with PI_THREAD_POOL_LOCK:
+        if PI_THREAD_POOL is None:
+            PI_THREAD_POOL = ThreadPoolExecutor(max_workers=n_threads, thread_name_prefix='pi')
+    return PI_THREAD_POOL
+
+def getPIInputs(pi_object) -> tuple:
+    """Get the inputs (see PI_INPUTS) the indicator needs besides opt_feas"""
+
+    inputs = getattr(pi_object, 'inputs', None)
+    if inputs is None:
+        parameters = inspect.signature(pi_object.do).parameters
+        inputs = [name for name in parameters if name in PI_INPUTS]
+    unknown = set(inputs) - set(PI_INPUTS)
+    if unknown:
+        raise ValueError(f"The performance indicator {type(pi_object).__name__} needs the unknown inputs {sorted(unknown)}, "
+                         f"they must be in {PI_INPUTS}")
+
+    return tuple(inputs)
+
+def callPI(pi_object, pi_inputs: tuple, opt_feas, values: dict):
+    """Get the value of the indicator, nan if there are no solutions. The values have (at least) the pi_inputs"""
+
+    if opt_feas is np.nan:
+        return np.nan
+    return pi_object.do(opt_feas, **{name: values[name] for name in pi_inputs})
+
+def callPIs(pi_objects: list, pi_inputs_list: list, opt_feas, values: dict, n_threads: int = 1) -> list:
+    """Get the values of all the indicators of a generation, in their order. If n_threads > 1 and there is more than one
+    indicator, they are computed at the same time in the thread pool"""
+
+    if n_threads <= 1 or len(pi_objects) <= 1 or opt_feas is np.nan:
+        return [callPI(pi_object, pi_inputs, opt_feas, values) for pi_object, pi_inputs in zip(pi_objects, pi_inputs_list)]
+
+    pool = getPIThreadPool(n_threads)
+    futures = [pool.submit(callPI, pi_object, pi_inputs, opt_feas, values) for pi_object, pi_inputs in zip(pi_objects, pi_inputs_list)]
+    return [future.result() for future in futures]
+
+def callPIBatch(pi_object, pi_inputs: tuple, opt_feas_list: list, values_list: list) -> list:
+    """Get the values of the indicator for many generations, with its doBatch method if it has one"""
+
+    if not hasattr(pi_object, 'doBatch'):
+        return [callPI(pi_object, pi_inputs, opt_feas, values) for opt_feas, values in zip(opt_feas_list, values_list)]
+
+    # the generations without solutions are nan, the others are computed together
+    indexes = [i for i, opt_feas in enumerate(opt_feas_list) if opt_feas is not np.nan]
+    batch = pi_object.doBatch([opt_feas_list[i] for i in indexes],
+                              **{name: [values_list[i][name] for i in indexes] for name in pi_inputs})
+    results = [np.nan] * len(opt_feas_list)
+    for i, value in zip(indexes, batch):
+        results[i] = value
+    return results
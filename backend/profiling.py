@@ -0,0 +1,238 @@
+"""
+    Resource accounting of the units of a run (see getUnitResources and PeakRSSSampler), and opt-in instrumentation of the phases of the
+    generations of a unit (see PROFILE_PHASES in utils/defines.py), to find where a slow run spends its time.
+
+    The evaluator, the mating and the survival of the copy of the algorithm of the unit are wrapped to time their calls,
+    and MyCallback times itself, so each generation is split in the PHASES:
+    - evaluation: the evaluations of the problem.
+    - mating: the selection, crossover and mutation of the offspring.
+    - survival: the selection of the next population.
+    - callback: MyCallback, mostly the performance indicators (also when computed after the run from the snapshots).
+    - other: the rest of the generation, e.g. the initialization and the steps of algorithms without mating or survival.
+    The time of a call is only counted in its innermost phase, so an evaluation inside the mating is only evaluation.
+
+    The wall and cpu time (of the thread that runs the unit) of each phase are added to the callback data as the columns
+    of getPhaseColumns, summed over the generations since the previous recorded generation, so they are kept like the
+    performance indicators (in the RunLog, the cache and the saved runs) and their sum is the time of the whole unit.
+    When the instrumentation is off nothing is wrapped, so it costs nothing.
+"""
+import os
+import sys
+import time
+import threading
+
+import numpy as np
+
+from backend.results import GrowableArray
+from utils.defines import (PHASES, PHASE_WALL_SUFFIX, PHASE_CPU_SUFFIX, BOOKKEEPING_PHASE, WALL_TIME_KEY, CPU_TIME_KEY, PEAK_RSS_KEY,
+                           EVALS_PER_SEC_KEY, PEAK_RSS_INTERVAL)
+
+def getPhaseColumns() -> list:
+    """Get the columns of the wall and cpu times of the phases, in the order they are added to the data"""
+    return [phase + suffix for phase in PHASES for suffix in (PHASE_WALL_SUFFIX, PHASE_CPU_SUFFIX)]
+
+def getTimes() -> np.ndarray:
+    return np.array([time.perf_counter(), time.thread_time()])
+
+def getRSS() -> float:
+    """Get the current resident memory of the process in MB, nan if it is not available"""
+
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/statm') as file: #@IgnoreException
+                pages = int(file.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            return np.nan
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1024**2
+    if sys.platform == 'win32':
+        return getWindowsRSS()
+    try:
+        # optional, the resident memory of the other platforms (e.g. macOS) is only available with it
+        import psutil #@IgnoreException
+    except ImportError:
+        return np.nan
+    return psutil.Process().memory_info().rss / 1024**2
+
+def getWindowsRSS() -> float:
+    """Get the current working set of the process in MB"""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD), ('PeakWorkingSetSize', ctypes.c_size_t),
+                    ('WorkingSetSize', ctypes.c_size_t), ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPagedPoolUsage', ctypes.c_size_t), ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaNonPagedPoolUsage', ctypes.c_size_t), ('PagefileUsage', ctypes.c_size_t),
+                    ('PeakPagefileUsage', ctypes.c_size_t)]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return np.nan
+    return counters.WorkingSetSize / 1024**2
+
+class PeakRSSSampler():
+    """
+        Peak resident memory of the process while a unit runs: the largest resident memory (see getRSS) sampled by a
+        thread every interval seconds, and at the start and end. So it is the peak of the unit, not of all the units the
+        process ran before, but it includes the memory of the units other threads of the process run at the same time
+        (e.g. the runs of the execution server), and peaks shorter than the interval can be missed.
+
+        Important Methods
+        -----------------
+        - start(): Starts sampling.
+        - stop() -> float: Stops sampling and returns the peak in MB, nan if the resident memory is not available.
+        It is also a context manager, that samples while the block runs.
+    """
+    def __init__(self, interval: float = PEAK_RSS_INTERVAL):
+        self.interval = interval
+        self.peak = np.nan
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def sample(self):
+        self.peak = np.fmax(self.peak, getRSS())
+
+    def start(self):
+
+        self.sample()
+        if np.isnan(self.peak):
+            # not available, there is nothing to sample
+            return
+        self.thread = threading.Thread(target=self.run, name='peak_rss', daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def stop(self) -> float:
+
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.sample()
+        return float(self.peak)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+def getUnitResources(start: np.ndarray, n_eval: int, peak_rss: float) -> dict:
+    """Get the resources used by a unit that started at start (see getTimes), made n_eval evaluations and had the peak 
+    resident memory peak_rss (see PeakRSSSampler): its wall and cpu time (of the thread that ran it), peak resident 
+    memory and evaluations per second"""
+
+    wall, cpu = getTimes() - start
+    return {WALL_TIME_KEY: float(wall), CPU_TIME_KEY: float(cpu), PEAK_RSS_KEY: float(peak_rss),
+            EVALS_PER_SEC_KEY: float(n_eval / wall) if wall > 0 else np.nan}
+
+class PhaseTimer():
+    """
+        Wall and cpu time of the phases (see the module docstring) of each generation of a unit.
+
+        Attributes
+        ----------
+        - n_gens: Generation of each lap.
+        - columns: Times of each phase in each lap, a GrowableArray for each column of getPhaseColumns.
+
+        Important Methods
+        -----------------
+        - instrument(algorithm): Wraps the evaluator, the mating and the survival of the algorithm.
+        - enter(phase), exit(): Start and stop timing a phase, which can be inside another one.
+        - lap(n_gen): Ends the generation n_gen, the time not in a phase is 'other'.
+        - addToLast(phase, times): Adds times to the phase of the last lap, e.g. the deferred performance indicators.
+        - getColumns(n_gens) -> dict: The times summed over the generations since each recorded one.
+    """
+    def __init__(self):
+        self.n_gens = GrowableArray()
+        self.columns = {col: GrowableArray() for col in getPhaseColumns()}
+        self.times = {phase: np.zeros(2) for phase in PHASES} # [wall, cpu] of each phase in the current lap
+        self.stack = [] # phases being timed, the innermost last
+        self.mark = getTimes() # since when the time is not counted in a phase
+        self.lap_start = self.mark
+
+    def instrument(self, algorithm):
+
+        self.wrap(algorithm.evaluator, 'eval', 'evaluation')
+        if getattr(algorithm, 'mating', None) is not None:
+            self.wrap(algorithm.mating, 'do', 'mating')
+        if getattr(algorithm, 'survival', None) is not None:
+            self.wrap(algorithm.survival, 'do', 'survival')
+
+    def wrap(self, obj, method_name: str, phase: str):
+        """Replace the method of the object (only this instance) by one that times its calls in the phase"""
+
+        method = getattr(obj, method_name)
+        def timed(*args, **kwargs):
+            self.enter(phase)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.exit()
+        setattr(obj, method_name, timed)
+
+    def count(self):
+        """Add the time since the mark to the innermost phase being timed"""
+        now = getTimes()
+        if self.stack:
+            self.times[self.stack[-1]] += now - self.mark
+        self.mark = now
+
+    def enter(self, phase: str):
+        self.count()
+        self.stack.append(phase)
+
+    def exit(self):
+        self.count()
+        self.stack.pop()
+
+    def lap(self, n_gen: int):
+
+        self.count()
+        self.times['other'] = (self.mark - self.lap_start) - sum(times for phase, times in self.times.items() if phase != 'other')
+        self.n_gens.append(n_gen)
+        for phase, (wall, cpu) in self.times.items():
+            self.columns[phase + PHASE_WALL_SUFFIX].append(wall)
+            self.columns[phase + PHASE_CPU_SUFFIX].append(cpu)
+        self.times = {phase: np.zeros(2) for phase in PHASES}
+        self.lap_start = self.mark
+
+    def addToLast(self, phase: str, times: np.ndarray):
+        for suffix, value in zip((PHASE_WALL_SUFFIX, PHASE_CPU_SUFFIX), times):
+            self.columns[phase + suffix].view()[-1] += value
+
+    def getColumns(self, n_gens: np.ndarray) -> dict:
+        """Get the times of each recorded generation (n_gens, sorted), summed over the generations after the previous
+        recorded one. The generations after the last recorded one are added to it"""
+
+        columns = {col: np.zeros(len(n_gens)) for col in self.columns}
+        if len(n_gens) == 0 or len(self.n_gens) == 0:
+            return columns
+        rows = np.minimum(np.searchsorted(n_gens, self.n_gens.view(), side='left'), len(n_gens) - 1)
+        for col, values in self.columns.items():
+            np.add.at(columns[col], rows, values.view())
+        return columns
+
+def getPhaseSummary(data, bookkeeping: np.ndarray = None) -> str:
+    """Get the share of the wall time of each phase in the data (and of the bookkeeping of the Runner, [wall, cpu],
+    if given), e.g. 'evaluation 62%, callback 30%, ...', or an empty string if the data has no phase times"""
+
+    wall_columns = [phase + PHASE_WALL_SUFFIX for phase in PHASES]
+    if not all(col in data.columns for col in wall_columns):
+        return ""
+    walls = {phase: float(np.nansum(data[col])) for phase, col in zip(PHASES, wall_columns)}
+    cpu = sum(float(np.nansum(data[phase + PHASE_CPU_SUFFIX])) for phase in PHASES)
+    if bookkeeping is not None:
+        walls[BOOKKEEPING_PHASE] = float(bookkeeping[0])
+        cpu += float(bookkeeping[1])
+    total = sum(walls.values())
+    if total <= 0:
+        return ""
+
+    shares = ", ".join(f"{phase} {wall / total:.0%}" for phase, wall in sorted(walls.items(), key=lambda item: -item[1]))
+    return f"{shares} of {total:.3g} s (cpu {cpu:.3g} s)"
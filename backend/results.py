@@ -0,0 +1,636 @@
+import os
+import json
+import zlib
+import pickle
+import shutil
+import weakref
+import tempfile
+import datetime
+
+import numpy as np
+import pandas as pd
+
+class ResultsBuilder():
+    """
+        Append-only columnar accumulator for the data of the runs of a RunThread.
+
+        Each appended run is stored as one block of typed numpy arrays, one per column, so adding a run never copies
+        the runs added before it. The pandas DataFrame is only built when it is first requested by getDataFrame,
+        and then kept until the next append.
+
+        The columns in 'categorical' (the problem and algorithm ids) are stored as integer codes, and are returned
+        as pandas categoricals with the categories sorted, so grouping by them keeps the order of grouping by strings.
+
+        Important Methods
+        -----------------
+        - append(run_data: dict): Adds a run. Values can be scalars (repeated for all the rows of the run) or sequences.
+        - getDataFrame() -> pd.DataFrame: Builds (or returns the already built) DataFrame with all the runs.
+        - fromDataFrame(df: pd.DataFrame): Creates a builder that starts with the rows of an existing DataFrame.
+    """
+    def __init__(self, categorical: list = None):
+
+        self.categorical = categorical if categorical is not None else []
+        self.categories = {col: {} for col in self.categorical} # value -> code for each categorical column
+        self.columns = [] # column names in the order they first appeared
+        self.blocks = [] # list of (n_rows, {column: numpy array})
+        self.n_rows = 0
+        self.df = None
+
+    @classmethod
+    def fromDataFrame(cls, df: pd.DataFrame, categorical: list = None):
+        builder = cls(categorical)
+        if not df.empty:
+            builder.append({col: df[col].to_numpy() for col in df.columns})
+        builder.df = df
+        return builder
+
+    def append(self, run_data: dict):
+
+        lengths = [len(value) for value in run_data.values() if not np.isscalar(value)]
+        if len(set(lengths)) > 1:
+            raise ValueError(f"All the columns of a run must have the same length, got lengths {lengths}")
+        n_rows = lengths[0] if lengths != [] else 1
+
+        block = {}
+        for col, value in run_data.items():
+            if col not in self.columns:
+                self.columns.append(col)
+
+            if col in self.categorical:
+                block[col] = self.getCodes(col, value, n_rows)
+            elif np.isscalar(value):
+                block[col] = np.full(n_rows, value)
+            else:
+                block[col] = np.asarray(value)
+
+        self.blocks.append((n_rows, block))
+        self.n_rows += n_rows
+        self.df = None
+
+    def getCodes(self, col: str, value, n_rows: int):
+        """Get the integer codes of the values of a categorical column, adding the new values to its categories"""
+
+        categories = self.categories[col]
+        values = [value] if np.isscalar(value) else value
+        for val in pd.unique(np.asarray(values)):
+            if val not in categories:
+                categories[val] = len(categories)
+
+        if np.isscalar(value):
+            return np.full(n_rows, categories[value], dtype=np.int32)
+        else:
+            return np.array([categories[val] for val in value], dtype=np.int32)
+
+    def getColumn(self, col: str):
+
+        arrays = []
+        for n_rows, block in self.blocks:
+            if col in block:
+                arrays.append(block[col])
+            else:
+                # column not present in this run
+                arrays.append(np.full(n_rows, -1 if col in self.categorical else np.nan))
+        array = np.concatenate(arrays)
+
+        if col in self.categorical:
+            # sort the categories so that the result is the same as with string columns
+            values = np.array(list(self.categories[col].keys()), dtype=object)
+            order = np.argsort(values.astype(str), kind="stable")
+            new_codes = np.empty(len(order), dtype=np.int32)
+            new_codes[order] = np.arange(len(order), dtype=np.int32)
+            array = np.where(array >= 0, new_codes[np.maximum(array, 0)], -1)
+            array = pd.Categorical.from_codes(array, categories=values[order])
+
+        return array
+
+    def getDataFrame(self) -> pd.DataFrame:
+
+        if self.df is None:
+            if self.n_rows == 0:
+                self.df = pd.DataFrame()
+            else:
+                self.df = pd.DataFrame({col: self.getColumn(col) for col in self.columns})
+
+        return self.df
+
+class GrowableArray():
+    """
+        Typed numpy array that values are appended to, doubling its capacity when it is full, so a trajectory of many
+        generations is stored without a python object per value. The dtype is the one of the first value, and is
+        promoted as np.asarray would promote a list of the values (e.g. to float if an int column gets a nan).
+
+        Important Methods
+        -----------------
+        - append(value): Adds a value at the end.
+        - setValues(values): Replaces all the values.
+        - thin(step): Keeps the first value and every step-th one after it.
+        - view() -> np.ndarray: The values, without copying them.
+    """
+    def __init__(self, capacity: int = 64):
+        self.capacity = max(int(capacity), 1)
+        self.array = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, value):
+
+        dtype = np.asarray(value).dtype
+        if self.array is None:
+            self.array = np.empty(self.capacity, dtype=dtype)
+        elif dtype != self.array.dtype and np.result_type(self.array.dtype, dtype) != self.array.dtype:
+            self.array = self.array.astype(np.result_type(self.array.dtype, dtype))
+        if self.size == len(self.array):
+            array = np.empty(2 * len(self.array), dtype=self.array.dtype)
+            array[:self.size] = self.array
+            self.array = array
+        self.array[self.size] = value
+        self.size += 1
+
+    def setValues(self, values):
+        self.array = np.asarray(values)
+        self.size = len(self.array)
+
+    def thin(self, step: int):
+        if self.array is not None:
+            values = self.array[:self.size:step].copy()
+            self.size = len(values)
+            self.array[:self.size] = values
+
+    def view(self) -> np.ndarray:
+        return self.array[:self.size] if self.array is not None else np.array([])
+
+def removeFile(path: str):
+    try:
+        os.remove(path) #@IgnoreException
+    except OSError:
+        pass
+
+class BestGenStore():
+    """
+        Best generation of each (problem, algorithm, seed) unit of a run (see Runner.best_gen), stored as contiguous
+        arrays in one file with an index of their offsets, instead of a dictionary of arrays in memory. 
+        It can be used as the dictionary (problem, algorithm, seed) -> {'X': X, 'F': F} it replaces.
+
+        The file is the 'best_gen.bin' file of the RunLog of the run, or a temporary file removed with the store if the
+        run has no RunLog. It is memory-mapped when the arrays are read, so only the arrays that are used are loaded.
+        The arrays are stored as float32 if float32 (BEST_GEN_FLOAT32), and compressed with zlib if compress
+        (BEST_GEN_COMPRESSION). When pickled (e.g. in a saved run), the store keeps its index and the bytes of its file,
+        so the saved run does not depend on the file.
+
+        Important Methods
+        -----------------
+        - add(key, X, F): Appends the arrays of a unit to the file.
+        - addIndex(key, index): Adds a unit whose arrays were already written to the file (by RunLog.appendUnit).
+        - getArray(key, name) -> np.ndarray: Only the 'X' or the 'F' of a unit.
+        - fromDict(best_gen): Creates a store with the units of a best_gen dictionary (e.g. of an old saved run).
+    """
+    def __init__(self, path: str = None, index: dict = None, float32: bool = None, compress: bool = None):
+
+        from utils.defines import BEST_GEN_FLOAT32, BEST_GEN_COMPRESSION
+
+        self.index = dict(index) if index is not None else {} # key -> {'X': array info, 'F': array info} (see writeArray)
+        self.float32 = float32 if float32 is not None else BEST_GEN_FLOAT32
+        self.compress = compress if compress is not None else BEST_GEN_COMPRESSION
+        self.buffer = None # memory map of the file, mapped again when it grows
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='best_gen_', suffix='.bin')
+            os.close(fd)
+            weakref.finalize(self, removeFile, path)
+        self.path = path
+
+    @classmethod
+    def fromDict(cls, best_gen: dict, **kwargs):
+        store = cls(**kwargs)
+        for key, value in best_gen.items():
+            store.add(key, value['X'], value['F'])
+        return store
+
+    def __getstate__(self):
+        raw = b''
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as file:
+                raw = file.read()
+        return {'index': self.index, 'float32': self.float32, 'compress': self.compress, 'raw': raw}
+
+    def __setstate__(self, state: dict):
+        self.__init__(index=state['index'], float32=state['float32'], compress=state['compress'])
+        with open(self.path, 'wb') as file:
+            file.write(state['raw'])
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __getitem__(self, key) -> dict:
+        return {'X': self.getArray(key, 'X'), 'F': self.getArray(key, 'F')}
+
+    def keys(self):
+        return self.index.keys()
+
+    def items(self):
+        return ((key, self[key]) for key in self.index)
+
+    def add(self, key, X, F):
+
+        with open(self.path, 'ab') as file:
+            self.index[key] = {'X': RunLog.writeArray(file, X, self.float32, self.compress), 
+                               'F': RunLog.writeArray(file, F, self.float32, self.compress)}
+
+    def addIndex(self, key, index: dict):
+        self.index[key] = index
+
+    def getArray(self, key, name: str) -> np.ndarray:
+
+        array_info = self.index[key][name]
+        _, _, offset, n_bytes = array_info[:4]
+        if self.buffer is None or len(self.buffer) < offset + n_bytes:
+            self.buffer = np.memmap(self.path, dtype=np.uint8, mode='r') if os.path.getsize(self.path) > 0 else np.zeros(0, np.uint8)
+        return RunLog.readArray(self.buffer, array_info)
+
+def getRunLogFolder(moo: bool) -> str:
+    """Get a new folder inside RUN_LOGS_FOLDER for the RunLog of a run. It is only created when the run starts"""
+
+    from utils.defines import RUN_LOGS_FOLDER
+
+    time_stamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+    return os.path.join(RUN_LOGS_FOLDER, f"{'moo' if moo else 'soo'}_run_{time_stamp}")
+
+class RunLog():
+    """
+        Append-only on-disk log of the finished runs of a RunThread. Each (problem, algorithm, seed) unit is written
+        as soon as it finishes, so a crash or a canceled run does not lose the runs that were already done.
+
+        Folder contents
+        ---------------
+        - 'run.pickle': the run in the format of getSavedRun, with this RunLog in place of the data and
+        best_gen, so the log can be opened with 'Load Run' in the History Tab. The RunLog in it has its folder relative
+        to the file, so the log can be moved (see relativeTo).
+        - 'manifest.json': the seeds and the (problem, algorithm, seed) keys of all the units of the run, in order, so an
+        interrupted run can be resumed with the same seeds, running only the units missing from 'units.jsonl'.
+        If the run is a shard [shard_index, n_shards] of a larger run, only the units with index % n_shards == shard_index
+        belong to it.
+        - 'data.bin': the columns of the data of each unit (n_eval, n_gen and performance indicators), one after the other.
+        - 'best_gen.bin': the X and F arrays of the best generation of each unit, as float32 if BEST_GEN_FLOAT32 and
+        compressed if BEST_GEN_COMPRESSION (see BestGenStore)
+        - 'snapshots.bin': the compressed front snapshots of each unit, if its performance indicators are deferred
+        (see backend/snapshots.py).
+        - 'units.jsonl': one line per finished unit with the ids, index in the manifest, dtypes and byte offsets of its
+        arrays, and the resources it used (see getUnitResources in backend/profiling.py). The line is written after the arrays, so a unit interrupted while being written is ignored.
+        - 'errors.jsonl': one line per failed attempt to run a unit, with the error and its traceback (see Runner.getErrorTable).
+
+        When loaded, the .bin files are memory-mapped and the arrays of each unit are views of them, so opening a
+        large run does not need to read it all into memory. The units are returned in the order of the manifest, 
+        whatever the order they finished in.
+
+        Important Methods
+        -----------------
+        - writeHeader(header: dict): Writes the 'run.pickle' file.
+        - writeManifest(seeds: list, keys: list, shard: tuple): Writes the 'manifest.json' file.
+        - readManifest() -> dict: The manifest of the run, or None if the log has no manifest.
+        - appendUnit(prob_id, algo_id, seed, callback_data, X, F, index, snapshots, resources) -> dict: Appends a finished
+        unit to the log and returns its line of 'units.jsonl'.
+        - appendError(error: dict): Appends the error of a failed unit to the log.
+        - readErrors() -> list: The errors of the failed units.
+        - isComplete() -> bool: Whether all the units in the manifest are in the log.
+        - getResults(categorical) -> ResultsBuilder: Memory-mapped results of all the units in the log.
+        - getBestGen() -> BestGenStore: Memory-mapped best generation of all the units in the log.
+        - getSnapshots() -> dict: Front snapshots of the units in the log that have them.
+        - getResources(categorical) -> ResultsBuilder: Resources used by the units in the log that have them.
+        - relativeTo(file_path: str) -> RunLog: The RunLog with its folder resolved from the folder of the file it was loaded from.
+        - delete(): Deletes the folder of the log.
+    """
+    HEADER_FILE = 'run.pickle'
+    DATA_FILE = 'data.bin'
+    BEST_GEN_FILE = 'best_gen.bin'
+    SNAPSHOTS_FILE = 'snapshots.bin'
+    UNITS_FILE = 'units.jsonl'
+    MANIFEST_FILE = 'manifest.json'
+    ERRORS_FILE = 'errors.jsonl'
+
+    def __init__(self, folder: str):
+        self.folder = os.path.abspath(folder)
+
+    def __getstate__(self):
+        # only the folder is pickled, the arrays are read from the files when needed
+        return {'folder': self.folder}
+
+    def __setstate__(self, state: dict):
+        self.folder = state['folder']
+
+    def __len__(self):
+        return len(self.readUnits())
+
+    def path(self, file_name: str):
+        return os.path.join(self.folder, file_name)
+
+    def relativeTo(self, file_path: str) -> 'RunLog':
+        """Get the RunLog loaded from file_path, with its folder resolved from the folder of the file if it is relative"""
+        if os.path.isabs(self.folder):
+            return self
+        return RunLog(os.path.join(os.path.dirname(os.path.abspath(file_path)), self.folder))
+
+    def delete(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def writeHeader(self, header: dict):
+        """Write the run.pickle file, replacing the data and best_gen by this RunLog, with its folder relative to the file"""
+
+        os.makedirs(self.folder, exist_ok=True)
+        relative_log = RunLog.__new__(RunLog) # RunLog(os.curdir) would make the folder absolute
+        relative_log.folder = os.curdir
+        header = {**header, 'data': relative_log, 'best_gen': relative_log, 'run_counter': None}
+        tmp_path = self.path(self.HEADER_FILE + '.tmp')
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(header, file)
+        os.replace(tmp_path, self.path(self.HEADER_FILE))
+
+    def writeManifest(self, seeds: list, keys: list, shard: tuple = None):
+        """Write the manifest.json file with the seeds and the (problem, algorithm, seed) keys of all the units"""
+
+        os.makedirs(self.folder, exist_ok=True)
+        manifest = {'seeds': [int(seed) for seed in seeds], 
+                    'units': [[prob_id, algo_id, int(seed)] for prob_id, algo_id, seed in keys],
+                    'shard': list(shard) if shard is not None else None}
+        tmp_path = self.path(self.MANIFEST_FILE + '.tmp')
+        with open(tmp_path, 'w') as file:
+            json.dump(manifest, file)
+        os.replace(tmp_path, self.path(self.MANIFEST_FILE))
+
+    def readManifest(self) -> dict:
+
+        if not os.path.exists(self.path(self.MANIFEST_FILE)):
+            return None
+        with open(self.path(self.MANIFEST_FILE), 'r') as file:
+            return json.load(file)
+    
+    def isComplete(self) -> bool:
+
+        manifest = self.readManifest()
+        if manifest is None:
+            return True
+        units = self.readUnits()
+        done = {(unit['prob_id'], unit['algo_id'], unit['seed']) for unit in units}
+        done_indexes = {unit.get('index') for unit in units}
+        shard_index, n_shards = manifest.get('shard') or (0, 1)
+        # units retried with another seed are only found by their index
+        return all(tuple(key) in done or index in done_indexes 
+                   for index, key in enumerate(manifest['units']) if index % n_shards == shard_index)
+
+    def appendUnit(self, prob_id: str, algo_id: str, seed: int, callback_data: dict, X, F, index: int = None, 
+                   snapshots=None, resources: dict = None) -> dict:
+
+        from utils.defines import BEST_GEN_FLOAT32, BEST_GEN_COMPRESSION
+
+        os.makedirs(self.folder, exist_ok=True)
+        with open(self.path(self.DATA_FILE), 'ab') as file:
+            columns = {col: self.writeArray(file, values) for col, values in callback_data.items()}
+        with open(self.path(self.BEST_GEN_FILE), 'ab') as file:
+            best_gen = {'X': self.writeArray(file, X, BEST_GEN_FLOAT32, BEST_GEN_COMPRESSION), 
+                        'F': self.writeArray(file, F, BEST_GEN_FLOAT32, BEST_GEN_COMPRESSION)}
+
+        unit = {'prob_id': prob_id, 'algo_id': algo_id, 'seed': int(seed), 'index': index, 
+                'columns': columns, 'best_gen': best_gen}
+        if snapshots is not None:
+            with open(self.path(self.SNAPSHOTS_FILE), 'ab') as file:
+                unit['snapshots'] = self.writeArray(file, np.frombuffer(snapshots.toBytes(), dtype=np.uint8))
+        if resources is not None:
+            unit['resources'] = resources
+        self.appendLine(self.UNITS_FILE, unit)
+
+        return unit
+
+    def appendError(self, error: dict):
+
+        os.makedirs(self.folder, exist_ok=True)
+        self.appendLine(self.ERRORS_FILE, error)
+
+    def appendLine(self, file_name: str, line: dict):
+        """Append the dictionary as a json line to the file"""
+
+        line = (json.dumps(line) + '\n').encode()
+        with open(self.path(file_name), 'ab+') as file:
+            # start a new line if the last one was interrupted while being written
+            if file.seek(0, os.SEEK_END) > 0:
+                file.seek(-1, os.SEEK_END)
+                line = line if file.read(1) == b'\n' else b'\n' + line
+            file.write(line)
+            file.flush()
+            os.fsync(file.fileno())
+
+    @staticmethod
+    def writeArray(file, values, float32: bool = False, compress: bool = False) -> list:
+        """Append the array to the file and return [dtype, shape, offset, n_bytes], followed by 'zlib' if compress. 
+        Arrays that cannot be stored as raw bytes (object dtype) are pickled. If float32, float64 arrays are stored as float32"""
+
+        array = np.asarray(values)
+        if array.dtype == object:
+            try:
+                array = array.astype(float)
+            except (TypeError, ValueError):
+                pass
+        if float32 and array.dtype == np.float64:
+            array = array.astype(np.float32)
+        file.seek(0, os.SEEK_END)
+        offset = file.tell()
+        if array.dtype == object:
+            raw, dtype = pickle.dumps(array), 'pickle'
+        else:
+            raw, dtype = np.ascontiguousarray(array).tobytes(), array.dtype.str
+        if compress:
+            raw = zlib.compress(raw)
+        file.write(raw)
+        file.flush()
+
+        return [dtype, list(array.shape), offset, len(raw)] + (['zlib'] if compress else [])
+
+    def readUnits(self) -> list:
+        """Read the finished units, sorted by their index in the manifest"""
+
+        units = self.readLines(self.UNITS_FILE)
+        
+        # units of logs written without index keep the order they were written in
+        return sorted(units, key=lambda unit: -1 if unit.get('index') is None else unit['index'])
+
+    def readErrors(self) -> list:
+        return self.readLines(self.ERRORS_FILE)
+
+    def readLines(self, file_name: str) -> list:
+        """Read the json lines of the file, skipping the one that was being written if the run stopped"""
+
+        if not os.path.exists(self.path(file_name)):
+            return []
+
+        lines = []
+        with open(self.path(file_name), 'r') as file:
+            for line in file:
+                try:
+                    lines.append(json.loads(line)) #@IgnoreException
+                except json.JSONDecodeError:
+                    continue
+
+        return lines
+
+    def memoryMap(self, file_name: str):
+        path = self.path(file_name)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        return np.memmap(path, dtype=np.uint8, mode='r')
+
+    @staticmethod
+    def readArray(buffer, array_info: list):
+        """Get a read-only view of the array in the memory-mapped buffer (a read-only copy if it is compressed).
+        0-d arrays are returned as scalars"""
+
+        dtype, shape, offset, n_bytes = array_info[:4]
+        if array_info[4:] == ['zlib']:
+            buffer = np.frombuffer(zlib.decompress(buffer[offset:offset+n_bytes].tobytes()), dtype=np.uint8)
+            offset, n_bytes = 0, len(buffer)
+        if dtype == 'pickle':
+            array = pickle.loads(buffer[offset:offset+n_bytes].tobytes())
+        else:
+            count = int(np.prod(shape))
+            array = np.frombuffer(buffer, dtype=np.dtype(dtype), count=count, offset=offset).reshape(shape)
+
+        return array[()] if array.ndim == 0 else array
+
+    def getResults(self, categorical: list = None) -> ResultsBuilder:
+
+        from utils.defines import SEEDS_KEY, PROB_KEY, ALGO_KEY
+
+        results = ResultsBuilder(categorical)
+        buffer = self.memoryMap(self.DATA_FILE)
+        for unit in self.readUnits():
+            single_run_data = {SEEDS_KEY: unit['seed'], PROB_KEY: unit['prob_id'], ALGO_KEY: unit['algo_id']}
+            single_run_data.update({col: self.readArray(buffer, info) for col, info in unit['columns'].items()})
+            results.append(single_run_data)
+
+        return results
+
+    def getBestGen(self) -> BestGenStore:
+
+        index = {(unit['prob_id'], unit['algo_id'], unit['seed']): unit['best_gen'] for unit in self.readUnits()}
+        return BestGenStore(self.path(self.BEST_GEN_FILE), index)
+
+    def getSnapshots(self) -> dict:
+
+        from backend.snapshots import FrontSnapshots
+
+        snapshots = {}
+        buffer = self.memoryMap(self.SNAPSHOTS_FILE)
+        for unit in self.readUnits():
+            if 'snapshots' in unit:
+                key = (unit['prob_id'], unit['algo_id'], unit['seed'])
+                snapshots[key] = FrontSnapshots.fromBytes(self.readArray(buffer, unit['snapshots']).tobytes())
+
+        return snapshots
+
+    def getResources(self, categorical: list = None) -> ResultsBuilder:
+
+        from utils.defines import SEEDS_KEY, PROB_KEY, ALGO_KEY
+
+        resources = ResultsBuilder(categorical)
+        for unit in self.readUnits():
+            if 'resources' in unit:
+                resources.append({SEEDS_KEY: unit['seed'], PROB_KEY: unit['prob_id'], ALGO_KEY: unit['algo_id'], **unit['resources']})
+
+        return resources
+
+def getSavedRun(runner) -> dict:
+    """Get the dict a run is saved as by 'Save Run' in the app and by the command line runner: the parameters, run
+    options and all the results of the Runner, so the saved file does not depend on its RunLog. The front snapshots are
+    kept, so indicators can be added to a run with deferred performance indicators after it is loaded"""
+    return {'parameters': runner.parameters,
+            'run_options': runner.run_options,
+            'best_gen': runner.best_gen,
+            'data': runner.data,
+            'run_counter': runner.run_counter,
+            'moo': runner.moo,
+            'errors': runner.errors,
+            'snapshots': runner.snapshots,
+            'resources': runner.resources,
+            'unit_indexes': runner.unit_indexes}
+
+def getUnitIndexes(units: list) -> dict:
+    """Get (problem, algorithm, seed) -> index in the run of the units of a RunLog (see RunLog.readUnits)"""
+    return {(unit['prob_id'], unit['algo_id'], unit['seed']): unit['index'] for unit in units if unit.get('index') is not None}
+
+def mergeRuns(runs: list) -> dict:
+    """
+        Merge the runs of the shards of a run (see Runner) into one run, in the format of getSavedRun, so it can
+        be opened with 'Load Run'. The runs can be saved runs or run log headers (the 'run.pickle' file of a RunLog).
+        The units are sorted in the order of an unsharded run by their index in it (see Runner.unit_indexes), and a unit
+        that is in more than one run is only added once. Runs saved without the indexes are sorted by seed.
+        The errors of the failed units of all the runs are kept, and the resources and front snapshots of the units that
+        have them.
+    """
+    from utils.defines import SEEDS_KEY, PROB_KEY, ALGO_KEY
+
+    if len(runs) == 0:
+        raise ValueError("There are no runs to merge")
+    for run in runs[1:]:
+        if run['moo'] != runs[0]['moo'] or run['run_options'] != runs[0]['run_options'] or run['parameters'] != runs[0]['parameters']:
+            raise ValueError("Only the shards of the same run can be merged, with the same run options and parameters")
+
+    # get the units (data of each (problem, algorithm, seed)) of all the runs, and the best_gen of the run of each unit
+    units, run_best_gens, unit_resources, unit_indexes, snapshots, errors = {}, {}, {}, {}, {}, []
+    for run in runs:
+        if isinstance(run['data'], RunLog):
+            data, run_best_gen = run['data'].getResults().getDataFrame(), run['data'].getBestGen()
+            resources = run['data'].getResources().getDataFrame()
+            errors += run['data'].readErrors()
+            indexes = getUnitIndexes(run['data'].readUnits())
+            run_snapshots = run['data'].getSnapshots()
+        else:
+            data, run_best_gen = run['data'], run['best_gen']
+            # runs saved before the resources or the unit indexes existed do not have them
+            resources = run.get('resources', pd.DataFrame())
+            errors += run.get('errors', [])
+            indexes = run.get('unit_indexes', {})
+            run_snapshots = run.get('snapshots', {})
+        for key, index in indexes.items():
+            unit_indexes.setdefault(key, index)
+        for key, unit_snapshots in run_snapshots.items():
+            snapshots.setdefault(key, unit_snapshots)
+        for row in resources.to_dict('records'):
+            unit_resources.setdefault((row[PROB_KEY], row[ALGO_KEY], row[SEEDS_KEY]), row)
+        if data.empty:
+            continue
+        for key, unit_data in data.groupby([PROB_KEY, ALGO_KEY, SEEDS_KEY], sort=False, observed=True):
+            units.setdefault(key, unit_data)
+        for key in run_best_gen.keys():
+            run_best_gens.setdefault(key, run_best_gen)
+
+    # order of the units in an unsharded run, with the units not in the run options last. A unit retried with another
+    # seed is only in its place by its index
+    run_options = runs[0]['run_options']
+    order = {key: i for i, key in enumerate((prob_id, algo_id) for prob_id in run_options[PROB_KEY] for algo_id in run_options[ALGO_KEY])}
+    sort_key = lambda key: (order.get((key[0], key[1]), len(order)), unit_indexes.get(key, -1), key[2])
+
+    results = ResultsBuilder(categorical=[PROB_KEY, ALGO_KEY])
+    for key in sorted(units, key=sort_key):
+        results.append({col: np.asarray(units[key][col]) for col in units[key].columns})
+    best_gen = BestGenStore()
+    for key in sorted(run_best_gens, key=sort_key):
+        unit_best_gen = run_best_gens[key][key]
+        best_gen.add(key, unit_best_gen['X'], unit_best_gen['F'])
+    resources = ResultsBuilder(categorical=[PROB_KEY, ALGO_KEY])
+    for key in sorted(unit_resources, key=sort_key):
+        resources.append(unit_resources[key])
+
+    return {'parameters': runs[0]['parameters'],
+            'run_options': run_options,
+            'best_gen': best_gen,
+            'data': results.getDataFrame(),
+            'run_counter': len(units),
+            'moo': runs[0]['moo'],
+            'errors': errors,
+            'snapshots': {key: snapshots[key] for key in sorted(snapshots, key=sort_key) if key in units},
+            'resources': resources.getDataFrame(),
+            'unit_indexes': {key: unit_indexes[key] for key in units if key in unit_indexes}}
@@ -0,0 +1,680 @@
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import multiprocessing
+import traceback
+import copy
+
+import numpy as np
+import pandas as pd
+
+from pymoo.core.algorithm import Algorithm
+from pymoo.core.callback import Callback
+from pymoo.core.result import Result
+from pymoo.optimize import minimize
+
+from backend.results import ResultsBuilder, RunLog, GrowableArray, BestGenStore, getUnitIndexes
+from backend.cache import ResultCache
+from backend.snapshots import FrontSnapshots, computeUnitsIndicators
+from backend.indicators import getPIInputs, callPIs
+from backend.seeding import getRunSeeds, getUnitRandomState, getRetrySeed
+from backend.profiling import PhaseTimer, PeakRSSSampler, getPhaseColumns, getPhaseSummary, getTimes, getUnitResources
+from utils.utils import debug_print, DEBUG
+from utils.defines import (SEEDS_KEY, ALGO_KEY, PROB_KEY, PI_KEY, N_EVAL_KEY, N_GEN_KEY, STOP_ON_ERROR, UNIT_RETRIES, RUN_SEED_KEY, 
+                           ERROR_TABLE_COLUMNS, RECORD_EVERY_GEN, RECORD_EVERY_K_EVALS, RECORD_LOG_SPACED, RECORD_N_POINTS,
+                           RECORDING_POLICIES, PI_THREADS)
+
+class MyCallback(Callback):
+    """
+        Records n_eval, n_gen and the performance indicators of the generations of a run chosen by the recording policy
+        (policy, k) (see RECORDING_POLICIES in utils/defines.py). The performance indicators are only computed for the
+        recorded generations, and the final generation is always recorded:
+        
+        - RECORD_EVERY_GEN: every generation.
+        - RECORD_EVERY_K_EVALS: the first generation after every k evaluations.
+        - RECORD_LOG_SPACED: the first generation after each of the checkpoints 10**(i/k) evaluations, i = 0, 1, ...
+        - RECORD_N_POINTS: when 2k generations are recorded, every other one is dropped and the spacing (in evaluations)
+        between the recorded generations is doubled, so there are always between k and 2k evenly spaced generations.
+        
+        If defer_pis, the performance indicators are not computed during the run: only the objective values of the
+        optimum of the recorded generations (and of their population, if an indicator needs it) are stored in
+        self.snapshots (see backend/snapshots.py), and computeDeferred computes the indicators from them after the run.
+        
+        If pi_threads > 1, the performance indicators of a generation are computed at the same time in a thread pool
+        (see backend/indicators.py), and added to the data in the same order.
+        
+        The values are stored in typed numpy buffers (see GrowableArray in backend/results.py), with the capacity of the
+        number of generations that will be recorded if the termination tells it. getData() returns views of them.
+        
+        If profile, the callback has a PhaseTimer (see backend/profiling.py) that times the phases of each generation,
+        and getData() also returns their times.
+    """
+    def __init__(self, pi_ids:list, pi_objects:list, recording:tuple=None, defer_pis:bool=False, pi_threads:int=PI_THREADS,
+                 profile:bool=False):
+        super().__init__()
+        
+        self.pi_ids = pi_ids
+        self.buffers = None # GrowableArray of each column, created with the first recorded generation
+        
+        self.pi_objects = pi_objects
+        self.pi_inputs = [getPIInputs(pi_object) for pi_object in pi_objects] # inputs each indicator needs besides opt_feas
+        self.pi_threads = pi_threads
+        self.needs_pop = any(name in pi_inputs for pi_inputs in self.pi_inputs for name in ('pop', 'pop_feas'))
+        self.policy, self.k = recording if recording is not None else (RECORD_EVERY_GEN, None)
+        if self.policy not in RECORDING_POLICIES:
+            raise ValueError(f"Unknown recording policy '{self.policy}', it must be one of {RECORDING_POLICIES}")
+        if self.policy != RECORD_EVERY_GEN and not (isinstance(self.k, int) and self.k > 0):
+            raise ValueError(f"The recording policy '{self.policy}' needs a positive integer k, got {self.k}")
+        self.next_eval = 0 # evaluations of the next generation to record
+        self.step = 0 # evaluations between the recorded generations for RECORD_N_POINTS
+        self.defer_pis = defer_pis
+        self.snapshots = None # FrontSnapshots of the recorded generations if defer_pis, created with the first one
+        self.timer = PhaseTimer() if profile else None
+
+    def getData(self) -> dict:
+        """Get the recorded n_eval, n_gen and performance indicators, as numpy arrays (views of the buffers), and the
+        times of the phases if profiling"""
+        if self.buffers is None:
+            data = {key: np.array([]) for key in [N_EVAL_KEY, N_GEN_KEY] + list(self.pi_ids)}
+        else:
+            data = {key: buffer.view() for key, buffer in self.buffers.items()}
+        if self.timer is not None:
+            data.update(self.timer.getColumns(data[N_GEN_KEY]))
+        return data
+
+    def getCapacity(self, algo: Algorithm) -> int:
+        """Get the number of generations that will be recorded, if the termination has a maximum number of generations
+        or evaluations, else the default capacity of the buffers"""
+        
+        n_max_gen = getattr(algo.termination, 'n_max_gen', None)
+        n_max_evals = getattr(algo.termination, 'n_max_evals', None)
+        pop_size = getattr(algo, 'pop_size', None)
+        if n_max_evals is not None and n_max_gen is None and pop_size:
+            n_max_gen = n_max_evals / pop_size
+        if n_max_gen is None or (n_max_evals is None and self.policy in [RECORD_EVERY_K_EVALS, RECORD_LOG_SPACED]):
+            return 64
+        
+        if self.policy == RECORD_EVERY_K_EVALS:
+            n = n_max_evals / self.k
+        elif self.policy == RECORD_LOG_SPACED:
+            n = self.k * np.log10(max(n_max_evals, 1))
+        elif self.policy == RECORD_N_POINTS:
+            n = 2 * self.k
+        else:
+            n = n_max_gen
+        # the final generation, and the initial one of some algorithms
+        return int(min(n, n_max_gen)) + 2
+
+    def notify(self, algo: Algorithm):
+        if self.timer is None:
+            self.recordGeneration(algo)
+            return
+        
+        self.timer.enter('callback')
+        self.recordGeneration(algo)
+        self.timer.exit()
+        self.timer.lap(algo.n_gen)
+
+    def recordGeneration(self, algo: Algorithm):
+        if algo.opt is None:
+            return
+        
+        # the termination is updated before the callback is called, so the final generation is known
+        final = algo.termination.has_terminated()
+        if final or algo.evaluator.n_eval >= self.next_eval:
+            self.record(algo)
+            self.setNextEval(final)
+
+    def recordFinal(self, algo: Algorithm):
+        """Record the final generation if it was not, e.g. if the algorithm stopped without the termination knowing it"""
+        if algo.opt is not None and (self.buffers is None or self.buffers[N_EVAL_KEY].view()[-1] != algo.evaluator.n_eval):
+            self.record(algo)
+
+    def setNextEval(self, final: bool):
+        
+        n_evals = self.buffers[N_EVAL_KEY].view()
+        n_eval = n_evals[-1]
+        if self.policy == RECORD_EVERY_K_EVALS:
+            self.next_eval = (n_eval // self.k + 1) * self.k
+        elif self.policy == RECORD_LOG_SPACED:
+            # rounded so a checkpoint is not missed by the floating point error of the log
+            self.next_eval = 10 ** ((np.floor(np.round(np.log10(max(n_eval, 1)) * self.k, 9)) + 1) / self.k)
+        elif self.policy == RECORD_N_POINTS and not final:
+            if len(n_evals) >= 2 * self.k:
+                # keep the first generation and every other one after it
+                for buffer in self.buffers.values():
+                    buffer.thin(2)
+                if self.snapshots is not None:
+                    self.snapshots.thin(2)
+                n_evals = self.buffers[N_EVAL_KEY].view()
+                self.step = (n_evals[-1] - n_evals[0]) / (len(n_evals) - 1)
+            self.next_eval = n_evals[-1] + self.step
+
+    def record(self, algo: Algorithm):
+
+        n_gen, n_eval = algo.n_gen, algo.evaluator.n_eval
+        if self.buffers is None:
+            capacity = self.getCapacity(algo)
+            self.buffers = {key: GrowableArray(capacity) for key in [N_EVAL_KEY, N_GEN_KEY] + list(self.pi_ids)}
+        self.buffers[N_EVAL_KEY].append(n_eval)
+        self.buffers[N_GEN_KEY].append(n_gen)
+        
+        if self.defer_pis:
+            if self.snapshots is None:
+                self.snapshots = FrontSnapshots(algo.problem.n_obj, with_pops=self.needs_pop)
+            self.snapshots.append(n_eval, algo.opt.get("F"), algo.pop.get("F") if self.needs_pop else None)
+            return
+    
+        # only the arrays the indicators need (see backend/indicators.py)
+        opt = algo.opt.get("F")
+        values = {'opt': opt, 'n_eval': n_eval}
+        if self.needs_pop:
+            pop = algo.pop.get("F")
+            values['pop'] = pop
+            values['pop_feas'] = np.nan if len(pop) == 0 else pop
+        
+        # if no feasible solution found
+        opt_feas = np.nan if len(opt) == 0 else opt 
+                
+        # get the performance indicators values and add them to the data
+        pi_values = callPIs(self.pi_objects, self.pi_inputs, opt_feas, values, self.pi_threads)
+        for pi_id, pi_value in zip(self.pi_ids, pi_values):
+            self.buffers[pi_id].append(pi_value)
+            
+    def computeDeferred(self):
+        """Compute the performance indicators of the recorded generations from the snapshots, if defer_pis"""
+        if self.defer_pis and self.snapshots is not None:
+            for pi_id, values in self.snapshots.computeIndicators(self.pi_ids, self.pi_objects).items():
+                self.buffers[pi_id].setValues(values)
+
+
+class RunArgs():
+    def __init__(self, prob_id, prob_object, algo_id, algo_object, pi_ids, pi_objects, term_object, config_hash=None, seed_key=None, 
+                 recording=None, defer_pis=False, profile=False):
+        self.prob_id = prob_id
+        self.prob_object = prob_object 
+        self.algo_id = algo_id
+        self.algo_object = algo_object
+        self.pi_ids = pi_ids
+        self.pi_objects = pi_objects
+        self.term_object = term_object                
+        self.config_hash = config_hash # hash of the parameters of the unit for the ResultCache, None to not cache it
+        self.seed_key = seed_key # spawn key of the random state of the units (see backend/seeding.py), None to use the global one
+        self.recording = recording # recording policy of the callback (see MyCallback), None to record every generation
+        self.defer_pis = defer_pis # compute the performance indicators from front snapshots after the run (see backend/snapshots.py)
+        self.profile = profile # time the phases of the generations (see backend/profiling.py)
+
+def getBestGen(res: Result, moo: bool):
+    """Get the feasible solutions of the last generation (SOO) or of the best pareto set (MOO) from the result"""
+    if moo:
+        feas = np.where(res.algorithm.opt.get("feasible"))[0]
+        F = res.algorithm.opt.get("F")[feas] if len(feas) > 0 else np.nan
+        X = res.algorithm.opt.get("X")[feas] if len(feas) > 0 else np.nan
+    else:
+        feas = np.where(res.algorithm.pop.get("feasible"))[0]
+        F = res.algorithm.pop.get("F")[feas] if len(feas) > 0 else np.nan
+        X = res.algorithm.pop.get("X")[feas] if len(feas) > 0 else np.nan
+        
+    return X, F
+
+def runUnit(run_args: RunArgs, seed: int, moo: bool):
+    """Run one (problem, algorithm, seed) unit and return the callback data, the best generation X and F, the
+    front snapshots if the performance indicators are deferred (else None) and the resources it used (see getUnitResources). 
+    It is a module level function so it can also be sent to the worker processes of a process pool"""
+    
+    start = getTimes()
+    with PeakRSSSampler() as memory:
+        # the algorithm is copied (as minimize would) to set the random state of the unit without changing the shared one
+        algorithm = copy.deepcopy(run_args.algo_object)
+        algorithm.random_state = getUnitRandomState(seed, run_args.seed_key) if run_args.seed_key is not None else None
+        callback = MyCallback(run_args.pi_ids, run_args.pi_objects, run_args.recording, run_args.defer_pis, profile=run_args.profile)
+        if callback.timer is not None:
+            callback.timer.instrument(algorithm)
+        res = minimize(algorithm=algorithm, #@IgnoreException
+                       problem=run_args.prob_object,
+                       termination=run_args.term_object,
+                       seed=int(seed), # pymoo calls random.seed, which only accepts python ints from Python 3.11
+                       callback=callback,
+                       copy_algorithm=False)
+        deferred_start = getTimes()
+        callback.recordFinal(res.algorithm)
+        callback.computeDeferred()
+        if callback.timer is not None:
+            # the performance indicators computed after the run are part of the callback of the last generation
+            callback.timer.addToLast('callback', getTimes() - deferred_start)
+        X, F = getBestGen(res, moo)
+    
+    return callback.getData(), X, F, callback.snapshots, getUnitResources(start, res.algorithm.evaluator.n_eval, memory.peak)
+        
+        
+class Runner():
+    """
+        A class to run the optimization process of every (problem, algorithm, seed) unit of a run,
+        calling the minimize function from pymoo. It does not use Qt, so it can be used in headless batch jobs
+        (see backend/cli.py). RunThread runs it in a separate thread of the app.
+
+        The progress is sent through the emitProgress method, which RunThread overrides to update the progress bar 
+        and the status bar.
+        The run can be canceled by calling the cancel method.
+        
+        If n_workers > 1, each (problem, algorithm, seed) unit is sent to a pool of n_workers processes. 
+        The results are added to the data in the same order as in a single process run.
+        Each unit has its own random state (see backend/seeding.py), so the results do not depend on n_workers nor on the
+        order the units are run in.
+        
+        If a RunLog is given, each finished unit is also appended to it, so the results are kept on disk during the run.
+        An interrupted run can be resumed by calling loadRunLog with resume=True before starting the thread: the seeds
+        are read from the manifest of the log and only the units that are not in the log are run. 
+        
+        If a ResultCache is given, the units whose RunArgs have a config_hash are looked up in it before being run,
+        and stored in it after being run.
+        
+        If a shard (shard_index, n_shards) is given, only the units with index % n_shards == shard_index are run, so that
+        a large run can be split in n_shards independent runs (e.g. the tasks of a cluster job array) and merged
+        afterwards with mergeRuns from backend/results.py. The seeds must be fixed, so all the shards use the same ones.
+        The index of each unit in the whole run is kept in self.unit_indexes, (problem, algorithm, seed) -> index, so
+        mergeRuns can put the units back in their order, also the ones retried with another seed.
+        
+        If a unit fails, the error is recorded in self.errors (see getErrorTable) and in the RunLog, and the other units
+        keep running, unless stop_on_error, which cancels the run. A failed unit is run again up to 'retries' times, 
+        with a different seed each time (see getRetrySeed in backend/seeding.py), and if it succeeds its results are added
+        with the seed it was run with.
+        
+        If the RunArgs defer the performance indicators, the front snapshots of each unit are kept in self.snapshots
+        (and in the RunLog), so more indicators can be computed for the finished run with addIndicators.
+        
+        The resources used by each unit (wall and cpu time, peak resident memory and evaluations per second, see 
+        getUnitResources in backend/profiling.py) are kept in self.resources, a DataFrame with one row per unit. The 
+        resources of a cached unit are the ones of the run that cached it.
+        
+        AFTER RUN:
+        -----------
+        self.data
+        -----------
+        
+        stores the data from all runs in a pandas DataFrame with structure:
+        number of seeds | algorithm name | problem name | number of evaluations | number of generations | performance indicators values  
+        
+        The runs are accumulated in self.results (a ResultsBuilder), and the DataFrame is only built when self.data is read.
+        The problem and algorithm names are categorical columns.
+        If the RunArgs are profiled, it also has the wall and cpu time columns of the phases of the generations 
+        (see backend/profiling.py), and getTimeSummary gives their share of the time of the run.
+        
+        -----------
+        self.best_gen
+        -----------
+        
+        It stores the last generation of solutions and the best solution so far in a BestGenStore (the file of the 
+        RunLog, or a temporary one, see backend/results.py), depending on the problem type:
+        
+        If SOO, the format is:
+        (problem name, algorithm name, seed): 
+        -> [solution coordinates in decision space, solution value in objective space]
+        
+        so that the Fitness Landscape can be plotted later.
+        
+        If MOO, the format is:
+        (problem name, algorithm name, seed):
+        -> [objective values of the best pareto set]
+    """
+    def __init__(self, run_args_list:list, term_id, n_seeds:int, moo:bool, parameters:dict, run_options:dict, fixed_seeds:bool,
+                 n_workers:int=1, run_log:RunLog=None, result_cache:ResultCache=None, shard:tuple=None, 
+                 retries:int=UNIT_RETRIES, stop_on_error:bool=STOP_ON_ERROR):
+        
+        self.parameters = parameters
+        self.run_options = run_options
+        self.n_seeds = n_seeds
+        self.term_id = term_id
+        self.run_args_list = run_args_list
+        self.moo = moo
+        self.fixed_seeds = fixed_seeds
+        self.n_workers = n_workers
+        self.run_log = run_log
+        self.result_cache = result_cache
+        self.shard = shard
+        self.retries = retries
+        self.stop_on_error = stop_on_error
+        self.errors = [] # one dictionary (a row of getErrorTable) for each failed attempt to run a unit
+        self.seeds = None
+        self.resume = False
+        self.completed_units = set() # indexes of the units already in the run log when resuming
+        self.unit_indexes = {} # (problem name, algorithm name, seed it was run with) -> index of the unit in the run
+        
+        self.total_runs = len(self.getShardIndexes(len(run_args_list)*n_seeds))
+        self.canceled = False
+        self.best_gen = run_log.getBestGen() if run_log is not None else BestGenStore()
+        self.snapshots = {} # (problem name, algorithm name, seed) -> FrontSnapshots, if the indicators are deferred
+        self.resource_results = ResultsBuilder(categorical=[PROB_KEY, ALGO_KEY]) # one row per unit, see self.resources
+        self.bookkeeping = np.zeros(2) # [wall, cpu] time spent storing the results of the units, if they are profiled
+        self.results = ResultsBuilder(categorical=[PROB_KEY, ALGO_KEY])
+        self.run_counter = 0
+        
+    @property
+    def data(self) -> pd.DataFrame:
+        return self.results.getDataFrame()
+    
+    @data.setter
+    def data(self, data: pd.DataFrame):
+        self.results = ResultsBuilder.fromDataFrame(data, categorical=[PROB_KEY, ALGO_KEY])
+
+    @property
+    def resources(self) -> pd.DataFrame:
+        return self.resource_results.getDataFrame()
+
+    @resources.setter
+    def resources(self, resources: pd.DataFrame):
+        self.resource_results = ResultsBuilder.fromDataFrame(resources, categorical=[PROB_KEY, ALGO_KEY])
+        
+    def loadRunLog(self, run_log: RunLog, resume: bool = False):
+        """Set the results of the run from a RunLog. The arrays are memory-mapped from its files. 
+        If resume, the seeds are taken from the manifest, so that running the thread completes the log"""
+        self.run_log = run_log
+        self.results = run_log.getResults(categorical=[PROB_KEY, ALGO_KEY])
+        self.best_gen = run_log.getBestGen()
+        self.snapshots = run_log.getSnapshots()
+        self.resource_results = run_log.getResources(categorical=[PROB_KEY, ALGO_KEY])
+        self.errors = run_log.readErrors()
+        self.unit_indexes = getUnitIndexes(run_log.readUnits())
+        self.run_counter = len(self.best_gen)
+        
+        manifest = run_log.readManifest()
+        if resume and manifest is not None:
+            self.resume = True
+            self.seeds = np.array(manifest['seeds'])
+            self.completed_units = {unit['index'] for unit in run_log.readUnits()}
+            if manifest.get('shard') is not None:
+                self.shard = tuple(manifest['shard'])
+                self.total_runs = len(self.getShardIndexes(len(manifest['units'])))
+    
+    def getShardIndexes(self, n_units: int) -> range:
+        """Get the indexes of the units that belong to the shard of the run (all of them if there is no shard)"""
+        shard_index, n_shards = self.shard if self.shard is not None else (0, 1)
+        return range(shard_index, n_units, n_shards)
+
+    def cancel(self):
+        self.canceled = True    
+
+    def run(self):
+        if DEBUG:
+            import debugpy
+            debugpy.debug_this_thread()
+        if self.seeds is None:
+            self.seeds = getRunSeeds(self.n_seeds, self.fixed_seeds)
+        units = [(run_args, seed) for run_args in self.run_args_list for seed in self.seeds]
+        
+        if self.run_log is not None:
+            recording = self.run_args_list[0].recording if len(self.run_args_list) > 0 else None
+            defer_pis = any(run_args.defer_pis for run_args in self.run_args_list)
+            profile = any(run_args.profile for run_args in self.run_args_list)
+            self.run_log.writeHeader({'parameters': self.parameters, 'run_options': self.run_options, 'moo': self.moo, 
+                                      'recording': recording, 'defer_pis': defer_pis, 'profile': profile})
+            self.run_log.writeManifest(self.seeds, [(run_args.prob_id, run_args.algo_id, seed) for run_args, seed in units], self.shard)
+        
+        # only the units of the shard, and when resuming, skip the units that are already in the log
+        shard_indexes = self.getShardIndexes(len(units))
+        units = [(index, run_args, seed) for index, (run_args, seed) in enumerate(units) 
+                 if index in shard_indexes and index not in self.completed_units]
+        
+        if self.n_workers > 1 and len(units) > 1:
+            self.runParallel(units)
+        else:
+            self.runSerial(units)
+            
+        if self.resume and not self.canceled:
+            # reload the results so they are in the order of the manifest, as in an uninterrupted run
+            self.loadRunLog(self.run_log)
+    
+    def runSerial(self, units: list):
+        for index, run_args, seed in units:
+            if self.canceled:
+                return
+            self.progressUpdate(run_args.algo_id, run_args.prob_id, seed)
+            result = self.singleRun(run_args, seed, index)
+            if result is not None:
+                run_seed, result = result
+                self.updateData(run_args, run_seed, *result, index=index)
+
+    def runParallel(self, units: list):
+        """Send the units to a process pool and add the results as they arrive, keeping the order of the units"""
+        
+        # spawn instead of fork, since the parent process has Qt threads running 
+        context = multiprocessing.get_context("spawn")
+        n_workers = min(self.n_workers, len(units))
+        executor = ProcessPoolExecutor(max_workers=n_workers, mp_context=context)
+        # futures -> (position in units, attempt, seed it was run with), finished -> (seed, result) or None if it failed
+        futures, finished, next_unit = {}, {}, 0
+        for i, (_, run_args, seed) in enumerate(units):
+            result = self.getCachedResult(run_args, seed)
+            if result is not None:
+                finished[i] = seed, result
+                self.progressUpdate(run_args.algo_id, run_args.prob_id, seed, finished=True)
+            else:
+                futures[executor.submit(runUnit, run_args, seed, self.moo)] = i, 0, seed
+        pending = set(futures.keys())
+        
+        if len(futures) > 0:
+            self.emitProgress(f"Running {len(futures)} runs on {n_workers} processes", self.run_counter/self.total_runs*100)
+        while next_unit < len(units):
+            if self.canceled:
+                executor.shutdown(wait=False, cancel_futures=True)
+                return
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, attempt, run_seed = futures.pop(future)
+                index, run_args, seed = units[i]
+                try:
+                    result = future.result() #@IgnoreException
+                except Exception as e:
+                    self.unitError(run_args, seed, run_seed, e, index)
+                    if self.canceled:
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        return
+                    if attempt < self.retries:
+                        retry_seed = getRetrySeed(seed, attempt+1)
+                        retry = executor.submit(runUnit, run_args, retry_seed, self.moo)
+                        futures[retry] = i, attempt+1, retry_seed
+                        pending.add(retry)
+                        continue
+                    finished[i] = None
+                else:
+                    finished[i] = run_seed, result
+                    self.putCachedResult(run_args, run_seed, *result)
+                self.progressUpdate(run_args.algo_id, run_args.prob_id, seed, finished=True)
+            
+            # add the results that are next in the order of the units (cached results are added right away)
+            while next_unit in finished:
+                index, run_args, _ = units[next_unit]
+                result = finished.pop(next_unit)
+                if result is not None:
+                    run_seed, result = result
+                    self.updateData(run_args, run_seed, *result, index=index)
+                next_unit += 1
+                
+        executor.shutdown()
+                
+    def singleRun(self, run_args: RunArgs, seed: int, index: int = None):
+        """Run the unit, retrying it with other seeds if it fails. Returns (seed it was run with, result), 
+        or None if all the attempts failed"""
+        
+        for attempt in range(self.retries + 1):
+            run_seed = seed if attempt == 0 else getRetrySeed(seed, attempt)
+            result = self.getCachedResult(run_args, run_seed)
+            if result is not None:
+                return run_seed, result
+            try:
+                result = runUnit(run_args, run_seed, self.moo) #@IgnoreException
+            except Exception as e: 
+                self.unitError(run_args, seed, run_seed, e, index)
+                if self.canceled:
+                    return None
+            else:
+                self.putCachedResult(run_args, run_seed, *result)
+                return run_seed, result
+                
+        return None
+    
+    def getCachedResult(self, run_args: RunArgs, seed: int):
+        """Get the (callback_data, X, F, snapshots, resources) of the unit from the ResultCache, or None if it is not cached"""
+        if self.result_cache is None or run_args.config_hash is None:
+            return None
+        
+        result = self.result_cache.get(run_args.config_hash, seed)
+        if result is None:
+            return None
+        
+        # the cached performance indicators are in the same order, but may have other ids
+        # entries cached before the snapshots or the resources existed do not have them
+        callback_data, X, F, *extra = result
+        snapshots, resources = (list(extra) + [None, None])[:2]
+        keys = [N_EVAL_KEY, N_GEN_KEY] + list(run_args.pi_ids) + (getPhaseColumns() if run_args.profile else [])
+        if len(keys) != len(callback_data):
+            return None
+        return dict(zip(keys, callback_data.values())), X, F, snapshots, resources
+        
+    def putCachedResult(self, run_args: RunArgs, seed: int, callback_data: dict, X, F, snapshots: FrontSnapshots = None, 
+                        resources: dict = None):
+        if self.result_cache is not None and run_args.config_hash is not None:
+            start = getTimes()
+            self.result_cache.put(run_args.config_hash, seed, callback_data, X, F, snapshots, resources)
+            if run_args.profile:
+                self.bookkeeping += getTimes() - start
+    
+    def emitProgress(self, text: str, percentage: float):
+        """Send the progress of the run. A percentage of -1 means that the run stopped with the error in the text.
+        Overridden by RunThread and by the command line runner"""
+        pass
+    
+    def unitError(self, run_args: RunArgs, seed: int, run_seed: int, e: Exception, index: int = None):
+        """Record the error of a failed unit, and cancel the run if stop_on_error"""
+        
+        error = {'index': index, PROB_KEY: run_args.prob_id, ALGO_KEY: run_args.algo_id, SEEDS_KEY: int(seed), 
+                 RUN_SEED_KEY: int(run_seed), 'error': f"{type(e).__name__}: {e}",
+                 'traceback': ''.join(traceback.format_exception(type(e), e, e.__traceback__))}
+        self.errors.append(error)
+        if self.run_log is not None:
+            self.run_log.appendError(error)
+        
+        if self.stop_on_error:
+            self.runError(run_args, run_seed, e)
+        else:
+            debug_print(error['traceback'])
+            self.emitProgress(f"Error while running {run_args.algo_id} on {run_args.prob_id}, seed {run_seed}: {error['error']}",
+                              self.run_counter/self.total_runs*100)
+    
+    def getErrorTable(self) -> pd.DataFrame:
+        """Get the errors of the failed units, one row for each failed attempt"""
+        return pd.DataFrame(self.errors, columns=ERROR_TABLE_COLUMNS)
+    
+    def getFailedUnits(self) -> set:
+        """Get the (problem, algorithm, seed) keys of the units that failed in all their attempts"""
+        
+        n_attempts = {}
+        for error in self.errors:
+            key = (error[PROB_KEY], error[ALGO_KEY], error[SEEDS_KEY])
+            n_attempts[key] = n_attempts.get(key, 0) + 1
+        
+        # a unit that succeeded has results with its seed or one of its retry seeds
+        failed = set()
+        for (prob_id, algo_id, seed), n in n_attempts.items():
+            run_seeds = [seed] + [getRetrySeed(seed, attempt) for attempt in range(1, n+1)]
+            if not any((prob_id, algo_id, run_seed) in self.best_gen for run_seed in run_seeds):
+                failed.add((prob_id, algo_id, seed))
+        
+        return failed
+    
+    def getErrorsMessage(self, max_errors: int = 5) -> str:
+        """Get a message with the number of failed units and the first errors"""
+        
+        message = f"{len(self.errors)} attempts to run a unit failed, {len(self.getFailedUnits())} units have no results:"
+        for error in self.errors[:max_errors]:
+            message += f"\n- {error[ALGO_KEY]} on {error[PROB_KEY]}, seed {error[RUN_SEED_KEY]}: {error['error']}"
+        if len(self.errors) > max_errors:
+            message += f"\n- ... and {len(self.errors) - max_errors} more"
+        
+        return message
+    
+    def runError(self, run_args: RunArgs, seed: int, e: Exception):
+        """Cancel the run and send the error message to the progress frame"""
+        self.canceled = True
+        error_message = (f"Error while running {run_args.algo_id} on {run_args.prob_id}, seed {seed}:\n{e}"
+                         "\nPlease Make sure the algorithm is compatible with the problem.")
+        debug_print(error_message)
+        self.emitProgress(error_message, -1)
+
+    def progressUpdate(self, algo_id: str, prob_id: str, seed: int, finished: bool = False):
+        """Update the progress bar and the text in the status bar. When running in parallel, 
+        the update is done after each run is finished instead of before it starts"""
+        
+        if finished:
+            self.run_counter += 1
+            text = f"Finished Algorithm '{algo_id}' on Problem '{prob_id}', seed {seed}"
+            percentage = self.run_counter/self.total_runs*100
+        else:
+            text = f"Running Algorithm '{algo_id}' on Problem '{prob_id}', seed {seed}"
+            percentage = self.run_counter/self.total_runs*100
+            self.run_counter += 1
+        self.emitProgress(text, percentage)
+        debug_print(f"{percentage:.0f}%  - ",text)
+        
+    def updateData(self, run_args: RunArgs, seed: int, callback_data: dict, X, F, snapshots: FrontSnapshots = None, 
+                   resources: dict = None, index: int = None):
+        
+        start = getTimes()
+        single_run_data = {SEEDS_KEY: seed, PROB_KEY: run_args.prob_id, ALGO_KEY: run_args.algo_id}
+        single_run_data.update(callback_data)
+        self.results.append(single_run_data)
+        
+        key = (run_args.prob_id, run_args.algo_id, seed)
+        if index is not None:
+            self.unit_indexes[key] = index
+        if self.run_log is not None:
+            unit = self.run_log.appendUnit(run_args.prob_id, run_args.algo_id, seed, callback_data, X, F, index, snapshots, 
+                                           resources)
+            # self.best_gen is the store of the RunLog file, where the arrays were just written
+            self.best_gen.addIndex(key, unit['best_gen'])
+        else:
+            self.best_gen.add(key, X, F)
+            
+        if snapshots is not None:
+            self.snapshots[key] = snapshots
+        if resources is not None:
+            self.resource_results.append({SEEDS_KEY: seed, PROB_KEY: run_args.prob_id, ALGO_KEY: run_args.algo_id, **resources})
+        if run_args.profile:
+            self.bookkeeping += getTimes() - start
+        
+    def getTimeSummary(self) -> str:
+        """Get the share of the time of each phase of the run, if it was profiled (see getPhaseSummary), else ''"""
+        return getPhaseSummary(self.data, self.bookkeeping if self.bookkeeping.any() else None)
+        
+    def addIndicators(self, run_args_list: list):
+        """Compute more performance indicators for the units of the finished run from their front snapshots, without
+        running them again, and add them to the data and to the performance indicators of the run options.
+        The RunArgs (see getRunArgsList in backend/build.py) have the indicators of each (problem, algorithm) pair.
+        The indicators are computed in n_workers processes. Raises a ValueError if a unit has no snapshots, or if an
+        indicator needs the population and the snapshots do not have it"""
+        
+        data = self.data
+        if data.empty:
+            return
+        pi_ids = list(run_args_list[0].pi_ids)
+        pi_objects = {(run_args.prob_id, run_args.algo_id): run_args.pi_objects for run_args in run_args_list}
+        
+        units = data.groupby([PROB_KEY, ALGO_KEY, SEEDS_KEY], sort=False, observed=True).indices
+        missing = [key for key in units if key not in self.snapshots or key[:2] not in pi_objects]
+        if missing:
+            raise ValueError(f"The units {missing[:5]} have no front snapshots or are not in the RunArgs, "
+                             "the indicators can only be added to runs with deferred performance indicators")
+        needs_pop = any(name in getPIInputs(pi_object) for pi_object in run_args_list[0].pi_objects for name in ('pop', 'pop_feas'))
+        if needs_pop and not all(self.snapshots[key].with_pops for key in units):
+            raise ValueError(f"Some of the performance indicators {pi_ids} need the population, which is only in the front "
+                             "snapshots of the runs with an indicator that needed it")
+        
+        self.emitProgress(f"Computing the performance indicators {pi_ids} of {len(units)} runs", 0)
+        values = computeUnitsIndicators([self.snapshots[key] for key in units], [pi_objects[key[:2]] for key in units],
+                                        pi_ids, self.n_workers)
+        columns = {pi_id: np.full(len(data), np.nan) for pi_id in pi_ids}
+        for rows, unit_values in zip(units.values(), values):
+            for pi_id in pi_ids:
+                columns[pi_id][rows] = unit_values[pi_id]
+        
+        self.data = data.assign(**columns)
+        self.run_options = {**self.run_options, PI_KEY: [pi_id for pi_id in self.run_options[PI_KEY] if pi_id not in pi_ids] + pi_ids}
+        self.emitProgress(f"Computed the performance indicators {pi_ids} of {len(units)} runs", 100)
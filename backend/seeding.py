@@ -0,0 +1,49 @@
+"""
+    Seeding of the (problem, algorithm, seed) units of a run.
+
+    pymoo seeds the global numpy random state with the seed given to minimize, which the pymoo operators use.
+    The operators and problems of this project use instead the random_state of the unit, a numpy Generator that
+    only depends on the seed and on the problem and algorithm entries of the parameters (not on their ids nor on
+    their position in the run options): the seed is the entropy of a SeedSequence and the hash of the entries is its
+    spawn key. So each unit has its own independent stream, the same in any process, thread or order it is run in,
+    and the same unit always gets the same stream, as the ResultCache expects.
+"""
+import numpy as np
+
+from backend.cache import stableHash, getAlgorithmEntry
+from utils.defines import PROB_KEY, MAX_RANDOM_SEED
+
+def getRunSeeds(n_seeds: int, fixed_seeds: bool) -> np.ndarray:
+    """Get the seeds of a run: 0, 1, ..., n_seeds-1 if fixed_seeds, else n_seeds different random seeds"""
+
+    if fixed_seeds:
+        return np.arange(n_seeds)
+    # a new generator, since the global random state is reset by pymoo to the seed of the last unit that was run
+    return np.random.default_rng().choice(MAX_RANDOM_SEED, size=n_seeds, replace=False)
+
+def getSeedKey(parameters: dict, prob_id: str, algo_id: str) -> int:
+    """Get the spawn key of the random state of the (problem, algorithm) units, from the hash of their entries"""
+
+    entries = {PROB_KEY: parameters[PROB_KEY][prob_id], 'algo': getAlgorithmEntry(parameters, algo_id)}
+    return int(stableHash(entries)[:16], 16)
+
+def getUnitRandomState(seed: int, seed_key: int) -> np.random.Generator:
+    """Get the random state of the unit with the given seed and spawn key (see getSeedKey)"""
+
+    return np.random.default_rng(np.random.SeedSequence(int(seed), spawn_key=(seed_key,)))
+
+def getRetrySeed(seed: int, attempt: int) -> int:
+    """Get the seed a failed unit is run with again in the given attempt (1, 2, ...), the same in any run"""
+
+    return int(np.random.SeedSequence(int(seed), spawn_key=(attempt,)).generate_state(1)[0] % MAX_RANDOM_SEED)
+
+def getRandomState(algorithm=None) -> np.random.Generator:
+    """Get the random state an operator should use, given the algorithm that pymoo passes to it: the random_state of
+    the unit if it is run by the app, else (e.g. calling minimize directly) a generator seeded from the global random
+    state, so the results still only depend on the seed given to minimize"""
+
+    random_state = getattr(algorithm, 'random_state', None)
+    if random_state is None:
+        random_state = np.random.default_rng(np.random.randint(MAX_RANDOM_SEED))
+
+    return random_state
@@ -0,0 +1,249 @@
+"""
+    Local execution server, to run the runs of the app in a separate process, so the app does not freeze during the
+    runs and the runs are not stopped when the app is closed.
+
+    The app sends the run options and parameters of a run (a job) through a local socket, the server runs it with a
+    Runner, writing the results to a RunLog, and the app asks for the progress of the job until it finishes, loading
+    the results from the RunLog. The app can detach from a job (stop following it) and attach to it again, also
+    after being restarted, since the server keeps the jobs until the app erases them.
+
+    It is started by the app when USE_EXECUTION_SERVER is True, or by hand with:
+        python -m backend.server
+
+    The requests are pickles, so only the processes of the user can connect: the connections are authenticated with a
+    random key of the user (see getAuthKey), in a file only the user can read.
+"""
+import os
+import sys
+import time
+import secrets
+import itertools
+import threading
+import subprocess
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+
+from backend.runner import Runner
+from utils.defines import SERVER_ADDRESS, SERVER_AUTHKEY_FILE
+
+AUTHKEY_BYTES = 32
+
+def getAuthKey(path: str = SERVER_AUTHKEY_FILE) -> bytes:
+    """Get the key of the user in the file, generated at random the first time, in a file only the user can read and
+    write. Raises a PermissionError if the file can be read by other users"""
+
+    path = os.path.expanduser(path)
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    try:
+        # only created if it does not exist, so the server and the app never write different keys
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600) #@IgnoreException
+    except FileExistsError:
+        pass
+    else:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(secrets.token_bytes(AUTHKEY_BYTES))
+
+    if os.name == 'posix' and os.stat(path).st_mode & 0o077:
+        raise PermissionError(f"The key of the execution server '{path}' can be read by other users, it must only be "
+                              "readable by its owner (chmod 600)")
+    with open(path, 'rb') as file:
+        key = file.read()
+    if len(key) < AUTHKEY_BYTES:
+        raise ValueError(f"The key of the execution server '{path}' is not valid, delete it so a new one is generated")
+
+    return key
+
+class ServerRunner(Runner):
+    """Runner that keeps its last progress, so it can be sent to the app when asked"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.progress = ("Waiting to start", 0)
+        self.error = None
+
+    def emitProgress(self, text: str, percentage: float):
+        if percentage == -1:
+            self.error = text
+        else:
+            self.progress = (text, percentage)
+
+class Job():
+    def __init__(self, job_id: int, name: str, runner: ServerRunner):
+        self.job_id = job_id
+        self.name = name
+        self.runner = runner
+        self.thread = threading.Thread(target=runner.run, daemon=True)
+
+    def getStatus(self) -> dict:
+        return {'job_id': self.job_id,
+                'name': self.name,
+                'moo': self.runner.moo,
+                'progress': self.runner.progress,
+                'finished': not self.thread.is_alive(),
+                'canceled': self.runner.canceled,
+                'error': self.runner.error,
+                'run_log': self.runner.run_log.folder}
+
+class ExecutionServer():
+    """
+        Server that receives the requests of the app through a multiprocessing Listener. Each request is a tuple
+        (command, *args) and gets one response:
+
+        - ('submit', job: dict) -> job_id: Runs the job, a dict with the 'name', 'run_options', 'parameters',
+        'fixed_seeds', 'n_workers', 'use_cache', 'recording' policy, 'defer_pis' and 'profile' of the run, and optionally the
+        'resume' RunLog folder.
+        - ('status', job_id) -> dict: The progress of the job, if it finished, was canceled or had an error, and its RunLog folder.
+        Finished jobs are kept in the server until the app forgets them.
+        - ('jobs',) -> list: The status, run options, parameters, seeds, recording policy, defer_pis and profile of all the jobs, so
+        the app can attach to them again.
+        - ('cancel', job_id): Cancels the job.
+        - ('forget', job_id): Removes the job from the server (its RunLog is kept).
+        - ('shutdown',): Cancels all the jobs and stops the server.
+
+        If a request fails, the response is an Exception with the error.
+    """
+    COMMANDS = ('submit', 'status', 'jobs', 'cancel', 'forget', 'shutdown')
+
+    def __init__(self, address=SERVER_ADDRESS, authkey: bytes = None):
+        self.address = address
+        self.authkey = authkey if authkey is not None else getAuthKey()
+        self.job_dict = {}
+        self.job_ids = itertools.count()
+        self.listener = None
+        self.stopped = False
+
+    def serve(self):
+
+        self.listener = Listener(self.address, authkey=self.authkey)
+        while not self.stopped:
+            try:
+                connection = self.listener.accept() #@IgnoreException
+            except (OSError, AuthenticationError):
+                # the listener was closed by a shutdown request, or a client failed to authenticate
+                continue
+            threading.Thread(target=self.handle, args=(connection,), daemon=True).start()
+
+    def handle(self, connection):
+
+        with connection:
+            try:
+                command, *args = connection.recv() #@IgnoreException
+                if command not in self.COMMANDS:
+                    raise ValueError(f"Unknown command '{command}'")
+                response = getattr(self, command)(*args) #@IgnoreException
+            except Exception as e:
+                response = e
+            try:
+                connection.send(response) #@IgnoreException
+            except OSError:
+                pass
+
+    # requests
+
+    def submit(self, job: dict) -> int:
+        # imported here so a server is quick to start and answer the first requests
+        from backend.build import getRunner
+        from backend.results import RunLog, getRunLogFolder
+
+        parameters, run_options = job['parameters'], job['run_options']
+        run_log = RunLog(job['resume']) if job.get('resume') is not None else RunLog(getRunLogFolder(parameters['moo']))
+        runner = getRunner(run_options, parameters, ServerRunner, job['fixed_seeds'], job['n_workers'], run_log, job['use_cache'],
+                           recording=job['recording'], defer_pis=job['defer_pis'], profile=job['profile'])
+        if job.get('resume') is not None:
+            runner.loadRunLog(run_log, resume=True)
+
+        job_id = next(self.job_ids)
+        self.job_dict[job_id] = Job(job_id, job['name'], runner)
+        self.job_dict[job_id].thread.start()
+
+        return job_id
+
+    def status(self, job_id: int) -> dict:
+
+        # finished jobs are kept until forgotten, so the app can attach again if it stopped before loading the results
+        return self.job_dict[job_id].getStatus()
+
+    def jobs(self) -> list:
+        # a copy of the jobs, since the other requests can remove them
+        return [{**job.getStatus(),
+                 'run_options': job.runner.run_options,
+                 'parameters': job.runner.parameters,
+                 'fixed_seeds': job.runner.fixed_seeds,
+                 'recording': job.runner.run_args_list[0].recording,
+                 'defer_pis': job.runner.run_args_list[0].defer_pis,
+                 'profile': job.runner.run_args_list[0].profile} for job in list(self.job_dict.values())]
+
+    def cancel(self, job_id: int):
+        self.job_dict[job_id].runner.cancel()
+
+    def forget(self, job_id: int):
+        job = self.job_dict.pop(job_id, None)
+        if job is not None:
+            job.runner.cancel()
+
+    def shutdown(self):
+        for job in list(self.job_dict.values()):
+            job.runner.cancel()
+        self.stopped = True
+        self.listener.close()
+
+class ServerClient():
+    """
+        Client used by the app to send requests to the ExecutionServer (see its docstring for the requests).
+
+        Important Methods
+        -----------------
+        - request(command, *args): Sends the request and returns the response, raising the exception if it failed.
+        - isRunning() -> bool: Whether the server is answering requests.
+        - startServer(): Starts the server in a new process, independent of the app, if it is not running.
+        - isOtherServer() -> bool: Whether a process without the key of the user is listening on the address.
+    """
+    def __init__(self, address=SERVER_ADDRESS, authkey: bytes = None):
+        self.address = address
+        self.authkey = authkey if authkey is not None else getAuthKey()
+
+    def request(self, command: str, *args):
+
+        with Client(self.address, authkey=self.authkey) as connection:
+            connection.send((command, *args))
+            response = connection.recv()
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+    def isRunning(self) -> bool:
+        try:
+            self.request('jobs') #@IgnoreException
+        except (OSError, EOFError, AuthenticationError):
+            # a server with another key (e.g. of another user) is not running for this app
+            return False
+        return True
+
+    def startServer(self, timeout: float = 10):
+
+        if self.isRunning():
+            return
+        if self.isOtherServer():
+            raise ConnectionError(f"Another process is listening on the address of the execution server {self.address} "
+                                  "with a different key")
+        # new session, so the server is not closed with the app
+        subprocess.Popen([sys.executable, '-m', 'backend.server'], cwd=os.getcwd(), start_new_session=True,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        start = time.time()
+        while not self.isRunning():
+            if time.time() - start > timeout:
+                raise TimeoutError(f"The execution server did not start in {timeout} seconds")
+            time.sleep(0.1)
+
+    def isOtherServer(self) -> bool:
+        """Whether a process that does not have the key of the user is listening on the address"""
+        try:
+            self.request('jobs') #@IgnoreException
+        except AuthenticationError:
+            return True
+        except (OSError, EOFError):
+            pass
+        return False
+
+if __name__ == '__main__':
+    ExecutionServer().serve()
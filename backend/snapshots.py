@@ -0,0 +1,125 @@
+"""
+    Front snapshots of the recorded generations of a unit, to compute the performance indicators after the optimization
+    instead of in the callback (see DEFER_PI_COMPUTATION in utils/defines.py).
+
+    The callback only copies the objective values of the optimum of each recorded generation (and of the population,
+    if an indicator needs it, see PI_INPUTS in utils/defines.py), so the
+    optimization is not slowed down by expensive indicators (e.g. the hypervolume with many objectives), and the
+    indicators are computed afterwards from the snapshots in one batch, in the worker process of the unit.
+    The snapshots are kept in the RunLog, so indicators can be added to a finished run without running it again
+    (see Runner.addIndicators and the --add-indicators option of backend/cli.py).
+"""
+import io
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+import numpy as np
+
+from backend.indicators import getPIInputs, callPIBatch
+
+class FrontSnapshots():
+    """
+        Compact store of the objective values (F) of the optimum of the recorded generations of a unit, as float32, and
+        of their population only if with_pops (an indicator of the unit needs it). The indicators computed from the
+        snapshots are the same during the run and when they are added later, and the indicators that need the population
+        can only be computed from snapshots with it.
+
+        Attributes
+        ----------
+        - n_obj: Number of objectives.
+        - with_pops: Whether the population of each snapshot is stored.
+        - n_evals: Number of evaluations of each snapshot.
+        - opts, pops: F of the optimum and the population (empty list if not with_pops) of each snapshot, float32 arrays
+        of shape (n, n_obj).
+
+        Important Methods
+        -----------------
+        - append(n_eval, opt, pop): Adds the snapshot of a generation, the pop is ignored if not with_pops.
+        - thin(step): Keeps the first snapshot and every step-th one after it (see RECORD_N_POINTS in MyCallback).
+        - computeIndicators(pi_ids, pi_objects) -> dict: The values of the indicators for each snapshot.
+        - toBytes() -> bytes, fromBytes(raw): Compressed serialization, used by the RunLog.
+    """
+    def __init__(self, n_obj: int, with_pops: bool = False):
+        self.n_obj = n_obj
+        self.with_pops = with_pops
+        self.n_evals = []
+        self.opts = []
+        self.pops = []
+
+    def __len__(self):
+        return len(self.n_evals)
+
+    def append(self, n_eval: int, opt, pop=None):
+        self.n_evals.append(int(n_eval))
+        self.opts.append(self.toFloat32(opt))
+        if self.with_pops:
+            self.pops.append(self.toFloat32(pop))
+
+    def toFloat32(self, F) -> np.ndarray:
+        F = np.asarray(F, dtype=np.float32)
+        return F.reshape(len(F), self.n_obj) if F.ndim != 2 else F.copy()
+
+    def thin(self, step: int):
+        self.n_evals, self.opts, self.pops = self.n_evals[::step], self.opts[::step], self.pops[::step]
+
+    def computeIndicators(self, pi_ids: list, pi_objects: list) -> dict:
+        """Compute the indicators of each snapshot, the same way MyCallback.record computes them during the run,
+        all the snapshots at once for the indicators with a batch method (see backend/indicators.py)"""
+
+        pi_inputs = [getPIInputs(pi_object) for pi_object in pi_objects]
+        needs_pop = [pi_id for pi_id, inputs in zip(pi_ids, pi_inputs) if 'pop' in inputs or 'pop_feas' in inputs]
+        if needs_pop and not self.with_pops:
+            raise ValueError(f"The performance indicators {needs_pop} need the population, which is not in the front "
+                             "snapshots since no indicator of the run needed it")
+
+        opts = [opt.astype(float) for opt in self.opts]
+        opt_feas_list = [np.nan if len(opt) == 0 else opt for opt in opts]
+        values_list = []
+        for i, (n_eval, opt) in enumerate(zip(self.n_evals, opts)):
+            values = {'opt': opt, 'n_eval': n_eval}
+            if self.with_pops:
+                pop = self.pops[i].astype(float)
+                values.update({'pop': pop, 'pop_feas': np.nan if len(pop) == 0 else pop})
+            values_list.append(values)
+
+        return {pi_id: callPIBatch(pi_object, inputs, opt_feas_list, values_list)
+                for pi_id, pi_object, inputs in zip(pi_ids, pi_objects, pi_inputs)}
+
+    def toBytes(self) -> bytes:
+
+        buffer = io.BytesIO()
+        arrays = {'n_obj': self.n_obj, 'n_evals': np.array(self.n_evals, dtype=np.int64),
+                  'opt_sizes': np.array([len(opt) for opt in self.opts], dtype=np.int64),
+                  'opts': np.concatenate(self.opts) if len(self) > 0 else np.empty((0, self.n_obj), np.float32)}
+        if self.with_pops:
+            arrays.update({'pop_sizes': np.array([len(pop) for pop in self.pops], dtype=np.int64),
+                           'pops': np.concatenate(self.pops) if len(self) > 0 else np.empty((0, self.n_obj), np.float32)})
+        np.savez_compressed(buffer, **arrays)
+        return buffer.getvalue()
+
+    @classmethod
+    def fromBytes(cls, raw: bytes):
+
+        with np.load(io.BytesIO(raw)) as arrays:
+            # the snapshots stored before the population was optional always have it
+            snapshots = cls(int(arrays['n_obj']), with_pops='pops' in arrays.files)
+            snapshots.n_evals = arrays['n_evals'].tolist()
+            snapshots.opts = np.split(arrays['opts'], np.cumsum(arrays['opt_sizes'])[:-1]) if len(snapshots) > 0 else []
+            if snapshots.with_pops and len(snapshots) > 0:
+                snapshots.pops = np.split(arrays['pops'], np.cumsum(arrays['pop_sizes'])[:-1])
+
+        return snapshots
+
+def computeUnitsIndicators(snapshots_list: list, pi_objects_list: list, pi_ids: list, n_workers: int = 1) -> list:
+    """Compute the indicators of the snapshots of several units, each one with its own indicator objects (they depend
+    on the problem, e.g. its pareto front). If n_workers > 1, the units are sent to a pool of n_workers processes"""
+
+    if n_workers <= 1 or len(snapshots_list) <= 1:
+        return [snapshots.computeIndicators(pi_ids, pi_objects) for snapshots, pi_objects in zip(snapshots_list, pi_objects_list)]
+
+    # spawn instead of fork, as in Runner.runParallel
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(n_workers, len(snapshots_list)), mp_context=context) as executor:
+        futures = [executor.submit(FrontSnapshots.computeIndicators, snapshots, pi_ids, pi_objects)
+                   for snapshots, pi_objects in zip(snapshots_list, pi_objects_list)]
+        return [future.result() for future in futures]
@@ -1,8 +1,9 @@
+import copy
+
 from PyQt5.QtWidgets import QTableWidgetItem, QTableWidget, QFrame, QTabBar, QWidget, QPushButton
 from PyQt5.uic import loadUi
 from PyQt5.QtCore import pyqtSignal
 
-from simpleeval import simple_eval
 from numpy import inf
 
 from frontend.small_widgets import MyLineEdit, MyComboBox, ScientificDoubleSpinBox, ScientificSpinBox, MyCheckBox, MyWidgetsFrame, MyEmptyLineEdit
@@ -40,6 +41,9 @@ class EditWindow(QWidget):
             Converts a dictionary of parameters into tabs in the window.
         loadParameters():
             Loads parameters from a file and converts them into tabs in the window.
+            
+        The tabs are built the first time they are used (see EditTabs), since filling their tables is most of the time
+        the app takes to start.
     """    
     runOptionsUpdates = pyqtSignal(str,list) 
     operatorUpdates = pyqtSignal(str,list)
@@ -92,16 +96,15 @@ class EditWindow(QWidget):
         while self.tabWidget.count() > 1:
             self.tabWidget.removeTab(1)
             
-        self.tabs = {tab_key: EditTab(self, tab_key, tab_args, parameters) for tab_key, tab_args in {**OPERATORS_ARGS_DICT, **PLOT_TYPES_ARG_DICT}.items()}            
-        self.tabs.update({tab_key: EditTab(self, tab_key, tab_args, parameters) for tab_key, tab_args in RUN_OPTIONS_ARGS_DICT.items()})
+        self.tabs = EditTabs(self, parameters)
 
     def tabsToDict(self) -> dict:
         """Go through all the tabs and get the parameters as a dictionary, where the key is the tab name
         and the value is a dictionary with the parameters. dont forget to get the operators"""
         
         parameters = {}
-        for _, tab in self.tabs.items():
-            parameters[tab.key] = tab.tableToDict()
+        for tab_key in EditTabs.TAB_KEYS:
+            parameters[tab_key] = self.tabs[tab_key].tableToDict()
         
         parameters[MOO_KEY] = self.moo
         return parameters
@@ -142,6 +145,33 @@ class EditWindow(QWidget):
 
         if parameters is not None:
             self.dictToTabs(parameters)
+
+class EditTabs(dict):
+    """
+        Dict of the EditTabs of an EditWindow (key -> EditTab), where each tab is built the first time it is used.
+        The parameters are copied, so the tabs built later do not see the changes made to them in the meantime.
+
+        Important Methods
+        -----------------
+        - getIDs(tab_key) -> list: The IDs of the rows of the tab, without building it if it was not built yet.
+    """
+    TAB_KEYS = list({**OPERATORS_ARGS_DICT, **PLOT_TYPES_ARG_DICT, **RUN_OPTIONS_ARGS_DICT}.keys())
+    
+    def __init__(self, edit_window: EditWindow, parameters: dict):
+        super().__init__()
+        self.edit_window = edit_window
+        self.parameters = copy.deepcopy(parameters)
+        
+    def __missing__(self, tab_key: str):
+        if tab_key not in PARAMETERS_ARGS_DICT:
+            raise KeyError(tab_key)
+        tab = self[tab_key] = EditTab(self.edit_window, tab_key, PARAMETERS_ARGS_DICT[tab_key], self.parameters)
+        return tab
+    
+    def getIDs(self, tab_key: str) -> list:
+        if tab_key in self:
+            return self[tab_key].getIDs()
+        return list(self.parameters[tab_key].keys())
                                 
 class EditTab(QFrame):
     """
@@ -336,7 +366,8 @@ class EditTab(QFrame):
                 widget.setValue(value)
         # COMBO BOX
         elif self.key == ALGO_KEY and arg in OPERATORS:
-            items = self.edit_window.tabs[arg].initial_table_dict.keys()
+            # the current IDs, since the variants added before this tab was built did not update it
+            items = self.edit_window.tabs.getIDs(arg)
             widget = MyComboBox(items, value, table=self.table, tab=self, key=arg, copy_style="comboBox", widgets_frame=widgets_frame)
         # NONE
         elif value is None:
@@ -375,6 +406,10 @@ class EditTab(QFrame):
             
         return table_dict
 
+    def getIDs(self) -> list:
+        return [self.table.cellWidget(row, ID_COL).text() for row in range(self.table.rowCount()) 
+                if self.table.cellWidget(row, ID_COL) is not None]
+
     def getObjectFromID(self, object_id, convert_dict = None):
         # get the object from a table
         for row in range(self.table.rowCount()):
@@ -459,14 +494,11 @@ class EditTab(QFrame):
         return args_dict    
     
     def convertString(self, arg, string: str, convert_dict: dict):
+        # imported here so the runs (with pandas and pymoo) are not imported when the app starts
+        from backend.build import convertString
     
-        for key, value in convert_dict.items():
-            if string == key:
-                return value
-            elif key in string:
-                string = string.replace(key, str(value))
         try:
-            result = simple_eval(string) #@IgnoreException
+            result = convertString(string, convert_dict) #@IgnoreException
         except: 
             MyMessageBox(f"Invalid expression \'{string}\'in argument \'{arg}\', please use a valid mathematical expression or convertible string from convertible options: {CONVERTIBLES}")
             result = None
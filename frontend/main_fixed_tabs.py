@@ -1,18 +1,23 @@
 import inspect
+import os
+import copy
 
 from PyQt5.uic import loadUi
 from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QTabWidget, QTableWidget, QTabBar, QWidget, QSpinBox, QHBoxLayout, QMessageBox, QFrame
+from PyQt5.QtWidgets import QTabWidget, QTableWidget, QTabBar, QWidget, QSpinBox, QHBoxLayout, QMessageBox, QFrame, QPushButton
 
-from backend.run import RunThread, RunArgs
+# the runs and the Run Tab (with pandas and pymoo) are imported in the methods that use them, so the app starts faster
+from backend.cache import ResultCache, getConfigHash, getParetoFront
+from backend.seeding import getSeedKey
 
 from frontend.small_widgets import MyComboBox
 from frontend.edit_window import EditWindow
-from frontend.main_run_tab import RunTab
 from utils.utils import myFileManager, showAndRaise, getAvailableName, MyMessageBox
 from utils.defines import (DESIGNER_HISTORY_FRAME,RUN_OPTIONS_KEYS, DEFAULT_ROW_NUMBERS, DESIGNER_FIXED_TABS,
                            HISTORY_LAYOUT_WIDGETS, MAX_HISTORY_FRAMES, ALGO_KEY, PROB_KEY, PI_KEY, TERM_KEY, 
-                           SEEDS_KEY, MOO_KEY, PARAMETERS_ARGS_DICT)
+                           SEEDS_KEY, MOO_KEY, PARAMETERS_ARGS_DICT, PLOT_TYPES_KEY, N_WORKERS, SAVE_RUN_LOGS,
+                           USE_RESULT_CACHE, RESULT_CACHE_FOLDER, RESULT_CACHE_MAX_SIZE, USE_EXECUTION_SERVER, RECORDING_POLICY, 
+                           DEFER_PI_COMPUTATION, PROFILE_PHASES)
 
 class MainTabsWidget(QTabWidget):
     """
@@ -50,6 +55,7 @@ class MainTabsWidget(QTabWidget):
         - openAllTabs: Opens all tabs for the runs.
         - eraseAllRuns: Erases all runs.
         - loadRun: Loads a run from a file.
+        - attachServerRuns: Adds a progress frame for each run left in the execution server, e.g. after restarting the app.
         
         Attributes
         ----------------
@@ -58,6 +64,7 @@ class MainTabsWidget(QTabWidget):
             seedsSpinBox: A QSpinBox widget for setting the number of seeds.
             fixed_seeds: A boolean indicating whether the seeds are fixed.
             edit_window: An instance of the EditWindow class.
+            server_client: The ServerClient of the execution server, None if the runs are done in the app.
     """
     def __init__(self, run_options: dict, parameters: dict, moo: bool) -> None:
         super().__init__()
@@ -66,6 +73,12 @@ class MainTabsWidget(QTabWidget):
         
         self.moo = moo
         self.run_counter = 0
+        self.result_cache = ResultCache(RESULT_CACHE_FOLDER, RESULT_CACHE_MAX_SIZE) if USE_RESULT_CACHE else None
+        self.save_run_logs = SAVE_RUN_LOGS
+        self.server_client = None
+        if USE_EXECUTION_SERVER:
+            from backend.server import ServerClient
+            self.server_client = ServerClient()
         self.tables_dict = {PROB_KEY: self.prob_table, ALGO_KEY: self.algo_table, PI_KEY: self.pi_table, TERM_KEY: self.term_table}     
         
         self.seedsSpinBox = self.setUI()
@@ -79,6 +92,7 @@ class MainTabsWidget(QTabWidget):
         for key in missing_keys:
             run_options[key] = [] if key != SEEDS_KEY else 1
         self.dictToTables(run_options, parameters)
+        self.attachServerRuns()
         
     def setUI(self):
         
@@ -240,6 +254,8 @@ class MainTabsWidget(QTabWidget):
         return ids
     
     def getRunThread(self):
+        from backend.run import RunThread, RemoteRunThread, RunArgs
+        from backend.results import RunLog, getRunLogFolder
         
         tabs = self.edit_window.tabs
         
@@ -253,6 +269,8 @@ class MainTabsWidget(QTabWidget):
             return None
         else:
             term_id = term_id[0]
+        
+        parameters = self.edit_window.tabsToDict()
                     
         # PROBLEMS
         for prob_id in prob_ids:
@@ -264,6 +282,8 @@ class MainTabsWidget(QTabWidget):
             n_var = prob_object.n_var if hasattr(prob_object,'n_var') else None
             n_obj = prob_object.n_obj if hasattr(prob_object,'n_obj') else None
             convert_dict.update({'n_obj':n_obj,'n_var':n_var,'prob_id':prob_id, 'prob_object':prob_object})
+            # the reference pareto front of the problem, the same for all its algorithms (see getParetoFront)
+            pf = getParetoFront(prob_object)
 
             # ALGOS 
             for algo_id in algo_ids:            
@@ -271,11 +291,6 @@ class MainTabsWidget(QTabWidget):
                 if isinstance(algo_object, Exception):
                     return None                
 
-                # try to get the pareto front from the problem through algorithm ref_dirs if it exists 
-                try:
-                    pf = prob_object.pareto_front(ref_dirs=algo_object.ref_dirs) #@IgnoreException
-                except:
-                    pf = prob_object.pareto_front() if prob_object.pareto_front else None
                 convert_dict.update({'prob_pf':pf,'algo_id':algo_id,'algo_object':algo_object,'get_problem_pf':pf}) #! update old dicts
                 
                 # TERMINATIONS
@@ -292,14 +307,23 @@ class MainTabsWidget(QTabWidget):
                     if isinstance(pi_object, Exception):
                         return None
                     
-                run_args.append(RunArgs(prob_id, prob_object, algo_id, algo_object, pi_ids, pi_objects, term_object))
+                config_hash = (getConfigHash(parameters, prob_id, algo_id, term_id, pi_ids, RECORDING_POLICY, DEFER_PI_COMPUTATION,
+                                             PROFILE_PHASES) if self.result_cache is not None else None)
+                seed_key = getSeedKey(parameters, prob_id, algo_id)
+                run_args.append(RunArgs(prob_id, prob_object, algo_id, algo_object, pi_ids, pi_objects, term_object, config_hash, 
+                                        seed_key, RECORDING_POLICY, DEFER_PI_COMPUTATION, PROFILE_PHASES))
                 
         if run_args != []:
             # get the rest of the parameters
             n_seeds = self.seedsSpinBox.value()
-            parameters = self.edit_window.tabsToDict()
             run_options = self.tablesToDict()
-            return RunThread(run_args, term_id, n_seeds, self.moo, parameters, run_options, self.fixed_seeds)
+            if self.server_client is not None:
+                # the execution server writes the RunLog of the run
+                return RemoteRunThread(run_args, term_id, n_seeds, self.moo, parameters, run_options, self.fixed_seeds, N_WORKERS, 
+                                       None, self.result_cache, client=self.server_client)
+            run_log = RunLog(getRunLogFolder(self.moo)) if self.save_run_logs else None
+            return RunThread(run_args, term_id, n_seeds, self.moo, parameters, run_options, self.fixed_seeds, N_WORKERS, run_log, 
+                             self.result_cache)
         else:
             return None
     
@@ -333,7 +357,8 @@ class MainTabsWidget(QTabWidget):
     
     ### HISTORY TAB METHODS ###
 
-    def setHistoryFrame(self, run_thread: RunThread, name:str=None):
+    def setHistoryFrame(self, run_thread: 'RunThread', name:str=None):
+        from backend.run import RemoteRunThread
         
         if self.history_layout.count() > MAX_HISTORY_FRAMES + HISTORY_LAYOUT_WIDGETS - 1:
             MyMessageBox("Please clear one of the Runs before adding another.")
@@ -346,6 +371,8 @@ class MainTabsWidget(QTabWidget):
             name = f"Run {self.run_counter}"
         curr_names = [self.history_layout.itemAt(i).widget().run_name for i in range(HISTORY_LAYOUT_WIDGETS-1, self.history_layout.count()-1)]
         name = getAvailableName(name, curr_names)
+        if isinstance(run_thread, RemoteRunThread) and run_thread.job_name is None:
+            run_thread.job_name = name
         progress_frame = HistoryFrame(self, run_thread, name)
         
         # add widget after the last widget in the layout but before the stretch
@@ -394,6 +421,9 @@ class MainTabsWidget(QTabWidget):
         showAndRaise(self)
         
     def loadRun(self):
+        import pandas as pd
+        from backend.results import RunLog, BestGenStore
+        
         keys = ['parameters', 'run_options', 'data', 'best_gen', 'run_counter']
         loaded_data, filename = myFileManager('Load Run', keys_to_check=keys, moo=self.moo)
 
@@ -401,6 +431,9 @@ class MainTabsWidget(QTabWidget):
             if not (isinstance(loaded_data['run_options'], dict) and isinstance(loaded_data['parameters'], dict)):
                 MyMessageBox("The Run dictionary is not in the correct format. Must have 'parameters' and 'run_options' keys.")
                 return
+            curr_parameters = self.edit_window.tabsToDict()
+            # runs from the command line runner without a parameters file have no plot types, use the current ones
+            loaded_data['parameters'].setdefault(PLOT_TYPES_KEY, copy.deepcopy(curr_parameters[PLOT_TYPES_KEY]))
             param_keys = list(PARAMETERS_ARGS_DICT.keys()) + [MOO_KEY]
             if set(loaded_data['parameters'].keys()) != set(param_keys):
                 MyMessageBox(f"The parameters must have the following keys: {param_keys}.")
@@ -408,7 +441,6 @@ class MainTabsWidget(QTabWidget):
             if set(loaded_data['run_options'].keys()) != set(RUN_OPTIONS_KEYS + [MOO_KEY]):
                 MyMessageBox(f"The run options must have the following keys: {RUN_OPTIONS_KEYS + [MOO_KEY]}.")
                 return
-            curr_parameters = self.edit_window.tabsToDict()
             curr_run_options = self.tablesToDict()
             self.edit_window.dictToTabs(loaded_data['parameters'])
             self.dictToTables(loaded_data['run_options'], loaded_data['parameters'])
@@ -416,10 +448,67 @@ class MainTabsWidget(QTabWidget):
             self.edit_window.dictToTabs(curr_parameters)
             self.dictToTables(curr_run_options, curr_parameters)
             if run_thread is not None:
-                run_thread.data, run_thread.best_gen, run_thread.run_counter = loaded_data['data'], loaded_data['best_gen'], loaded_data['run_counter']
+                if isinstance(loaded_data['data'], RunLog):
+                    # a run log header, memory-map the results from the RunLog files instead of loading them from the pickle
+                    run_log = loaded_data['data'].relativeTo(filename)
+                    if not os.path.exists(run_log.folder):
+                        MyMessageBox(f"The Run Log folder '{run_log.folder}' of the loaded Run does not exist.")
+                        return
+                    resume = not run_log.isComplete() and self.askResume(run_thread, run_log)
+                    run_thread.loadRunLog(run_log, resume)
+                else:
+                    resume = False
+                    run_thread.data, run_thread.best_gen, run_thread.run_counter = loaded_data['data'], loaded_data['best_gen'], loaded_data['run_counter']
+                    if isinstance(run_thread.best_gen, dict):
+                        # runs saved before the best_gen was a BestGenStore
+                        run_thread.best_gen = BestGenStore.fromDict(run_thread.best_gen)
+                    run_thread.errors = loaded_data.get('errors', [])
+                    # runs saved before the resources existed do not have them
+                    run_thread.resources = loaded_data.get('resources', pd.DataFrame())
+                    run_thread.unit_indexes = loaded_data.get('unit_indexes', {})
+                    # the front snapshots of the runs with deferred performance indicators
+                    run_thread.snapshots = loaded_data.get('snapshots', {})
+                    run_thread.run_log = None
                 progress_frame = self.setHistoryFrame(run_thread, filename)
-                if progress_frame is not None:
+                if progress_frame is not None and resume:
+                    self.setCurrentIndex(1)
+                    run_thread.start()
+                elif progress_frame is not None:
                     progress_frame.afterRun()
+    
+    def attachServerRuns(self):
+        """Add a progress frame for each run of this mode left in the execution server, and attach to it"""
+        
+        if self.server_client is None or not self.server_client.isRunning():
+            return
+        from backend.run import RemoteRunThread
+        from backend.build import getRunArgsList
+        
+        for job in self.server_client.request('jobs'):
+            if job['moo'] != self.moo:
+                continue
+            run_options, parameters = job['run_options'], job['parameters']
+            try:
+                run_args = getRunArgsList(run_options, parameters, recording=job['recording'], defer_pis=job['defer_pis'], #@IgnoreException
+                                          profile=job['profile'])
+            except Exception as e:
+                MyMessageBox(f"Could not attach to the Run '{job['name']}' of the execution server:\n{e}")
+                continue
+            run_thread = RemoteRunThread(run_args, run_options[TERM_KEY][0], run_options[SEEDS_KEY], self.moo, parameters, 
+                                         run_options, job['fixed_seeds'], N_WORKERS, None, self.result_cache, 
+                                         client=self.server_client, job_id=job['job_id'], job_name=job['name'])
+            progress_frame = self.setHistoryFrame(run_thread, job['name'])
+            if progress_frame is not None:
+                run_thread.start()
+    
+    def askResume(self, run_thread: 'RunThread', run_log: 'RunLog'):
+        """Ask if an interrupted Run should be resumed, running only the units missing from its RunLog"""
+        reply = QMessageBox.question(self, 'Resume Run',
+            f"The loaded Run was interrupted after {len(run_log)} of {run_thread.total_runs} runs. "
+            "Do you want to resume it? If not, only the finished runs are shown.",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+        
+        return reply == QMessageBox.Yes
                             
 class HistoryFrame(QFrame):
     """
@@ -436,6 +525,8 @@ class HistoryFrame(QFrame):
             The name of the run.
         run_tab : RunTab
             The tab that displays the results of the run.
+        detach_button : QPushButton
+            Button to detach from and attach to the run, only for runs in the execution server (RemoteRunThread).
 
         Methods:
         --------
@@ -455,8 +546,11 @@ class HistoryFrame(QFrame):
             Removes the HistoryFrame from the history layout and deletes it.
         cancelRun():
             Cancels the run thread and calls the erase method.
+        detachRun():
+            Stops following the run in the execution server without canceling it, or follows it again.
     """    
-    def __init__(self, tabWidget: MainTabsWidget, run_thread: RunThread, run_name: str):
+    def __init__(self, tabWidget: MainTabsWidget, run_thread: 'RunThread', run_name: str):
+        from backend.run import RemoteRunThread
         super().__init__()
         loadUi(DESIGNER_HISTORY_FRAME, self)
         
@@ -470,12 +564,26 @@ class HistoryFrame(QFrame):
         # UI        
         self.label.setText(run_name)
         self.cancel_button.clicked.connect(self.cancelRun)
+        self.detach_button = None
+        if isinstance(run_thread, RemoteRunThread):
+            self.detach_button = QPushButton("Detach")
+            self.horizontalLayout.insertWidget(self.horizontalLayout.indexOf(self.cancel_button), self.detach_button)
+            self.detach_button.clicked.connect(self.detachRun)
     
     def afterRun(self):
         """After the run is finished, add the tab to the run window and show it"""
-        if self.run_thread.canceled:
+        if self.run_thread.canceled or getattr(self.run_thread, 'detached', False):
+            return
+        if self.detach_button is not None:
+            self.detach_button.hide()
+        # show the partial results if some units failed
+        if self.run_thread.errors:
+            MyMessageBox(self.run_thread.getErrorsMessage())
+        if self.run_thread.data.empty:
+            self.erase()
             return
         
+        from frontend.main_run_tab import RunTab
         self.tab = RunTab(self.run_thread, self.run_name, self.tabWidget.edit_window)
         self.progressBar.setValue(100)
         self.progress_label.setText("")
@@ -503,6 +611,8 @@ class HistoryFrame(QFrame):
         if value == -1:
             MyMessageBox(label)
             self.erase()
+        elif getattr(self.run_thread, 'detached', False):
+            return
         else:
             self.progressBar.setValue(value)
             self.progress_label.setText(label)
@@ -540,10 +650,39 @@ class HistoryFrame(QFrame):
             if self.tabWidget.tabText(i) == self.run_name:
                 self.tabWidget.removeTab(i)
                 break
+        if self.detach_button is not None:
+            # only runs in the execution server have it
+            self.run_thread.forget()
+        if self.run_thread.run_log is not None and os.path.exists(self.run_thread.run_log.folder):
+            self.askDeleteRunLog()
         self.deleteLater()     
     
+    def askDeleteRunLog(self):
+        """Ask if the RunLog folder of the erased run should be deleted. A running run deletes it when it stops"""
+        run_log = self.run_thread.run_log
+        reply = QMessageBox.question(self, 'Delete Run Log',
+            f"Do you also want to delete the Run Log of the run in '{run_log.folder}'? "
+            "It is only needed to load or resume the run from it.",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+
+        if reply == QMessageBox.Yes:
+            if self.run_thread.isRunning():
+                self.run_thread.finished.connect(run_log.delete)
+            else:
+                run_log.delete()
+    
     def cancelRun(self):
         """Cancel the run"""
         self.run_thread.cancel()
         self.erase()
+    
+    def detachRun(self):
+        """Detach from the run in the execution server, that keeps running, or attach to it again"""
+        if self.run_thread.detached:
+            self.run_thread.attach()
+            self.detach_button.setText("Detach")
+        else:
+            self.run_thread.detach()
+            self.detach_button.setText("Attach")
+            self.progress_label.setText("Detached, the run continues in the execution server")
 
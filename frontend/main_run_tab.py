@@ -7,9 +7,11 @@ import numpy as np
 import pandas as pd
 
 from backend.run import RunThread
+from backend.results import getSavedRun
 from backend.get import get_plot_types
 from utils.defines import (DESIGNER_RUN_TAB, PROB_KEY, ALGO_KEY, SEEDS_KEY, N_GEN_KEY, N_EVAL_KEY, VOTING_KEY, PI_KEY,
-                           CLASS_KEY, TERM_KEY, MEDIAN_KEY, BEST_KEY, WORST_KEY, AVG_KEY, VALUE_KEY, PLOT_TYPES_KEY)
+                           CLASS_KEY, TERM_KEY, MEDIAN_KEY, BEST_KEY, WORST_KEY, AVG_KEY, VALUE_KEY, PLOT_TYPES_KEY, RESOURCE_KEYS,
+                           RESOURCE_HIGHER_IS_BETTER)
 from frontend.edit_window import EditWindow
 from utils.utils import myFileManager, setBold, MyMessageBox, setCombobox, numberPresentation, showAndRaise
 from frontend.small_widgets import MyComboBox
@@ -24,6 +26,8 @@ class RunTab(QFrame):
             run_thread (RunThread): The thread from which the algorithm will or has run.
             pi_ids (list): List of performance indicator ids.
             term_data (DataFrame): The final generation data, averaged across seeds.
+            resources_avg_df, resources_stats_df (DataFrame): The resources used by the runs (see Runner.resources), averaged
+            across seeds and their best, median and worst values, for the 'Resource' table.
             prob_ids (list): List of problem ids.
             algo_ids (list): List of algorithm ids.
             plot_widgets (list): List of plot widgets to prevent them from being garbage collected.
@@ -46,11 +50,13 @@ class RunTab(QFrame):
         self.pi_ids = run_thread.run_args_list[0].pi_ids
         self.edit_window = edit_window
 
-        # get the final generation for each seed
-        self.term_df = self.run_thread.data.groupby([PROB_KEY, ALGO_KEY, SEEDS_KEY]).last().reset_index()
+        # get the final generation for each seed (problem and algorithm ids can be categorical in the run data)
+        self.term_df = self.run_thread.data.groupby([PROB_KEY, ALGO_KEY, SEEDS_KEY], observed=True).last().reset_index()
+        self.term_df = self.term_df.astype({PROB_KEY: object, ALGO_KEY: object})
         
         # get the statistics (min, max, median, average) of the data
         self.stats_seeds_df, self.avg_df, self.colapsed_stats_df = self.getStatisticsDFs() 
+        self.resources_avg_df, self.resources_stats_df = self.getResourcesDFs()
            
         # get column by name
         self.prob_ids = list(self.term_df[PROB_KEY].unique())
@@ -63,8 +69,8 @@ class RunTab(QFrame):
     
     def getStatisticsDFs(self):
         
-        # drop unnecessary columns
-        df = self.term_df.drop(columns=[N_GEN_KEY, N_EVAL_KEY, SEEDS_KEY])
+        # only the performance indicators (the data can also have the times of the phases, see backend/profiling.py)
+        df = self.term_df[[PROB_KEY, ALGO_KEY] + list(self.pi_ids)]
         # get the average, median, min and max of the data    
         df = df.groupby([PROB_KEY, ALGO_KEY]).agg(["min", "max", "median", "mean"]).reset_index()
         cols = tuple([(PROB_KEY, ''), (ALGO_KEY, '')] + [(pi_id,lvl2) for pi_id in self.pi_ids for lvl2 in [BEST_KEY, WORST_KEY, MEDIAN_KEY, AVG_KEY]])
@@ -108,6 +114,30 @@ class RunTab(QFrame):
 
         return stats_seeds_df, avg_df, colapsed_stats_df
     
+    def getResourcesDFs(self):
+        """Get the average across seeds of the resources used by the runs, and their best, median and worst values in 
+        the format of the collapsed statistics. Empty if the run has no resources (e.g. it was saved before they existed)"""
+        
+        resources = self.run_thread.resources
+        if resources.empty:
+            return pd.DataFrame(), pd.DataFrame()
+        resources = resources.astype({PROB_KEY: object, ALGO_KEY: object})
+        groups = resources.groupby([PROB_KEY, ALGO_KEY], sort=False)[RESOURCE_KEYS]
+        avg_df = groups.mean().reset_index()
+        
+        # the best is the lowest value, except for the resources in RESOURCE_HIGHER_IS_BETTER
+        lst = []
+        for (prob_id, algo_id), df in groups:
+            for lvl2 in [BEST_KEY, MEDIAN_KEY, WORST_KEY]:
+                values = []
+                for key in RESOURCE_KEYS:
+                    lowest = (lvl2 == BEST_KEY) != (key in RESOURCE_HIGHER_IS_BETTER)
+                    values.append(df[key].median() if lvl2 == MEDIAN_KEY else df[key].min() if lowest else df[key].max())
+                lst.append([prob_id, algo_id + lvl2] + values)
+        stats_df = pd.DataFrame(lst, columns=[PROB_KEY, ALGO_KEY] + RESOURCE_KEYS)
+        
+        return avg_df, stats_df
+    
     def findSeeds(self, pi_id, lvl2, data, term_data):
         
         seeds = np.zeros(len(data)).astype(float)
@@ -141,6 +171,8 @@ class RunTab(QFrame):
         self.table.horizontalHeader().sectionDoubleClicked.connect(lambda col: self.headerClick(col, "horizontal"))
         self.table.verticalHeader().sectionDoubleClicked.connect(lambda row: self.headerClick(row, "vertical"))
         self.table.itemDoubleClicked.connect(self.tableItemClick)
+        if not self.resources_avg_df.empty:
+            self.table_of.addItem("Resource")
         setCombobox(self.table_of, center_items=True, index_changed_function=self.tableOptionsChanged)
         setCombobox(self.selected_id, center_items=True, index_changed_function=self.changeTable)
         setCombobox(self.showing_values, center_items=True, index_changed_function=self.changeTable)
@@ -170,7 +202,11 @@ class RunTab(QFrame):
         # set the labels                         
         self.label.setText(label)
         seed_str = "seed" if self.run_thread.n_seeds == 1 else "different seeds"
-        self.n_seeds_label.setText(f"Run on <b>{self.run_thread.n_seeds}</b> {seed_str}")
+        n_failed = len(self.run_thread.getFailedUnits())
+        failed_str = f", <b>{n_failed}</b> failed" if n_failed > 0 else ""
+        time_summary = self.run_thread.getTimeSummary()
+        time_str = f"<br>Time: {time_summary}" if time_summary != "" else ""
+        self.n_seeds_label.setText(f"Run on <b>{self.run_thread.n_seeds}</b> {seed_str}{failed_str}{time_str}")
         self.n_seeds_label.setAlignment(Qt.AlignCenter)
         self.term_label.setText(f"Termination criteria: <b>{self.run_thread.term_id}</b></font>")
         self.term_label.setAlignment(Qt.AlignCenter)
@@ -211,8 +247,10 @@ class RunTab(QFrame):
             selected_items = sorted(self.pi_ids)
         elif self.table_of.currentText() == "Problem":
             selected_items = sorted(self.prob_ids)
+        elif self.table_of.currentText() == "Resource":
+            selected_items = list(RESOURCE_KEYS)
         else:
-            raise ValueError("Voting by can only be Performance Indicator or Problem")
+            raise ValueError("Voting by can only be Performance Indicator, Problem or Resource")
         
         self.selected_id.currentIndexChanged.disconnect(self.changeTable)
         self.selected_id.clear()
@@ -226,29 +264,33 @@ class RunTab(QFrame):
     
     def changeTable(self):
         
+        resources = self.table_of.currentText() == "Resource"
         if self.showing_values.currentText() == "Averaged across seeds":
-            df = self.avg_df.copy()
+            df = self.resources_avg_df.copy() if resources else self.avg_df.copy()
             avg = True
         else:
-            df = self.colapsed_stats_df.copy()
-            rows = [i*3 for i in range(len(self.algo_ids))]
+            df = self.resources_stats_df.copy() if resources else self.colapsed_stats_df.copy()
             avg = False
             
         selected_id = self.selected_id.currentText()
-        if self.table_of.currentText() == "Performance Indicator":
+        if self.table_of.currentText() in ["Performance Indicator", "Resource"]:
             df = df.pivot(index=ALGO_KEY, columns=PROB_KEY, values=selected_id)
         elif self.table_of.currentText() == "Problem":
             df = df[df[PROB_KEY] == selected_id]
             df.drop(columns=[PROB_KEY], inplace=True)
             df = df.set_index(df.columns[0])
         else:
-            raise ValueError("Voting by can only be Performance Indicator or Problem")
+            raise ValueError("Voting by can only be Performance Indicator, Problem or Resource")
+        # the best value of a column is the smallest, except for the resources that are better when higher
+        best = pd.Series.max if resources and selected_id in RESOURCE_HIGHER_IS_BETTER else pd.Series.min
                 
         # update the table widget
         df[VOTING_KEY] = [0 for _ in range(len(df))]
         
         n_cols = len(df.columns)
         n_rows = len(df.index)
+        # if some units failed, a problem may not have rows for all the algorithms
+        rows = [i*3 for i in range(n_rows//3)]
         self.table.setColumnCount(n_cols)
         self.table.setRowCount(n_rows)
         
@@ -272,9 +314,9 @@ class RunTab(QFrame):
             for j in range(n_cols-1):
                 nice_string = numberPresentation(df.iloc[i, j])
                 item = QTableWidgetItem(nice_string)
-                # set text to bold if it is the smallest value in the column
-                rows_to_check = [row + i % 3 for row in rows] if not avg else [ii for ii in range(len(self.algo_ids))]
-                if df.iloc[i, j] == df.iloc[rows_to_check, j].min():
+                # set text to bold if it is the best value in the column
+                rows_to_check = [row + i % 3 for row in rows] if not avg else [ii for ii in range(n_rows)]
+                if df.iloc[i, j] == best(df.iloc[rows_to_check, j]):
                     setBold(item)
                     df.loc[df.index[i], VOTING_KEY] += 1
                 item.setBackground(color)
@@ -288,7 +330,7 @@ class RunTab(QFrame):
             nice_string = str(int(df.iloc[i, -1]))
             item = QTableWidgetItem(nice_string)
             self.table.setItem(i, n_cols-1, item)
-            rows_to_check = [row + i % 3 for row in rows] if not avg else [ii for ii in range(len(self.algo_ids))]
+            rows_to_check = [row + i % 3 for row in rows] if not avg else [ii for ii in range(n_rows)]
             if df.iloc[i, -1] == df.iloc[rows_to_check, -1].max():
                 setBold(item)
             item.setBackground(color)
@@ -300,7 +342,7 @@ class RunTab(QFrame):
         
         if orientation == "horizontal":
             item = self.table.horizontalHeaderItem(x)
-            key = PROB_KEY if self.table_of.currentText() == "Performance Indicator" else PI_KEY
+            key = PROB_KEY if self.table_of.currentText() in ["Performance Indicator", "Resource"] else PI_KEY
         else:
             item = self.table.verticalHeaderItem(x)
             key = ALGO_KEY
@@ -332,7 +374,7 @@ class RunTab(QFrame):
         row_header = self.table.verticalHeaderItem(row).text()
         col_header = self.table.horizontalHeaderItem(col).text()
         
-        if col_header == VOTING_KEY:
+        if col_header == VOTING_KEY or self.table_of.currentText() == "Resource":
             return
         
         if row_header.endswith(BEST_KEY) or row_header.endswith(MEDIAN_KEY) or row_header.endswith(WORST_KEY):
@@ -399,15 +441,9 @@ class RunTab(QFrame):
     
     # buttons methods
     def saveRun(self):
-        """Save the run thread object"""
-        
-        data = {'parameters': self.run_thread.parameters,
-                'run_options': self.run_thread.run_options,
-                'best_gen': self.run_thread.best_gen,
-                'data': self.run_thread.data,
-                'run_counter': self.run_thread.run_counter,
-                'moo': self.run_thread.moo}
-
+        """Save the run thread object, with all the data (see getSavedRun), so the file does not depend on the RunLog of the run"""
+        
+        data = getSavedRun(self.run_thread)
         def_name = self.label.text() + ".pickle"
         myFileManager('Save Run Thread', def_name, data)
         
@@ -11,13 +11,18 @@ class MainWindow(QMainWindow):
     Main Window of the application. Contains two pages, with their respective tabs:
     - Multi Objective Optimization Page and Single Obejective Optimization Tab
 
+    Only the page that is shown first is built when the window is created (with its default parameters, if none are
+    given), the other one is built the first time it is shown, so the app starts faster.
+
     Attributes
     ----------------
     - tabs: A dictionary that holds the tabs of the application. The keys are the page indices 
-    and the values are the tabs themselves.
+    and the values are the tabs themselves, only of the pages already built.
+    - pages_args: The page, run options and parameters of each page index, to build it.
 
     Important Methods
     -----------------
+    - getTabs: Returns the tabs of the page index, building the page the first time.
     - createTabs: Creates a tab with the given page, run options, and parameters, and adds it to the layout of the page.
     - activeTabs: Returns the currently active tab based on the index of the stacked widget.
     - switchPage: Switches between the SOO and MOO pages, updates the menu bar and window title, and checks and unchecks the SOO and MOO checkboxes based on the current page.
@@ -28,16 +33,13 @@ class MainWindow(QMainWindow):
     def __init__(self, run_options_soo = {}, parameters_soo = {}, run_options_moo = {}, parameters_moo = {}):
         super().__init__()        
         
-        parameters_moo = Defaults(True).parameters if parameters_moo == {} else parameters_moo
-        parameters_soo = Defaults(False).parameters if parameters_soo == {} else parameters_soo
-        
         loadUi(DESIGNER_MAIN, self)
         
         switch_page = run_options_soo == {} and run_options_moo != {}
         
-        # create pages
-        args = [(self.SOOpage, run_options_soo, parameters_soo, SOO_TAB), (self.MOOpage, run_options_moo, parameters_moo, MOO_TAB)]
-        self.tabs = {page_index: self.createTabs(page, run_options, parameters) for page, run_options, parameters, page_index in args}         
+        # the pages are created when first shown
+        self.pages_args = {SOO_TAB: (self.SOOpage, run_options_soo, parameters_soo), MOO_TAB: (self.MOOpage, run_options_moo, parameters_moo)}
+        self.tabs = {}
         
         self.setUI(switch_page)
     
@@ -57,17 +59,25 @@ class MainWindow(QMainWindow):
         self.action_EditParameters.triggered.connect(lambda: showAndRaise(self.activeTabs().edit_window))
         self.action_SaveParameters.triggered.connect(lambda: self.activeTabs().edit_window.saveParameters())
         self.action_LoadParameters.triggered.connect(lambda: self.activeTabs().edit_window.loadParameters())
-        
-        # connect the buttons of each tab to the respective actions
-        for tab in self.tabs.values():
-            tab.soo_checkBox.clicked.connect(self.switchPage)
-            tab.moo_checkBox.clicked.connect(self.switchPage)
-            tab.parameters_button.clicked.connect(lambda: showAndRaise(self.activeTabs().edit_window))
 
         # Set the current page to MOO if SOO has empty run options
-        self.tabs[MOO_TAB].moo_checkBox.setChecked(True)
-        self.tabs[MOO_TAB].soo_checkBox.setChecked(False)
-        self.switchPage() if switch_page else None
+        self.switchPage() if switch_page else self.getTabs(SOO_TAB)
+    
+    def getTabs(self, page_index: int):
+        """Return the tabs of the page, creating them the first time"""
+        
+        if page_index not in self.tabs:
+            page, run_options, parameters = self.pages_args.pop(page_index)
+            parameters = Defaults(page_index == MOO_TAB).parameters if parameters == {} else parameters
+            tabs = self.tabs[page_index] = self.createTabs(page, run_options, parameters)
+            
+            # connect the buttons of the tab to the respective actions
+            tabs.soo_checkBox.clicked.connect(self.switchPage)
+            tabs.moo_checkBox.clicked.connect(self.switchPage)
+            tabs.parameters_button.clicked.connect(lambda: showAndRaise(self.activeTabs().edit_window))
+            self.setCheckBoxes()
+            
+        return self.tabs[page_index]
     
     def createTabs(self, page, run_options: dict, parameters: dict):
         """Create a page with the run options and parameters"""
@@ -84,28 +94,29 @@ class MainWindow(QMainWindow):
     
     def activeTabs(self):
         """Return the active page"""
-        return self.tabs[self.stackedWidget.currentIndex()]
+        return self.getTabs(self.stackedWidget.currentIndex())
+    
+    def setCheckBoxes(self):
+        """Check the checkbox of the mode of each page, undoing the click that switched the page"""
+        for page_index, tabs in self.tabs.items():
+            tabs.moo_checkBox.setChecked(page_index == MOO_TAB)
+            tabs.soo_checkBox.setChecked(page_index == SOO_TAB)
     
     def switchPage(self):
         """Switch between SOO and MOO pages, and change the menu bar accordingly"""
         if self.stackedWidget.currentIndex() == SOO_TAB:
             self.action_SwitchPage.setText("Switch to SOO")
-            self.tabs[SOO_TAB].edit_window.close()
-            self.tabs[MOO_TAB].moo_checkBox.setChecked(True)
-            self.tabs[MOO_TAB].soo_checkBox.setChecked(False)
-            self.tabs[SOO_TAB].moo_checkBox.setChecked(False)
-            self.tabs[SOO_TAB].soo_checkBox.setChecked(True)
+            self.tabs[SOO_TAB].edit_window.close() if SOO_TAB in self.tabs else None
+            self.getTabs(MOO_TAB)
             self.stackedWidget.setCurrentIndex(MOO_TAB)
             self.setWindowTitle("Main Window - Multi Objective Optimization")
         else:
             self.action_SwitchPage.setText("Switch to MOO")
-            self.tabs[MOO_TAB].edit_window.close()
-            self.tabs[SOO_TAB].moo_checkBox.setChecked(False)
-            self.tabs[SOO_TAB].soo_checkBox.setChecked(True)
-            self.tabs[MOO_TAB].moo_checkBox.setChecked(True)
-            self.tabs[MOO_TAB].soo_checkBox.setChecked(False)
+            self.tabs[MOO_TAB].edit_window.close() if MOO_TAB in self.tabs else None
+            self.getTabs(SOO_TAB)
             self.stackedWidget.setCurrentIndex(SOO_TAB)
             self.setWindowTitle("Main Window - Single Objective Optimization")
+        self.setCheckBoxes()
                 
     def closeEvent(self, event):
         self.close()
@@ -1,6 +1,7 @@
 from pymoo.core.plot import Plot
 from pymoo.visualization.scatter import Scatter, Plot
 from pymoo.visualization.pcp import PCP
+from pymoo.util.misc import all_combinations
 
 from PyQt5.QtWidgets import QVBoxLayout, QWidget
 import pandas as pd
@@ -12,9 +13,125 @@ matplotlib.use('Qt5Agg')
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
 from matplotlib.figure import Figure
 
+from backend.cache import getParetoFront
 from utils.defines import PROB_KEY, ALGO_KEY, SEEDS_KEY, N_EVAL_KEY, CONVERT_KEY
-from utils.utils import MyMessageBox, ordinal
-from utils.useful_classes import MyFitnessLandscape
+from utils.utils import MyMessageBox
+
+class MyFitnessLandscape(Plot):
+    def __init__(self,
+                 problem,
+                 n_samples_2D=500,
+                 n_samples_3D=30,
+                 colorbar=False,
+                 contour_levels=30,
+                 max_n_solutions=100,
+                 show_best_sol=True,
+                 zoom_on_solutions=False,
+                 **kwargs):
+
+        super().__init__(**kwargs)
+        self.problem = problem
+        self.n_samples_2D = n_samples_2D
+        self.n_samples_3D = n_samples_3D
+        self.colorbar = colorbar
+        self.sets_of_points = []
+        self.sets_labels = []
+        self.contour_levels = contour_levels
+        self.max_n_solutions = max_n_solutions
+        self.show_best_sol = show_best_sol
+        self.zoom_on_solutions = zoom_on_solutions
+
+        self.kwargs_surface = dict(cmap="summer", rstride=1, cstride=1, alpha=0.2)
+        self.kwargs_contour = dict(linestyles="solid", offset=-1)
+        self.kwargs_contour_labels = None
+
+    def _do(self):
+
+        problem, sets_of_points = self.problem, self.sets_of_points
+
+        # find the min and max values of the decision variable between the sets of points
+        if self.zoom_on_solutions and sets_of_points != []:
+            x_min = min([min(points[:, 0]) for points in sets_of_points])
+            x_max = max([max(points[:, 0]) for points in sets_of_points])
+        else:
+            x_min, x_max = problem.xl[0], problem.xu[0]
+
+        if problem.n_var == 1 and problem.n_obj == 1:
+
+            self.init_figure()
+            X = np.linspace(x_min, x_max, self.n_samples_2D)[:, None]
+            Z = problem.evaluate(X, return_values_of=["F"])
+            self.ax.plot(X, Z, alpha=0.2)
+            self.ax.set_xlabel("x")
+            self.ax.set_ylabel("f(x)")
+            
+            self.plot_points()
+
+        elif problem.n_var == 2 and problem.n_obj == 1:
+            n_samples = self.n_samples_3D
+
+            if self.zoom_on_solutions and sets_of_points != []:
+                y_min = min([min(points[:, 1]) for points in sets_of_points])
+                y_max = max([max(points[:, 1]) for points in sets_of_points])
+            else:
+                y_min, y_max = problem.xl[1], problem.xu[1]
+            
+            A = np.linspace(x_min, x_max, n_samples)
+            B = np.linspace(y_min, y_max, n_samples)
+            X = all_combinations(A, B)
+
+            F = np.reshape(problem.evaluate(X, return_values_of=["F"]), (n_samples, n_samples))
+
+            _X = X[:, 0].reshape((n_samples, n_samples))
+            _Y = X[:, 1].reshape((n_samples, n_samples))
+            _Z = F.reshape((n_samples, n_samples))
+
+            self.init_figure(plot_3D=True)
+
+            surf = self.ax.plot_surface(_X, _Y, _Z, **self.kwargs_surface)
+            if self.colorbar:
+                self.fig.colorbar(surf)
+            
+            self.plot_points()
+        else:
+            raise Exception("Only landscapes of problems with one or two variables and one objective can be visualized.") #@IgnoreException
+
+    def plot_points(self):
+        
+        for points, (best_label, gen_label), in zip(self.sets_of_points, self.sets_labels):
+            # if points have 2 dimensions, add the third dimension with the fitness value
+            best_label, gen_label = best_label, gen_label
+            if len(points[0]) in [2,3]:
+                x,y = points[1:, 0], points[1:, 1]
+                best_x, best_y = points[0, 0], points[0, 1]
+                if len(points[0]) == 2:
+                    self.ax.scatter(x, y, s=10, label=gen_label, alpha=0.5)
+                    self.ax.scatter(best_x, best_y, s=50, label=best_label, alpha=1) if self.show_best_sol else None
+                if len(points[0]) == 3:
+                    z, best_z = points[1:, 2], points[0, 2]
+                    self.ax.scatter(x, y, z, s=20, label=gen_label, alpha=0.5)
+                    self.ax.scatter(best_x, best_y, best_z, s=100, label=best_label, alpha=1) if self.show_best_sol else None
+            else:
+                self.sets_of_points = []
+                MyMessageBox(f"Solutions have {len(points[0])-1} dimensions in decision space, only 1 or 2 are supported")
+                    
+    def add(self, points, label):
+        
+        self.legend = True
+        
+        # get the points coordinates from the points arg
+        best_point = points[0, :]
+        
+        # if the number of points is greater than 10, get a random sample of 10 points
+        cutoff = 100
+        if len(points[:, 0]) > cutoff:
+            points = points[np.random.choice(len(points[1:, 0]), cutoff, replace=False), :]
+        gen_label = label
+        best_label = label + f" (Best sol)"
+        
+        points = np.concatenate((best_point[np.newaxis,:], points))
+        self.sets_of_points.append(points)  
+        self.sets_labels.append((best_label, gen_label))
 
 class MplCanvas(FigureCanvasQTAgg):
     def __init__(self, width=5, height=4, dpi=100, fig=None, axes=None):
@@ -55,31 +172,9 @@ class QPlot(QWidget):
         self.stats_seeds_df = stats_seeds_df
 
     def getParetoFront(self):
-        algo_ids = list(self.algos_dict.keys())
-        # check if all algos have the same reference directions
-        ref_dirs_classes = [self.algos_dict[algo_id].ref_dirs.__class__ 
-                            if hasattr(self.algos_dict[algo_id], 'ref_dirs') else None for algo_id in algo_ids]
-        
-        # if all None
-        if all(ref_dir_class is None for ref_dir_class in ref_dirs_classes):
-            return self.prob_object.pareto_front()
-        
-        idx = ref_dirs_classes.index(next(filter(None, ref_dirs_classes)))
-        
-        # index of the first not None ref_dirs
-        ref_dirs = self.algos_dict[algo_ids[idx]].ref_dirs
-        
-        try:
-            pareto_front = self.prob_object.pareto_front(ref_dirs)
-            if len(set(ref_dirs_classes)) != 1:
-                MyMessageBox("Selected algorithms have different reference directions. Pareto Front calculated with the" 
-                                f" reference directions of the {ordinal(idx+1)} selected algorithm")
-        except:
-            pareto_front = self.prob_object.pareto_front()
-            MyMessageBox(f"Could not calculate the Pareto Front using reference directions from the {ordinal(idx+1)} selected algorithm." 
-                            " Pareto Front calculated with the problem default reference directions.")
-        
-        return pareto_front
+        """The reference pareto front of the problem, the one its performance indicators used (see getParetoFront in
+        backend/cache.py), whatever the reference directions of the selected algorithms"""
+        return getParetoFront(self.prob_object)
     
     @abstractmethod
     def createCanvas(self) -> MplCanvas:
@@ -109,13 +204,13 @@ class QPlot(QWidget):
         filtered_df.reset_index(drop=True, inplace=True)            
             
         for prob_id, algo_id, seed, run_type in filtered_df.values:
-            # get the best solution for each run_id
-            best_gen = self.run_thread.best_gen[(prob_id, algo_id, seed)]
+            # get the best solution for each run_id, only reading the arrays that are plotted
+            best_gen = self.run_thread.best_gen
             if self.prob_object.n_obj > 1:
-                points = best_gen['F']
+                points = best_gen.getArray((prob_id, algo_id, seed), 'F')
                 # plot the best solution
             else:
-                x , f = best_gen['X'], best_gen['F']
+                x , f = best_gen.getArray((prob_id, algo_id, seed), 'X'), best_gen.getArray((prob_id, algo_id, seed), 'F')
                 points = np.concatenate((x, f), axis=1)
                 points = points[points[:, -1].argsort()] # sort the solutions by objective value
             plot.add(points, label = f"Algo '{algo_id}'{run_type}", **kwargs)
@@ -0,0 +1,88 @@
+"""
+    Cold-start benchmark of the app: each start is a new python process that creates the MainWindow with the default
+    run options of main.py, shows it and exits after its first paint, reporting the time since the process started
+    its code of:
+    - import: the imports of PyQt and the MainWindow.
+    - build: creating the MainWindow (the Defaults and the widgets of the first page).
+    - first paint: showing it until it is painted for the first time (the time-to-first-paint of the app).
+
+    The first start is not counted, since it writes the snapshots of the Defaults (see backend/defaults.py) and loads
+    the files of the modules from the disk. Run from the project folder with:
+        python -m tests.cold_start_benchmark --runs 5
+    (with QT_QPA_PLATFORM=offscreen in a machine without a display).
+"""
+import time
+START = time.perf_counter()
+
+import sys
+import json
+import argparse
+import subprocess
+import statistics
+
+PHASES = ['import', 'build', 'first paint']
+PAINT_TIMEOUT = 30000 # ms to wait for the first paint before giving up
+
+def coldStart():
+    """Start the app and print the times (since START) at the end of each phase as json"""
+
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QObject, QEvent, QTimer
+    app = QApplication([])
+    from frontend.main_window import MainWindow
+    from main import defaultStart
+    times = {'import': time.perf_counter() - START}
+
+    run_options_moo, run_options_soo = defaultStart()
+    main_window = MainWindow(run_options_soo, {}, run_options_moo, {})
+    times['build'] = time.perf_counter() - START
+
+    class PaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and 'first paint' not in times:
+                times['first paint'] = time.perf_counter() - START
+                app.quit()
+            return False
+
+    paint_filter = PaintFilter()
+    main_window.installEventFilter(paint_filter)
+    QTimer.singleShot(PAINT_TIMEOUT, app.quit)
+    main_window.show()
+    app.exec_()
+
+    print(json.dumps(times))
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Cold-start benchmark of the app")
+    parser.add_argument('--runs', type=int, default=5, help="number of starts measured (after a first one that is not)")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        coldStart()
+        return
+
+    results = []
+    for run in range(args.runs + 1):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-m', 'tests.cold_start_benchmark', '--child'], capture_output=True, text=True)
+        process_time = time.perf_counter() - start
+        lines = [line for line in output.stdout.splitlines() if line.startswith('{')]
+        if output.returncode != 0 or not lines:
+            print(output.stderr)
+            raise RuntimeError("The app did not start")
+        times = json.loads(lines[-1])
+        if 'first paint' not in times:
+            raise RuntimeError(f"The app was not painted in {PAINT_TIMEOUT} ms")
+        if run > 0:
+            results.append({**times, 'process': process_time})
+
+    print(f"Cold start of the app, {args.runs} runs (seconds since the start of the process code):")
+    for phase in PHASES + ['process']:
+        values = [result[phase] for result in results]
+        label = phase if phase != 'process' else 'process (with python start and exit)'
+        print(f"  {label:<38} median {statistics.median(values):.3f}   min {min(values):.3f}   max {max(values):.3f}")
+
+if __name__ == '__main__':
+    main()
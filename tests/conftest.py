@@ -0,0 +1,34 @@
+import copy
+
+import pytest
+
+from backend.defaults import Defaults
+from utils.defines import PROB_KEY, ALGO_KEY, PI_KEY, TERM_KEY, SEEDS_KEY
+
+DEFAULT_PARAMETERS = {} # moo -> default parameters, built once for all the tests
+
+@pytest.fixture(autouse=True)
+def tmpWorkingDir(tmp_path, monkeypatch):
+    """Run each test in its own folder, so the run logs and caches it writes are not left in the repository"""
+    monkeypatch.chdir(tmp_path)
+
+def getParameters(moo: bool) -> dict:
+    """Get a copy of the default parameters, without the plot types so Qt is not needed"""
+    if moo not in DEFAULT_PARAMETERS:
+        DEFAULT_PARAMETERS[moo] = Defaults(moo, plot_types=False).parameters
+    return copy.deepcopy(DEFAULT_PARAMETERS[moo])
+
+def getRunOptions(prob_ids: list, algo_ids: list, pi_ids: list, n_seeds: int = 1, term_id: str = 'n_eval') -> dict:
+    return {PROB_KEY: prob_ids, ALGO_KEY: algo_ids, PI_KEY: pi_ids, TERM_KEY: [term_id], SEEDS_KEY: n_seeds}
+
+@pytest.fixture
+def soo_parameters():
+    parameters = getParameters(False)
+    parameters[TERM_KEY]['n_eval']['n_max_evals'] = 300
+    return parameters
+
+@pytest.fixture
+def moo_parameters():
+    parameters = getParameters(True)
+    parameters[TERM_KEY]['n_eval']['n_max_evals'] = 400
+    return parameters
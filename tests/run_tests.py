@@ -5,9 +5,10 @@ full_path = r"C:\Users\tomas\OneDrive - Universidade de Lisboa\Desktop\Tese\Thes
 ####################################################################################################
 
 import os
-import filecmp
 import time
 import datetime
+import numpy as np
+import pandas as pd
 from PyQt5.QtWidgets import QApplication
 import sys
 sys.path.insert(1, full_path)
@@ -16,6 +17,25 @@ from utils.defines import RESULTS_FOLDER, EXPECTED_RESULTS_FOLDER, RESULTS_FILE
 from tests.tests_declaration import Test, soo_algos, soo_probs, soo_mixed, moo_algos, moo_probs, moo_mixed
 
 TESTS_TO_RUN = [soo_algos, soo_probs, soo_mixed, moo_algos, moo_probs, moo_mixed]
+# tolerances of the comparison of the numeric columns, since the values can change at the level of the floating point
+# error when only the order of the operations changes (e.g. the distances of the KD-trees of the distance indicators)
+RTOL = 1e-9
+ATOL = 1e-12
+
+def compareResults(file: str, expected_file: str) -> bool:
+    """Whether the results are the same as the expected ones: the same columns and rows, the same text values and the
+    numeric values the same up to the tolerances (nan where the expected is nan)"""
+
+    results, expected = pd.read_csv(file), pd.read_csv(expected_file)
+    if list(results.columns) != list(expected.columns) or len(results) != len(expected):
+        return False
+    for col in expected.columns:
+        if pd.api.types.is_numeric_dtype(expected[col]) and pd.api.types.is_numeric_dtype(results[col]):
+            if not np.allclose(results[col], expected[col], rtol=RTOL, atol=ATOL, equal_nan=True):
+                return False
+        elif not results[col].equals(expected[col]):
+            return False
+    return True
 
 def main():
 
@@ -50,7 +70,7 @@ def main():
             if file not in expected_files:
                 string = date_time + ' No comparison for test ' + file + '\n'
             else:
-                test_result = ' passed!' if filecmp.cmp(RESULTS_FOLDER + '/' + file, EXPECTED_RESULTS_FOLDER + '/' + file) else ' failed!'
+                test_result = ' passed!' if compareResults(RESULTS_FOLDER + '/' + file, EXPECTED_RESULTS_FOLDER + '/' + file) else ' failed!'
                 string = date_time + ' Test ' + file + test_result + '\n'
             print(string)
             f.write(string)
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+
+from backend.cache import ResultCache, getConfigHash
+from utils.defines import ALGO_KEY, RECORD_EVERY_K_EVALS
+
+def getHash(parameters: dict, algo_id: str = 'ga', **kwargs) -> str:
+    return getConfigHash(parameters, 'ackley', algo_id, 'n_eval', ['best'], **kwargs)
+
+def putUnit(cache: ResultCache, config_hash: str, seed: int, size: int = 100):
+    cache.put(config_hash, seed, {'n_eval': np.arange(size)}, np.zeros((1, 2)), np.zeros((1, 1)))
+
+def test_config_hash_is_stable(soo_parameters):
+    config_hash = getHash(soo_parameters)
+    assert getHash(soo_parameters) == config_hash
+    # the ids are not part of the hash
+    soo_parameters[ALGO_KEY]['my_ga'] = soo_parameters[ALGO_KEY].pop('ga')
+    assert getHash(soo_parameters, 'my_ga') == config_hash
+
+def test_config_hash_changes_with_the_parameters(soo_parameters):
+    config_hash = getHash(soo_parameters)
+    assert getHash(soo_parameters, 'de') != config_hash
+    assert getHash(soo_parameters, recording=(RECORD_EVERY_K_EVALS, 100)) != config_hash
+    assert getHash(soo_parameters, defer_pis=True) != config_hash
+    soo_parameters[ALGO_KEY]['ga']['pop_size'] = 50
+    assert getHash(soo_parameters) != config_hash
+
+def test_config_hash_changes_with_the_source(soo_parameters, monkeypatch):
+    import backend.get
+    config_hash = getHash(soo_parameters)
+    # the 'best' indicator is a class of utils/useful_classes.py
+    source_hash = backend.get.getSourceHash
+    monkeypatch.setattr(backend.get, 'getSourceHash', lambda module: 'edited' if module == 'utils.useful_classes' else source_hash(module))
+    assert getHash(soo_parameters) != config_hash
+
+def test_cache_hit_and_miss(tmp_path):
+    cache = ResultCache(tmp_path / 'cache', 10**6)
+    assert cache.get('hash', 0) is None
+    putUnit(cache, 'hash', 0)
+    callback_data, X, F, snapshots, resources = cache.get('hash', 0)
+    assert np.array_equal(callback_data['n_eval'], np.arange(100))
+    assert X.shape == (1, 2) and F.shape == (1, 1) and snapshots is None and resources is None
+    # another seed or configuration is another entry
+    assert cache.get('hash', 1) is None
+    assert cache.get('other_hash', 0) is None
+    assert cache.path('hash', 0) != cache.path('hash', 1)
+
+def test_cache_evicts_the_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path / 'cache', 10**6)
+    for seed in range(3):
+        putUnit(cache, 'hash', seed, 1000)
+        # the modification time is the time of the last use
+        os.utime(cache.path('hash', seed), (seed, seed))
+    entry_size = os.path.getsize(cache.path('hash', 0))
+    assert cache.get('hash', 0) is not None # seed 0 is now the most recently used
+
+    cache.max_size = 3 * entry_size
+    putUnit(cache, 'hash', 3, 1000)
+    assert cache.get('hash', 1) is None
+    assert all(cache.get('hash', seed) is not None for seed in [0, 2, 3])
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from pymoo.indicators.hv import HV
+from pymoo.util.nds.non_dominated_sorting import NonDominatedSorting
+
+from utils.hypervolume import HypervolumeEngine
+from utils.defines import HV_MONTE_CARLO_MIN_OBJ
+
+def getFront(n_obj: int, n_points: int, seed: int = 0, dominated: bool = True) -> np.ndarray:
+    """Points on the unit sphere, with dominated points, repeated points and points beyond the reference point if dominated"""
+    rng = np.random.default_rng(seed)
+    F = np.abs(rng.normal(size=(n_points, n_obj)))
+    F /= np.linalg.norm(F, axis=1, keepdims=True)
+    if dominated:
+        F = np.concatenate([F, F[:5] + 0.1, F[:5], F[:3] + 1.0])
+    return F
+
+@pytest.mark.parametrize('n_obj', [2, 3, 4, 5])
+def test_exact_same_as_pymoo(n_obj):
+    ref_point = np.full(n_obj, 1.2)
+    # the exact algorithm of 4 or more objectives needs non-dominated points
+    F = getFront(n_obj, 60, dominated=n_obj <= 3)
+    assert np.isclose(HypervolumeEngine(ref_point).do(F), HV(ref_point).do(F), rtol=1e-9, atol=0)
+
+@pytest.mark.parametrize('n_obj', [2, 3])
+def test_two_points_with_the_same_value(n_obj):
+    ref_point = np.full(n_obj, 2.0)
+    F = np.array([[1.0] * n_obj, [1.0] * (n_obj - 1) + [0.5], [0.5] + [1.0] * (n_obj - 1)])
+    assert np.isclose(HypervolumeEngine(ref_point).do(F), HV(ref_point).do(F), rtol=1e-12, atol=0)
+
+@pytest.mark.parametrize('n_obj', [2, 3, 4])
+def test_successive_fronts(n_obj):
+    ref_point = np.full(n_obj, 1.2)
+    engine = HypervolumeEngine(ref_point)
+    for seed in [0, 0, 1, 2, 2]:
+        F = getFront(n_obj, 40, seed, dominated=False)
+        assert np.isclose(engine.do(F), HV(ref_point).do(F), rtol=1e-9, atol=0)
+
+def test_monte_carlo_close_to_pymoo():
+    n_obj = HV_MONTE_CARLO_MIN_OBJ
+    ref_point = np.full(n_obj, 1.2)
+    F = getFront(n_obj, 30, dominated=False)
+    engine = HypervolumeEngine(ref_point)
+    value = engine.do(F)
+    # the samples have a fixed seed, so the estimate is always the same
+    assert 0 < engine.half_width and abs(value - HV(ref_point).do(F)) <= engine.half_width
+    assert HypervolumeEngine(ref_point).do(F) == value
+
+def test_monte_carlo_incremental_same_as_from_scratch():
+    n_obj = HV_MONTE_CARLO_MIN_OBJ
+    ref_point, lower = np.full(n_obj, 1.2), np.zeros(n_obj)
+    engine = HypervolumeEngine(ref_point, lower, n_samples=20000)
+    F = getFront(n_obj, 30, dominated=False)
+    for F_next in [F, F[:25], np.concatenate([F[:20], getFront(n_obj, 10, 1, dominated=False)])]:
+        F_next = F_next[NonDominatedSorting().do(F_next, only_non_dominated_front=True)]
+        assert engine.do(F_next) == HypervolumeEngine(ref_point, lower, n_samples=20000).do(F_next)
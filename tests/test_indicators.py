@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from pymoo.indicators.gd import GD
+from pymoo.indicators.gd_plus import GDPlus
+from pymoo.indicators.igd import IGD
+from pymoo.indicators.igd_plus import IGDPlus
+
+import utils.useful_classes as useful_classes
+from utils.useful_classes import FastGD, FastGDPlus, FastIGD, FastIGDPlus
+
+INDICATORS = [(FastGD, GD), (FastGDPlus, GDPlus), (FastIGD, IGD), (FastIGDPlus, IGDPlus)]
+
+def getFronts(n_obj: int, seed: int = 0):
+    """A front of points on the unit simplex and a front of points around it"""
+    rng = np.random.default_rng(seed)
+    pf = rng.dirichlet(np.ones(n_obj), size=500)
+    F = rng.dirichlet(np.ones(n_obj), size=80) + rng.normal(0.05, 0.05, size=(80, n_obj))
+    return pf, F
+
+@pytest.mark.parametrize('fast_class, pymoo_class', INDICATORS)
+@pytest.mark.parametrize('n_obj', [2, 3, 5])
+def test_same_as_pymoo(fast_class, pymoo_class, n_obj):
+    pf, F = getFronts(n_obj)
+    assert np.isclose(fast_class(pf).do(F), pymoo_class(pf).do(F), rtol=1e-9, atol=0)
+
+@pytest.mark.parametrize('fast_class, pymoo_class', INDICATORS)
+@pytest.mark.parametrize('kwargs', [{'zero_to_one': True}, {'norm_by_dist': True, 'ideal': np.zeros(3), 'nadir': np.full(3, 2.0)}])
+def test_normalized_same_as_pymoo(fast_class, pymoo_class, kwargs):
+    pf, F = getFronts(3)
+    assert np.isclose(fast_class(pf, **kwargs).do(F), pymoo_class(pf, **kwargs).do(F), rtol=1e-9, atol=0)
+
+@pytest.mark.parametrize('fast_class, pymoo_class', INDICATORS)
+def test_chunks_same_as_pymoo(fast_class, pymoo_class, monkeypatch):
+    # a few rows of the distances at a time
+    monkeypatch.setattr(useful_classes, 'PI_CHUNK_ELEMENTS', 1000)
+    pf, F = getFronts(3)
+    assert np.isclose(fast_class(pf).do(F), pymoo_class(pf).do(F), rtol=1e-9, atol=0)
+
+@pytest.mark.parametrize('fast_class, pymoo_class', INDICATORS)
+def test_batch_same_as_pymoo(fast_class, pymoo_class):
+    pf, _ = getFronts(3)
+    F_list = [getFronts(3, seed)[1][:n] for seed, n in zip(range(1, 5), [1, 10, 40, 80])]
+    values = fast_class(pf).doBatch(F_list)
+    assert np.allclose(values, [pymoo_class(pf).do(F) for F in F_list], rtol=1e-9, atol=0)
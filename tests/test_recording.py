@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from backend.build import getRunArgsList
+from backend.runner import MyCallback, runUnit
+from utils.defines import (TERM_KEY, N_EVAL_KEY, N_GEN_KEY, RECORD_EVERY_GEN, RECORD_EVERY_K_EVALS, RECORD_LOG_SPACED,
+                           RECORD_N_POINTS)
+from tests.conftest import getRunOptions
+
+N_MAX_EVALS = 3000
+
+def runRecording(parameters: dict, recording: tuple) -> dict:
+    parameters[TERM_KEY]['n_eval']['n_max_evals'] = N_MAX_EVALS
+    run_args = getRunArgsList(getRunOptions(['ackley'], ['ga'], ['best']), parameters, recording=recording)[0]
+    callback_data, *_ = runUnit(run_args, 0, False)
+    return callback_data
+
+def getCheckpointGenerations(n_evals: np.ndarray, next_eval) -> list:
+    """Indexes of the first generations after each checkpoint, given the next checkpoint after an evaluation, and the final one"""
+    indexes, checkpoint = [], 0
+    for i, n_eval in enumerate(n_evals):
+        if n_eval >= checkpoint or i == len(n_evals) - 1:
+            indexes.append(i)
+            checkpoint = next_eval(n_eval)
+    return indexes
+
+@pytest.fixture
+def every_gen(soo_parameters):
+    return runRecording(soo_parameters, (RECORD_EVERY_GEN, None))
+
+def test_every_gen(every_gen):
+    assert np.array_equal(every_gen[N_GEN_KEY], np.arange(1, len(every_gen[N_GEN_KEY]) + 1))
+    assert every_gen[N_EVAL_KEY][-1] == N_MAX_EVALS
+
+@pytest.mark.parametrize('recording, next_eval', [
+    ((RECORD_EVERY_K_EVALS, 500), lambda n_eval: (n_eval // 500 + 1) * 500),
+    ((RECORD_LOG_SPACED, 4), lambda n_eval: 10 ** ((np.floor(np.log10(n_eval) * 4 + 1e-9) + 1) / 4)),
+])
+def test_checkpoint_policies(soo_parameters, every_gen, recording, next_eval):
+    data = runRecording(soo_parameters, recording)
+    indexes = getCheckpointGenerations(every_gen[N_EVAL_KEY], next_eval)
+    # the same generations, with the same values, as recording all of them and keeping the ones after the checkpoints
+    for key in [N_EVAL_KEY, N_GEN_KEY, 'best']:
+        assert np.array_equal(data[key], every_gen[key][indexes])
+
+@pytest.mark.parametrize('k', [3, 5])
+def test_n_points(soo_parameters, every_gen, k):
+    data = runRecording(soo_parameters, (RECORD_N_POINTS, k))
+    n_evals = data[N_EVAL_KEY]
+    assert k <= len(n_evals) <= 2 * k + 1
+    # the first and final generations, evenly spaced between them except the final one
+    assert n_evals[0] == every_gen[N_EVAL_KEY][0] and n_evals[-1] == N_MAX_EVALS
+    assert len(np.unique(np.diff(n_evals[:-1]))) == 1
+    indexes = np.searchsorted(every_gen[N_EVAL_KEY], n_evals)
+    assert np.array_equal(data['best'], every_gen['best'][indexes])
+
+@pytest.mark.parametrize('recording', [('every_other_gen', 2), (RECORD_EVERY_K_EVALS, None), (RECORD_N_POINTS, 0)])
+def test_invalid_recording(recording):
+    with pytest.raises(ValueError):
+        MyCallback([], [], recording)
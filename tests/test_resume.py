@@ -0,0 +1,44 @@
+import pandas as pd
+
+from backend.build import getRunner
+from backend.runner import Runner
+from backend.results import RunLog
+from utils.defines import SEEDS_KEY
+from tests.conftest import getRunOptions
+
+class InterruptedRunner(Runner):
+    """Runner that is canceled after n_units units, as if the app was closed during the run"""
+    n_units = 2
+
+    def updateData(self, *args, **kwargs):
+        super().updateData(*args, **kwargs)
+        if len(self.best_gen) >= self.n_units:
+            self.cancel()
+
+def test_resume_completes_the_run(soo_parameters):
+    run_options = getRunOptions(['ackley'], ['ga', 'de'], ['best'], n_seeds=3)
+    run_log = RunLog('run_log')
+    getRunner(run_options, soo_parameters, InterruptedRunner, fixed_seeds=False, run_log=run_log).run()
+    assert len(run_log) == InterruptedRunner.n_units and not run_log.isComplete()
+
+    # the random seeds of the interrupted run are read from the manifest
+    resumed = getRunner(run_options, soo_parameters, fixed_seeds=False)
+    resumed.loadRunLog(RunLog('run_log'), resume=True)
+    assert resumed.completed_units == {0, 1}
+    resumed.run()
+    assert run_log.isComplete()
+    assert list(resumed.data[SEEDS_KEY].unique()) == list(run_log.readManifest()['seeds'])
+    assert resumed.run_counter == 6
+
+def test_resume_gives_the_uninterrupted_run(soo_parameters):
+    run_options = getRunOptions(['ackley'], ['ga', 'de'], ['best'], n_seeds=3)
+    runner = getRunner(run_options, soo_parameters)
+    runner.run()
+
+    getRunner(run_options, soo_parameters, InterruptedRunner, run_log=RunLog('run_log')).run()
+    resumed = getRunner(run_options, soo_parameters, run_log=RunLog('run_log'))
+    resumed.loadRunLog(resumed.run_log, resume=True)
+    resumed.run()
+    # the units are in the order of the manifest, whatever the order they finished in
+    pd.testing.assert_frame_equal(resumed.data, runner.data)
+    assert list(resumed.best_gen.keys()) == list(runner.best_gen.keys())
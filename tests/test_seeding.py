@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from backend.build import getRunner
+from backend.seeding import getRunSeeds, getSeedKey, getUnitRandomState, getRetrySeed
+from utils.defines import PROB_KEY, ALGO_KEY, SEEDS_KEY, MAX_RANDOM_SEED
+from tests.conftest import getRunOptions
+
+def getUnitsData(runner) -> dict:
+    """(problem, algorithm, seed) -> n_eval, n_gen and performance indicators of the unit"""
+    return {key: unit_data.drop(columns=[PROB_KEY, ALGO_KEY]).reset_index(drop=True)
+            for key, unit_data in runner.data.groupby([PROB_KEY, ALGO_KEY, SEEDS_KEY], sort=False, observed=True)}
+
+def test_run_seeds():
+    assert np.array_equal(getRunSeeds(4, True), np.arange(4))
+    seeds = getRunSeeds(50, False)
+    assert len(np.unique(seeds)) == 50 and np.all((0 <= seeds) & (seeds < MAX_RANDOM_SEED))
+
+def test_seed_key(soo_parameters):
+    seed_key = getSeedKey(soo_parameters, 'ackley', 'ga')
+    assert seed_key != getSeedKey(soo_parameters, 'ackley', 'de')
+    # the ids are not part of the key, only the entries
+    soo_parameters[ALGO_KEY]['my_ga'] = soo_parameters[ALGO_KEY].pop('ga')
+    assert getSeedKey(soo_parameters, 'ackley', 'my_ga') == seed_key
+    soo_parameters[ALGO_KEY]['my_ga']['pop_size'] = 50
+    assert getSeedKey(soo_parameters, 'ackley', 'my_ga') != seed_key
+
+def test_unit_random_states():
+    values = getUnitRandomState(0, 1).random(10)
+    assert np.array_equal(getUnitRandomState(0, 1).random(10), values)
+    assert not np.array_equal(getUnitRandomState(1, 1).random(10), values)
+    assert not np.array_equal(getUnitRandomState(0, 2).random(10), values)
+
+def test_retry_seeds():
+    retry_seeds = [getRetrySeed(7, attempt) for attempt in [1, 2, 3]]
+    assert retry_seeds == [getRetrySeed(7, attempt) for attempt in [1, 2, 3]]
+    assert len(set(retry_seeds + [7])) == 4
+
+def test_units_do_not_depend_on_the_run(soo_parameters):
+    runner = getRunner(getRunOptions(['ackley'], ['ga', 'de'], ['best'], n_seeds=2), soo_parameters)
+    runner.run()
+    units = getUnitsData(runner)
+
+    # another order of the algorithms, another number of seeds, and in a process pool
+    other_runners = [getRunner(getRunOptions(['ackley'], ['de', 'ga'], ['best'], n_seeds=2), soo_parameters),
+                     getRunner(getRunOptions(['ackley'], ['de'], ['best'], n_seeds=1), soo_parameters),
+                     getRunner(getRunOptions(['ackley'], ['ga', 'de'], ['best'], n_seeds=2), soo_parameters, n_workers=2)]
+    for other_runner in other_runners:
+        other_runner.run()
+        for key, unit_data in getUnitsData(other_runner).items():
+            pd.testing.assert_frame_equal(unit_data, units[key])
+
+def test_units_run_with_python_int_seeds(soo_parameters, monkeypatch):
+    import random
+    random_seed = random.seed
+    def seed(a=None, *args):
+        # as in Python 3.11, where random.seed raises a TypeError for numpy integers
+        if not isinstance(a, (type(None), int, float, str, bytes, bytearray)):
+            raise TypeError(f"The only supported seed types are: None, int, float, str, bytes, and bytearray, got {type(a)}")
+        random_seed(a, *args)
+    monkeypatch.setattr(random, 'seed', seed)
+
+    runner = getRunner(getRunOptions(['ackley'], ['ga'], ['best'], n_seeds=2), soo_parameters, fixed_seeds=False)
+    runner.run()
+    assert runner.errors == [] and len(runner.best_gen) == 2
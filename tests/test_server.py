@@ -0,0 +1,94 @@
+import os
+import time
+import threading
+from multiprocessing import AuthenticationError
+
+import pandas as pd
+import pytest
+
+from backend.build import getRunner
+from backend.run import RemoteRunThread
+from backend.server import ExecutionServer, ServerClient, getAuthKey
+from utils.defines import TERM_KEY, RECORDING_POLICY
+from tests.conftest import getRunOptions
+
+def getJob(run_options: dict, parameters: dict) -> dict:
+    return {'name': 'test', 'run_options': run_options, 'parameters': parameters, 'fixed_seeds': True, 'n_workers': 1,
+            'use_cache': False, 'recording': RECORDING_POLICY, 'defer_pis': False, 'profile': False}
+
+def waitFinished(client: ServerClient, job_id: int, timeout: float = 60) -> dict:
+    start = time.time()
+    while not (status := client.request('status', job_id))['finished']:
+        assert time.time() - start < timeout
+        time.sleep(0.05)
+    return status
+
+@pytest.fixture
+def server(tmp_path):
+    """A server in a thread of the tests, on a free port and with the key in a temporary file"""
+    server = ExecutionServer(('localhost', 0), getAuthKey(str(tmp_path / 'key' / 'server_key')))
+    threading.Thread(target=server.serve, daemon=True).start()
+    while server.listener is None:
+        time.sleep(0.01)
+    yield server
+    ServerClient(server.listener.address, server.authkey).request('shutdown')
+
+@pytest.fixture
+def client(server):
+    return ServerClient(server.listener.address, server.authkey)
+
+def test_auth_key(tmp_path):
+    path = str(tmp_path / 'key' / 'server_key')
+    key = getAuthKey(path)
+    assert getAuthKey(path) == key and os.stat(path).st_mode & 0o777 == 0o600
+    os.chmod(path, 0o644)
+    with pytest.raises(PermissionError):
+        getAuthKey(path)
+    with open(path, 'wb') as file:
+        file.write(b'short')
+    os.chmod(path, 0o600)
+    with pytest.raises(ValueError):
+        getAuthKey(path)
+
+def test_other_key_is_rejected(server, client):
+    other_client = ServerClient(server.listener.address, bytes(32))
+    with pytest.raises(AuthenticationError):
+        other_client.request('jobs')
+    assert not other_client.isRunning() and other_client.isOtherServer()
+    # the server keeps answering the clients with the key
+    assert client.isRunning() and client.request('jobs') == []
+    with pytest.raises(ValueError):
+        client.request('unknown')
+
+def test_finished_jobs_kept_until_forgotten(client, soo_parameters):
+    run_options = getRunOptions(['ackley'], ['ga'], ['best'], n_seeds=2)
+    job_id = client.request('submit', getJob(run_options, soo_parameters))
+    status = waitFinished(client, job_id)
+    assert not status['canceled'] and status['error'] is None and os.path.isdir(status['run_log'])
+
+    # a client that stopped before loading the results can find the job again
+    assert client.request('status', job_id)['finished']
+    assert [job['job_id'] for job in client.request('jobs')] == [job_id]
+    client.request('forget', job_id)
+    assert client.request('jobs') == []
+    with pytest.raises(KeyError):
+        client.request('status', job_id)
+
+def test_cancel(client, soo_parameters):
+    soo_parameters[TERM_KEY]['n_eval']['n_max_evals'] = 100000
+    job_id = client.request('submit', getJob(getRunOptions(['ackley'], ['ga'], ['best'], n_seeds=5), soo_parameters))
+    client.request('cancel', job_id)
+    assert waitFinished(client, job_id)['canceled']
+
+def test_remote_run_thread(client, soo_parameters):
+    run_options = getRunOptions(['ackley'], ['ga', 'de'], ['best'], n_seeds=2)
+    runner = getRunner(run_options, soo_parameters)
+    runner.run()
+
+    run_thread = getRunner(run_options, soo_parameters, RemoteRunThread, client=client, job_name='test')
+    run_thread.run()
+    assert not run_thread.canceled and run_thread.run_counter == 4
+    pd.testing.assert_frame_equal(run_thread.data, runner.data)
+    assert [job['name'] for job in client.request('jobs')] == ['test']
+    run_thread.forget()
+    assert client.request('jobs') == []
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from backend.build import getRunner
+from backend.cli import loadPickle, saveRun
+from backend.results import RunLog, BestGenStore, mergeRuns
+from utils.defines import PROB_KEY, ALGO_KEY, SEEDS_KEY, N_EVAL_KEY
+from tests.conftest import getRunOptions
+
+def getShardRuns(parameters: dict, run_options: dict, n_shards: int) -> list:
+    """Run each shard with its own RunLog, and get the run log headers"""
+    run_logs = []
+    for shard_index in range(n_shards):
+        run_log = RunLog(f'shard_{shard_index}')
+        getRunner(run_options, parameters, run_log=run_log, shard=(shard_index, n_shards)).run()
+        run_logs.append(run_log)
+    return [loadPickle(run_log.path(RunLog.HEADER_FILE)) for run_log in run_logs]
+
+def test_shards_cover_the_run(soo_parameters):
+    run_options = getRunOptions(['ackley'], ['ga', 'de'], ['best'], n_seeds=3)
+    shard_runners = [getRunner(run_options, soo_parameters, shard=(shard_index, 4)) for shard_index in range(4)]
+    # 6 units in 4 shards
+    assert [runner.total_runs for runner in shard_runners] == [2, 2, 1, 1]
+
+def test_merged_shards_are_the_unsharded_run(soo_parameters):
+    run_options = getRunOptions(['ackley'], ['ga', 'de'], ['best'], n_seeds=3)
+    runner = getRunner(run_options, soo_parameters)
+    runner.run()
+
+    merged = mergeRuns(getShardRuns(soo_parameters, run_options, 3))
+    assert merged['run_counter'] == 6
+    pd.testing.assert_frame_equal(merged['data'], runner.data)
+    assert list(merged['best_gen'].keys()) == list(runner.best_gen.keys())
+    assert merged['unit_indexes'] == runner.unit_indexes
+
+def test_merge_saved_runs_and_run_logs(soo_parameters):
+    run_options = getRunOptions(['ackley'], ['ga'], ['best'], n_seeds=2)
+    runs = getShardRuns(soo_parameters, run_options, 2)
+    runner = getRunner(run_options, soo_parameters, shard=(0, 2))
+    runner.run()
+    saveRun(runner, 'shard_0.pickle')
+
+    # a unit in more than one run is only added once
+    merged = mergeRuns([loadPickle('shard_0.pickle')] + runs)
+    pd.testing.assert_frame_equal(merged['data'], mergeRuns(runs)['data'])
+    assert len(merged['data'].groupby(SEEDS_KEY)) == 2
+
+def getUnitsRun(seeds: list, indexes: list, run_options: dict) -> dict:
+    data = pd.DataFrame({SEEDS_KEY: np.repeat(seeds, 2), PROB_KEY: 'ackley', ALGO_KEY: 'ga', N_EVAL_KEY: np.tile([100, 200], len(seeds))})
+    best_gen = BestGenStore()
+    for seed in seeds:
+        best_gen.add(('ackley', 'ga', seed), np.zeros((1, 2)), np.full((1, 1), seed))
+    return {'parameters': {}, 'run_options': run_options, 'moo': False, 'data': data, 'best_gen': best_gen, 'run_counter': len(seeds),
+            'unit_indexes': {('ackley', 'ga', seed): index for seed, index in zip(seeds, indexes)}}
+
+def test_merge_keeps_retried_units_in_place():
+    run_options = getRunOptions(['ackley'], ['ga'], ['best'], n_seeds=3)
+    # the unit 0 failed and was run again with the seed 999
+    merged = mergeRuns([getUnitsRun([999, 2], [0, 2], run_options), getUnitsRun([1], [1], run_options)])
+    assert list(merged['data'][SEEDS_KEY].unique()) == [999, 1, 2]
+    assert list(merged['best_gen'].keys()) == [('ackley', 'ga', 999), ('ackley', 'ga', 1), ('ackley', 'ga', 2)]
+
+def test_merge_keeps_the_snapshots(soo_parameters):
+    run_options = getRunOptions(['ackley'], ['ga'], ['best'], n_seeds=2)
+    runner = getRunner(run_options, soo_parameters, defer_pis=True)
+    runner.run()
+    saveRun(runner, 'run.pickle')
+    saved = loadPickle('run.pickle')
+    assert list(saved['snapshots'].keys()) == list(runner.snapshots.keys())
+    assert list(mergeRuns([saved])['snapshots'].keys()) == list(runner.snapshots.keys())
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.build import getRunner, getRunArgsList
+from backend.snapshots import FrontSnapshots
+from utils.defines import PI_KEY
+from tests.conftest import getRunOptions
+
+def test_deferred_same_as_inline(soo_parameters):
+    run_options = getRunOptions(['ackley'], ['ga'], ['best', 'avg_fitness'], n_seeds=2)
+    runner, deferred = getRunner(run_options, soo_parameters), getRunner(run_options, soo_parameters, defer_pis=True)
+    runner.run()
+    deferred.run()
+    # the snapshots are float32
+    pd.testing.assert_frame_equal(deferred.data, runner.data, rtol=1e-6)
+    assert all(snapshots.with_pops for snapshots in deferred.snapshots.values())
+
+def test_population_only_stored_if_needed(soo_parameters):
+    run_options = getRunOptions(['ackley'], ['ga'], ['best'])
+    runner = getRunner(run_options, soo_parameters, defer_pis=True)
+    runner.run()
+    snapshots = next(iter(runner.snapshots.values()))
+    assert not snapshots.with_pops and snapshots.pops == []
+    assert not FrontSnapshots.fromBytes(snapshots.toBytes()).with_pops
+
+    runner.addIndicators(getRunArgsList({**run_options, PI_KEY: ['-goal_achieved']}, soo_parameters))
+    assert runner.run_options[PI_KEY] == ['best', '-goal_achieved']
+    with pytest.raises(ValueError):
+        runner.addIndicators(getRunArgsList({**run_options, PI_KEY: ['avg_fitness']}, soo_parameters))
+
+def test_bytes_round_trip():
+    snapshots = FrontSnapshots(2, with_pops=True)
+    rng = np.random.default_rng(0)
+    for n_eval in [100, 200]:
+        snapshots.append(n_eval, rng.random((3, 2)), rng.random((10, 2)))
+    loaded = FrontSnapshots.fromBytes(snapshots.toBytes())
+    assert loaded.with_pops and loaded.n_evals == [100, 200]
+    assert all(np.array_equal(a, b) for a, b in zip(loaded.opts + loaded.pops, snapshots.opts + snapshots.pops))
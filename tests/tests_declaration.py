@@ -35,6 +35,8 @@ class Test():
         run_options_moo, parameters_moo = (self.options, self.parameters) if self.moo else ({}, {})
         
         self.main_window = MainWindow(run_options_soo, parameters_soo, run_options_moo, parameters_moo)
+        self.main_window.activeTabs().result_cache = None # always run the tests, instead of using cached results
+        self.main_window.activeTabs().save_run_logs = False # do not leave a run log folder for each test
         self.run_thread = self.main_window.activeTabs().getRunThread()
         self.run_thread.finished.connect(self.afterRun) if self.run_thread is not None else None
     
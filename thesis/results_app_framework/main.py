@@ -122,13 +122,14 @@ class FrameworkTest(QThread):
     def updateData(self, prob_id, algo_id, res, seed, callback: MyCallback):
         if res is None:
             return
-        run_length = len(callback.data[N_EVAL_KEY])
+        callback_data = callback.getData()
+        run_length = len(callback_data[N_EVAL_KEY])
 
         single_run_data = {SEEDS_KEY: [seed] * run_length,
                            PROB_KEY: [prob_id] * run_length,
                            ALGO_KEY: [algo_id] * run_length}
         
-        single_run_data.update(callback.data)
+        single_run_data.update(callback_data)
         if self.data.empty:
             self.data = pd.DataFrame(single_run_data)
         else:
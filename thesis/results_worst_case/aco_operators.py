@@ -1,6 +1,7 @@
 import numpy as np
 from pymoo.algorithms.moo.nsga2 import RankAndCrowding
 from thesis.results_worst_case.operators import setTransportsOnNewPaths
+from backend.seeding import getRandomState
 
 class RankAndCrowdingACO(RankAndCrowding):
 
@@ -19,6 +20,7 @@ class RankAndCrowdingACO(RankAndCrowding):
 
         # do the normal rank and crowding
         pop = super()._do(problem, pop, *args, n_survive=n_survive, **kwargs)
+        random_state = getRandomState(kwargs.get('algorithm'))
         
         # do the ACO update
         norm_D, n_cities, X, F = problem.norm_D, problem.n_cities, pop.get("X"), pop.get("F")
@@ -57,7 +59,7 @@ class RankAndCrowdingACO(RankAndCrowding):
             X_path[ant, 0] = curr_city
             for i in range(n_cities-1): 
                 # Update the path
-                new_city = np.random.choice(n_cities, p=probs_copy[curr_city, :] / probs_copy[curr_city, :].sum())
+                new_city = random_state.choice(n_cities, p=probs_copy[curr_city, :] / probs_copy[curr_city, :].sum())
                 X_path[ant, i+1] = new_city 
                 
                 # Prevent the ant from visiting the same city twice
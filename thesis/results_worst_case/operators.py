@@ -1,8 +1,14 @@
 from pymoo.operators.sampling.rnd import Sampling
 from pymoo.operators.crossover.ox import ox, Crossover
-from pymoo.operators.mutation.inversion import random_sequence, inversion_mutation, Mutation
+from pymoo.operators.mutation.inversion import inversion_mutation, Mutation
 from pymoo.core.repair import Repair
 import numpy as np
+from backend.seeding import getRandomState
+
+def randomSequence(n, random_state):
+    # same as pymoo's random_sequence, with the given random state
+    start, end = np.sort(random_state.choice(n, 2, replace=False))
+    return tuple([start, end])
 
 def setTransportsOnNewPaths(new_paths, X):
     
@@ -28,10 +34,11 @@ class MixedPermRandomSampling(Sampling):
 
     def _do(self, problem, n_samples, **kwargs):
         
+        random_state = getRandomState(kwargs.get('algorithm'))
         X = np.full((n_samples, problem.n_var), -1, dtype=int)
         for i in range(n_samples):
-            path = np.random.permutation(problem.n_cities)
-            transport = np.random.randint(0, len(problem.transport_options), problem.n_cities)
+            path = random_state.permutation(problem.n_cities)
+            transport = random_state.integers(0, len(problem.transport_options), problem.n_cities)
             X[i, :] = np.concatenate([path, transport])
 
         return X
@@ -56,6 +63,7 @@ class MixedOrderCrossover(Crossover):
 
     def _do(self, problem, X, **kwargs):
         
+        random_state = getRandomState(kwargs.get('algorithm'))
         X_path = X[:,:,:problem.n_cities].copy()
         n_parents, n_matings, n_cities = X_path.shape
         Y_path = np.full((self.n_offsprings, n_matings, n_cities), -1, dtype=int)
@@ -65,7 +73,7 @@ class MixedOrderCrossover(Crossover):
             n = len(a)
 
             # define the sequence to be used for crossover
-            start, end = random_sequence(n)
+            start, end = randomSequence(n, random_state)
 
             Y_path[0, i, :] = ox(a, b, seq=(start, end), shift=self.shift)
             Y_path[1, i, :] = ox(b, a, seq=(start, end), shift=self.shift)
@@ -95,13 +103,14 @@ class InversionFlipMutation(Mutation):
 
     def _do(self, problem, X, **kwargs):
         
+        random_state = getRandomState(kwargs.get('algorithm'))
         if not self.only_flip:
             # inversion part
             X_path = X[:,:problem.n_cities]
             Y_path = X_path.copy()
             for i, y in enumerate(X_path):
-                if np.random.random() < self.prob:
-                    seq = random_sequence(len(y))
+                if random_state.random() < self.prob:
+                    seq = randomSequence(len(y), random_state)
                     Y_path[i] = inversion_mutation(y, seq, inplace=True)
 
             Y = setTransportsOnNewPaths(Y_path, X)
@@ -112,8 +121,8 @@ class InversionFlipMutation(Mutation):
         Y_trp = Y[:,problem.n_cities:]
         # bitflip part
         prob_var = self.get_prob_var(problem)
-        flip = np.random.random(Y_trp.shape) < prob_var
-        flip_values = np.random.randint(0, len(problem.transport_options), Y_trp.shape)
+        flip = random_state.random(Y_trp.shape) < prob_var
+        flip_values = random_state.integers(0, len(problem.transport_options), Y_trp.shape)
         Y_trp[flip] = flip_values[flip]
         
         Y = np.concatenate([Y_path, Y_trp], axis=1)
@@ -17,8 +17,9 @@ class TSPplot(QPlot):
         algo_id = list(self.algos_dict.keys())[0]
         run_type = list(self.run_types)[0]
         seed = self.getSeedFromIds(self.prob_id, algo_id, run_type)
-        best_gen = self.run_thread.best_gen[(self.prob_id, algo_id, seed)]
-        X, F = best_gen['X'], best_gen['F']
+        # memory-mapped, only the row of the plotted path is read from X
+        key = (self.prob_id, algo_id, seed)
+        X, F = self.run_thread.best_gen.getArray(key, 'X'), self.run_thread.best_gen.getArray(key, 'F')
         
         fig, ax = plotTSP(self.prob_object, X, F, self.label, self.plot_best, self.f1_over_f2, ret=True)
         
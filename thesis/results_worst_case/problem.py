@@ -52,18 +52,20 @@ class MultiObjectiveMixedTSP(ElementwiseProblem):
         
         out['F'] = np.array([time, cost])
 
-def mutateMatrix(original, percentage=10):
+def mutateMatrix(original, random_state, percentage=10):
     # Create a matrix of the same shape as the original matrix with random values between 1 - percentage and 1 + percentage
     lower = -percentage / 100
     upper = percentage / 100
-    randoms = np.random.uniform(lower, upper, original.shape)
+    randoms = random_state.uniform(lower, upper, original.shape)
     return original * (1 + randoms)
 
 class RandomMultiMixedTSP(MultiObjectiveMixedTSP):
     
-    def __init__(self, n_cities=20, trp1 = 'car', trp2 = 'train', trp2_factor=5, trp3 = 'plane', trp3_factor=10, grid_size=1000,cost_mutation_perc=10, **kwargs):
+    def __init__(self, n_cities=20, trp1 = 'car', trp2 = 'train', trp2_factor=5, trp3 = 'plane', trp3_factor=10, grid_size=1000,cost_mutation_perc=10, seed=None, **kwargs):
     
-        cities = np.random.uniform(0, grid_size, (n_cities, 2))
+        # a random instance each time if the seed is None
+        random_state = np.random.default_rng(seed)
+        cities = random_state.uniform(0, grid_size, (n_cities, 2))
         
         # calculate the distance matrix
         trp1_T = cdist(cities, cities)
@@ -71,9 +73,9 @@ class RandomMultiMixedTSP(MultiObjectiveMixedTSP):
         trp3_T = 1/trp3_factor * trp1_T
                 
         # integer distance matrix
-        trp1_C = mutateMatrix(trp1_T, percentage=cost_mutation_perc)
-        trp2_C = mutateMatrix(trp1_T * trp2_factor, percentage=cost_mutation_perc)
-        trp3_C = mutateMatrix(trp1_T * trp3_factor, percentage=cost_mutation_perc)
+        trp1_C = mutateMatrix(trp1_T, random_state, percentage=cost_mutation_perc)
+        trp2_C = mutateMatrix(trp1_T * trp2_factor, random_state, percentage=cost_mutation_perc)
+        trp3_C = mutateMatrix(trp1_T * trp3_factor, random_state, percentage=cost_mutation_perc)
                 
         super().__init__(cities, {trp1: trp1_C, trp2: trp2_C, trp3: trp3_C}, {trp1: trp1_T, trp2: trp2_T, trp3: trp3_T}, **kwargs)
         
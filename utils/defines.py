@@ -19,6 +19,21 @@ RESULTS_FOLDER = 'tests/results'
 EXPECTED_RESULTS_FOLDER = 'tests/expected_results'      
 RESULTS_FILE = 'tests/results/results.txt'
 
+# folder where each run writes its RunLog while running
+RUN_LOGS_FOLDER = 'run_logs'
+
+# folder of the cache with the results of the (problem, algorithm, seed) units
+RESULT_CACHE_FOLDER = 'cache/results'
+
+# folder of the snapshots of the tables of default parameters (see backend/defaults.py)
+DEFAULTS_SNAPSHOT_FOLDER = 'cache/defaults'
+
+# folder of the cache of the computed reference directions (see get_reference_directions in backend/get.py)
+REF_DIRS_CACHE_FOLDER = 'cache/ref_dirs'
+
+# folder of the cache of the computed pareto fronts (see getParetoFront in backend/cache.py)
+PF_CACHE_FOLDER = 'cache/pareto_fronts'
+
 ############################################################ 
 ########################### KEYS ###########################
 ############################################################
@@ -63,6 +78,60 @@ VALUE_KEY = 'value'
 CONVERT_KEY = '(convert)' # key to know if a given string value of an arg is to be converted before initialing the class
 CONVERTIBLES = ['None','n_var', 'n_obj','prob_id','prob_object','prob_pf','algo_id','algo_object','term_id','term_object']
 
+############################################################ 
+########################### RUN ############################
+############################################################
+
+MAX_RANDOM_SEED = 100000 # random seeds are drawn from 0 to MAX_RANDOM_SEED-1
+STOP_ON_ERROR = False # cancel the whole run when a unit fails, instead of recording the error and running the other units
+UNIT_RETRIES = 0 # times a failed unit is run again with a different seed (see backend/seeding.py getRetrySeed)
+RUN_SEED_KEY = 'run_seed' # seed a failed unit was run with, the unit seed or a retry seed
+ERROR_TABLE_COLUMNS = ['index', PROB_KEY, ALGO_KEY, SEEDS_KEY, RUN_SEED_KEY, 'error', 'traceback'] # columns of Runner.getErrorTable
+# recording policies of MyCallback, the generations of each unit whose n_eval, n_gen and performance indicators are recorded
+RECORD_EVERY_GEN = 'every_gen' # every generation
+RECORD_EVERY_K_EVALS = 'every_k_evals' # the first generation after every k evaluations
+RECORD_LOG_SPACED = 'log_spaced' # the first generation after each of k log-spaced checkpoints per decade of evaluations
+RECORD_N_POINTS = 'n_points' # between k and 2k generations evenly spaced in evaluations
+RECORDING_POLICIES = [RECORD_EVERY_GEN, RECORD_EVERY_K_EVALS, RECORD_LOG_SPACED, RECORD_N_POINTS]
+RECORDING_POLICY = (RECORD_EVERY_GEN, None) # (policy, k). The final generation is always recorded
+PI_INPUTS = ('opt', 'pop', 'pop_feas', 'n_eval') # inputs a performance indicator can need besides opt_feas (see backend/indicators.py)
+PI_THREADS = 1 # threads that compute the performance indicators of a generation at the same time, 1 computes them one after another
+PI_CHUNK_ELEMENTS = 2**22 # max number of values computed at once by the distance indicators (GD, IGD, GD+, IGD+)
+PF_TREE_CACHE_SIZE = 8 # KD-trees of pareto fronts kept by each process for the distance indicators
+HV_MONTE_CARLO_MIN_OBJ = 6 # objectives from which the hypervolume is estimated with Monte-Carlo samples instead of computed exactly
+HV_MONTE_CARLO_SAMPLES = 100000 # samples of the Monte-Carlo hypervolume estimate
+HV_MONTE_CARLO_SEED = 0 # seed of the samples, so the estimate only depends on the front
+HV_CONFIDENCE_Z = 1.96 # z-score of the confidence interval of the Monte-Carlo hypervolume estimate (95%)
+DEFER_PI_COMPUTATION = False # store float32 front snapshots during the run and compute the performance indicators from them afterwards
+PROFILE_PHASES = False # record the wall and cpu time of the phases of each generation as extra columns of the data (see backend/profiling.py)
+# phases of a generation timed when profiling, each one with a wall and a cpu time column of the data (phase + suffix)
+PHASES = ['evaluation', 'mating', 'survival', 'callback', 'other']
+PHASE_WALL_SUFFIX = '_wall'
+PHASE_CPU_SUFFIX = '_cpu'
+BOOKKEEPING_PHASE = 'bookkeeping' # time the Runner spends storing the results of the units, only in the summary of the run
+# resources used by each unit, the columns of Runner.resources besides the seed, problem and algorithm (see getUnitResources)
+WALL_TIME_KEY = 'wall_time' # seconds
+CPU_TIME_KEY = 'cpu_time' # seconds
+PEAK_RSS_KEY = 'peak_rss' # MB, peak resident memory of the process while the unit ran (see PeakRSSSampler)
+EVALS_PER_SEC_KEY = 'evals_per_sec'
+RESOURCE_KEYS = [WALL_TIME_KEY, CPU_TIME_KEY, PEAK_RSS_KEY, EVALS_PER_SEC_KEY]
+RESOURCE_HIGHER_IS_BETTER = [EVALS_PER_SEC_KEY] # the other resources are better when lower
+PEAK_RSS_INTERVAL = 0.01 # seconds between the samples of the resident memory of the process while a unit runs
+N_WORKERS = 1 # number of processes used to run the (problem, algorithm, seed) units, 1 runs them in the RunThread itself
+SAVE_RUN_LOGS = True # write the results of each unit to a RunLog in RUN_LOGS_FOLDER as soon as it finishes
+BEST_GEN_FLOAT32 = False # store the X and F of the best generation of each unit as float32, halving their size (lossy)
+BEST_GEN_COMPRESSION = False # compress the X and F of the best generation of each unit with zlib (lossless, they are not memory-mapped)
+USE_RESULT_CACHE = True # reuse the results of units already run with the same parameters, seed and source of the classes of this repository
+RESULT_CACHE_MAX_SIZE = 1024**3 # bytes, the least recently used results are removed above this size
+RESULT_CACHE_EXCLUDED_PROBLEMS = ['moo_mixed_tsp'] # problems generated at random, never cached unless their seed is set
+USE_DEFAULTS_SNAPSHOT = True # load the tables of default parameters from a snapshot, generated again when pymoo or the registries change
+USE_REF_DIRS_CACHE = True # compute the reference directions of each factory and args once, kept in memory and in REF_DIRS_CACHE_FOLDER
+USE_PF_CACHE = True # compute the default pareto front of each problem once, kept in memory and in PF_CACHE_FOLDER
+USE_EXECUTION_SERVER = False # run in a separate process (see backend.server), started by the app, that keeps running when it is closed
+SERVER_ADDRESS = ('localhost', 6543) # local address of the execution server
+SERVER_AUTHKEY_FILE = '~/.pymoo_app/server_key' # random key of the user, generated on the first start, that the app and the execution server use to authenticate the connections
+SERVER_POLL_INTERVAL = 200 # ms between the progress requests of a run in the execution server
+
 ############################################################ 
 ########################### WINDOWS ########################
 ############################################################
@@ -0,0 +1,174 @@
+"""
+    Hypervolume engine used by the '-hv' performance indicator (minusHypervolume in utils/useful_classes.py).
+
+    The method depends on the number of objectives:
+    - 2 and 3 objectives: exact sweeps, O(n log n) for 2 objectives and O(n^2) for 3 (insertions in a 2D staircase).
+    - 4 to HV_MONTE_CARLO_MIN_OBJ-1 objectives: the exact algorithm of pymoo.
+    - HV_MONTE_CARLO_MIN_OBJ or more objectives: a Monte-Carlo estimate with HV_MONTE_CARLO_SAMPLES uniform samples of
+    the box between the lower bound and the reference point, with the half width of its confidence interval.
+    The samples are drawn from their own generator with a fixed seed, so the estimate only depends on the front and the
+    global random state of the run is not changed.
+"""
+import bisect
+
+import numpy as np
+
+from utils.defines import HV_MONTE_CARLO_MIN_OBJ, HV_MONTE_CARLO_SAMPLES, HV_MONTE_CARLO_SEED, HV_CONFIDENCE_Z, PI_CHUNK_ELEMENTS
+
+def hypervolume2D(F: np.ndarray, ref_point: np.ndarray) -> float:
+    """Exact hypervolume of the points (that dominate the reference point) with a sweep along the first objective"""
+
+    F = F[np.lexsort((F[:, 1], F[:, 0]))]
+    # height of the staircase after each point, which also skips the dominated points
+    y = np.minimum.accumulate(F[:, 1])
+    widths = np.diff(np.append(F[:, 0], ref_point[0]))
+    return float(np.sum(widths * (ref_point[1] - y)))
+
+class Staircase2D():
+    """Non-dominated 2D points sorted by the first objective, with the area they dominate up to the reference point"""
+    def __init__(self, ref_point: np.ndarray):
+        self.ref_x, self.ref_y = ref_point
+        self.xs, self.ys = [], []
+        self.area = 0.0
+
+    def insert(self, x: float, y: float):
+
+        k = bisect.bisect_left(self.xs, x)
+        # dominated by the previous point or by a point with the same x (or equal to it)
+        if (k > 0 and self.ys[k-1] <= y) or (k < len(self.xs) and self.xs[k] == x and self.ys[k] <= y):
+            return
+        prev_y = self.ys[k-1] if k > 0 else self.ref_y
+        # remove the next points dominated by the new one, adding the area between them and the new one
+        m = k
+        while m < len(self.xs) and self.ys[m] >= y:
+            m += 1
+        next_xs = self.xs[k:m] + [self.xs[m] if m < len(self.xs) else self.ref_x]
+        heights = [prev_y] + self.ys[k:m]
+        lefts = [x] + self.xs[k:m]
+        self.area += sum((right - left) * (height - y) for left, right, height in zip(lefts, next_xs, heights))
+        self.xs[k:m], self.ys[k:m] = [x], [y]
+
+def hypervolume3D(F: np.ndarray, ref_point: np.ndarray) -> float:
+    """Exact hypervolume of the points (that dominate the reference point) with a sweep along the third objective,
+    adding each point to the 2D staircase of the first two objectives"""
+
+    F = F[np.argsort(F[:, 2], kind='stable')]
+    staircase = Staircase2D(ref_point[:2])
+    heights = np.diff(np.append(F[:, 2], ref_point[2]))
+    volume = 0.0
+    for (x, y, _), height in zip(F, heights):
+        staircase.insert(x, y)
+        volume += staircase.area * height
+    return volume
+
+def hypervolumeExact(F: np.ndarray, ref_point: np.ndarray) -> float:
+    """Exact hypervolume of the points that dominate the reference point"""
+
+    if len(F) == 0:
+        return 0.0
+    if F.shape[1] == 2:
+        return hypervolume2D(F, ref_point)
+    if F.shape[1] == 3:
+        return hypervolume3D(F, ref_point)
+    from pymoo.vendor.hv import HyperVolume
+    return HyperVolume(ref_point).compute(F)
+
+class HypervolumeEngine():
+    """
+        Computes the hypervolume of the successive fronts of a run (see the module docstring for the methods),
+        reusing the work of the previous front:
+
+        - If the front did not change, its value is returned again.
+        - With the Monte-Carlo estimate and a known lower bound of the fronts (the ideal point), the samples are drawn
+        once, and the number of points that dominate each sample is kept, so only the points that were added to or
+        removed from the front are compared with the samples. The counts are exact, so the estimate is the same as
+        computing it from scratch. If a point is below the lower bound, the front is estimated from scratch in the
+        box of its own points.
+
+        Attributes
+        ----------
+        - ref_point: Reference point.
+        - lower: Lower bound of the fronts, None if unknown.
+        - half_width: Half width of the HV_CONFIDENCE_Z confidence interval of the last Monte-Carlo estimate,
+        0 for the exact methods.
+
+        Important Methods
+        -----------------
+        - do(F) -> float: Hypervolume of the points of F. They must be non-dominated for the exact methods of 4 or more
+        objectives (the other methods also accept dominated points).
+    """
+    def __init__(self, ref_point: np.ndarray, lower: np.ndarray = None, n_samples: int = HV_MONTE_CARLO_SAMPLES,
+                 seed: int = HV_MONTE_CARLO_SEED):
+        self.ref_point = np.asarray(ref_point, dtype=float)
+        self.lower = np.asarray(lower, dtype=float) if lower is not None else None
+        self.n_samples = n_samples
+        self.seed = seed
+        self.half_width = 0.0
+        self.points = None # rows of the last front, as bytes
+        self.value = None # hypervolume of the last front
+        self.samples = None # Monte-Carlo samples of the box [lower, ref_point]
+        self.counts = None # number of points of the last front that dominate each sample
+
+    def do(self, F: np.ndarray) -> float:
+
+        # only the points that dominate the reference point add volume, and repeated points only once
+        F = np.unique(F[np.all(F <= self.ref_point, axis=1)], axis=0)
+        points = {row.tobytes(): row for row in F}
+        if self.points is not None and points.keys() == self.points.keys():
+            return self.value
+
+        if F.shape[1] < HV_MONTE_CARLO_MIN_OBJ or self.lower is None or np.any(F < self.lower):
+            # the counts of the samples are only kept while the incremental estimate is used
+            self.counts = None
+            self.value = hypervolumeExact(F, self.ref_point) if F.shape[1] < HV_MONTE_CARLO_MIN_OBJ else self.monteCarlo(F)
+        else:
+            self.value = self.monteCarloIncremental(points)
+        self.points = points
+
+        return self.value
+
+    def getSamples(self, lower: np.ndarray) -> np.ndarray:
+        return np.random.default_rng(self.seed).uniform(lower, self.ref_point, size=(self.n_samples, len(self.ref_point)))
+
+    def countDominating(self, F: np.ndarray, samples: np.ndarray) -> np.ndarray:
+        """Number of points of F that dominate each sample, in chunks of at most PI_CHUNK_ELEMENTS comparisons"""
+
+        counts = np.zeros(len(samples), dtype=np.int32)
+        if len(F) == 0:
+            return counts
+        chunk = max(1, PI_CHUNK_ELEMENTS // F.size)
+        for i in range(0, len(samples), chunk):
+            counts[i:i+chunk] = np.all(F[None, :, :] <= samples[i:i+chunk, None, :], axis=2).sum(axis=1)
+        return counts
+
+    def estimate(self, counts: np.ndarray, lower: np.ndarray) -> float:
+
+        box_volume = np.prod(self.ref_point - lower)
+        p = np.mean(counts > 0)
+        self.half_width = HV_CONFIDENCE_Z * box_volume * np.sqrt(p * (1 - p) / len(counts))
+        return box_volume * p
+
+    def monteCarlo(self, F: np.ndarray) -> float:
+
+        if len(F) == 0:
+            self.half_width = 0.0
+            return 0.0
+        lower = F.min(axis=0) if self.lower is None else np.minimum(F.min(axis=0), self.lower)
+        return self.estimate(self.countDominating(F, self.getSamples(lower)), lower)
+
+    def monteCarloIncremental(self, points: dict) -> float:
+
+        if self.samples is None:
+            self.samples = self.getSamples(self.lower)
+        old = self.points if self.counts is not None else {}
+        added = [row for key, row in points.items() if key not in old]
+        removed = [row for key, row in old.items() if key not in points]
+        # start again if most of the front changed
+        if self.counts is None or len(added) + len(removed) > len(points):
+            self.counts = self.countDominating(np.array(list(points.values())).reshape(-1, len(self.ref_point)), self.samples)
+        else:
+            if len(added) > 0:
+                self.counts += self.countDominating(np.array(added), self.samples)
+            if len(removed) > 0:
+                self.counts -= self.countDominating(np.array(removed), self.samples)
+        return self.estimate(self.counts, self.lower)
@@ -1,4 +1,18 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
 import numpy as np
+from scipy.spatial import cKDTree
+from pymoo.indicators.gd import GD
+from pymoo.indicators.gd_plus import GDPlus
+from pymoo.indicators.igd import IGD
+from pymoo.indicators.igd_plus import IGDPlus
+from pymoo.indicators.distance_indicator import euclidean_distance
+from pymoo.util.nds.non_dominated_sorting import NonDominatedSorting
+
+from utils.hypervolume import HypervolumeEngine
+from utils.defines import PI_CHUNK_ELEMENTS, PF_TREE_CACHE_SIZE
 
 ################################################################################################################################
 #####################################################    PROBLEMS    ###########################################################
@@ -21,17 +35,18 @@ class KnapsackMulti(Knapsack):
 
 class RandomKnapsackSingle(Knapsack):
     def __init__(self, n_vars=3, seed=1):
-        np.random.seed(seed)
-        P = np.random.randint(1, 100, size=n_vars)
-        W = np.random.randint(1, 100, size=n_vars)
+        # own random state, so the global one is not reset
+        random_state = np.random.RandomState(seed)
+        P = random_state.randint(1, 100, size=n_vars)
+        W = random_state.randint(1, 100, size=n_vars)
         C = int(np.sum(W) / 10)
         super().__init__(n_vars, W, P, C)
 
 class RandomKnapsackMulti(KnapsackMulti):
     def __init__(self, n_vars=3, seed=1):
-        np.random.seed(seed)
-        P = np.random.randint(1, 100, size=n_vars)
-        W = np.random.randint(1, 100, size=n_vars)
+        random_state = np.random.RandomState(seed)
+        P = random_state.randint(1, 100, size=n_vars)
+        W = random_state.randint(1, 100, size=n_vars)
         C = int(np.sum(W) / 10)
         super().__init__(n_vars, W, P, C)
 
@@ -160,12 +175,14 @@ class MyNoCrossover(Crossover):
 class BestFitness():
         """used in the case of single-objective optimization,just for code compatibility. 
         Only returns the input, because it should consist of only the best solution"""
+        inputs = ()
         def __init__(self):
             pass
         
         def do(self, opt_feas, **kwargs):
             return opt_feas[0][0]
 class AvgPopFitness():
+    inputs = ('pop',)
     def __init__(self):
         pass
     
@@ -173,6 +190,7 @@ class AvgPopFitness():
         return np.mean(pop) if len(pop) > 0 else np.nan
 
 class MinusGoalAchieved():
+    inputs = ()
     def __init__(self, goal=1.1):
         self.goal = goal
     
@@ -180,6 +198,7 @@ class MinusGoalAchieved():
         return -1 if len(opt_feas) > 0 and opt_feas[0][0] <= self.goal else 0
         
 class EvalsOnGoal():
+    inputs = ('n_eval',)
     def __init__(self, goal=1.1):
         self.goal = goal
         self.n_eval = 0
@@ -201,10 +220,121 @@ class EvalsOnGoal():
 from pymoo.indicators.hv import Hypervolume
 
 class minusHypervolume(Hypervolume):
+    """Minus the hypervolume, computed with a HypervolumeEngine (see utils/hypervolume.py): exact sweeps for 2 and 3
+    objectives and a Monte-Carlo estimate for many objectives, reusing the work of the previous generation"""
     def __init__(self, zero_to_one = True, **kwargs):
         super().__init__(zero_to_one=zero_to_one, **kwargs)
+        # the ideal point is the lower bound of the fronts (normalized to zeros if zero_to_one)
+        self.engine = HypervolumeEngine(self.ref_point, self.ideal)
+    def _do(self, F):
+        if self.nds:
+            F = F[NonDominatedSorting().do(F, only_non_dominated_front=True)]
+        return - self.engine.do(F)
+
+PF_TREES = OrderedDict() # hash of the scaled pareto front -> cKDTree, shared by the indicators of the same front in a process
+PF_TREES_LOCK = threading.Lock() # the indicators can be computed in several threads (see PI_THREADS)
+
+def getPFTree(pf: np.ndarray, pf_hash: str) -> cKDTree:
+    """Get the KD-tree of the pareto front, building it only the first time, keeping the PF_TREE_CACHE_SIZE last used ones"""
+    
+    with PF_TREES_LOCK:
+        if pf_hash in PF_TREES:
+            PF_TREES.move_to_end(pf_hash)
+        else:
+            PF_TREES[pf_hash] = cKDTree(pf)
+            if len(PF_TREES) > PF_TREE_CACHE_SIZE:
+                PF_TREES.popitem(last=False)
+        return PF_TREES[pf_hash]
+
+class FastDistanceIndicator():
+    """
+        Replaces the _do of the pymoo distance indicators (GD, IGD, GD+, IGD+), which compute the whole matrix of
+        distances between the pareto front and F, with the same values (up to floating point error) computed by parts:
+        
+        - GD: the nearest point of the front to each point of F, with a KD-tree of the front that is built once and
+        shared by all the generations, seeds and indicators of the same front (see getPFTree).
+        - IGD: the nearest point of F to each point of the front, with a KD-tree of F, which is small.
+        - GD+ and IGD+: the modified distance is not a metric, so it can not use a KD-tree. It is computed exactly, 
+        a chunk of rows of the distance matrix at a time.
+        
+        The queries are done in chunks of at most PI_CHUNK_ELEMENTS values, so the memory does not grow with the size of
+        the front. The constructor is the one of the pymoo indicator, so the parameters are the same. Only the hash of
+        the front is kept in the indicator, so the worker processes build their own trees.
+        
+        doBatch computes the GD of many fronts (e.g. the front snapshots of a run) with a single query of the tree.
+    """
+    inputs = ()
+    
+    def getNorm(self):
+        if self.norm_by_dist:
+            assert self.ideal is not None and self.nadir is not None, "If norm_by_dist is enabled ideal and nadir must be set!"
+            return self.nadir - self.ideal
+        return 1.0
+    
+    def getTree(self, pf: np.ndarray) -> cKDTree:
+        if getattr(self, 'pf_hash', None) is None:
+            self.pf_hash = hashlib.sha1(np.ascontiguousarray(pf).tobytes() + str(pf.shape).encode()).hexdigest()
+        return getPFTree(pf, self.pf_hash)
+    
     def _do(self, F):
-        return - super()._do(F)
+        
+        norm = self.getNorm()
+        pf, F = self.pf / norm, F / norm
+        if self.dist_func is euclidean_distance:
+            if self.axis == 0:
+                distances = self.queryTree(self.getTree(pf), F)
+            else:
+                distances = self.queryTree(cKDTree(F), pf)
+        else:
+            # rows are the points the minimum is taken for, and d = F - pf as in modified_distance
+            distances = self.modifiedDistances(F, pf, sign=1) if self.axis == 0 else self.modifiedDistances(pf, F, sign=-1)
+        
+        return np.mean(distances)
+    
+    def doBatch(self, F_list: list) -> list:
+        
+        if not (self.dist_func is euclidean_distance and self.axis == 0) or len(F_list) == 0:
+            return [self.do(F) for F in F_list]
+        
+        F_list = [F[None, :] if F.ndim == 1 else F for F in F_list]
+        sizes = np.array([len(F) for F in F_list])
+        if np.any(sizes == 0):
+            return [self.do(F) for F in F_list]
+        norm = self.getNorm()
+        pf, F = self.pf / norm, self.normalization.forward(np.concatenate(F_list)) / norm
+        distances = self.queryTree(self.getTree(pf), F)
+        
+        return list(np.add.reduceat(distances, np.cumsum(sizes) - sizes) / sizes)
+    
+    @staticmethod
+    def queryTree(tree: cKDTree, points: np.ndarray) -> np.ndarray:
+        
+        chunk = max(1, PI_CHUNK_ELEMENTS // max(points.shape[1], 1))
+        return np.concatenate([tree.query(points[i:i+chunk])[0] for i in range(0, len(points), chunk)])
+        
+    @staticmethod
+    def modifiedDistances(rows: np.ndarray, others: np.ndarray, sign: int) -> np.ndarray:
+        """Minimum over the others of the norm of max(sign * (row - other), 0) for each row"""
+        
+        chunk = max(1, PI_CHUNK_ELEMENTS // max(others.size, 1))
+        distances = np.empty(len(rows))
+        for i in range(0, len(rows), chunk):
+            d = sign * (rows[i:i+chunk, None, :] - others[None, :, :])
+            np.maximum(d, 0, out=d)
+            distances[i:i+chunk] = np.sqrt(np.min(np.einsum('ijk,ijk->ij', d, d), axis=1))
+        return distances
+
+class FastGD(FastDistanceIndicator, GD):
+    pass
+
+class FastGDPlus(FastDistanceIndicator, GDPlus):
+    pass
+
+class FastIGD(FastDistanceIndicator, IGD):
+    pass
+
+class FastIGDPlus(FastDistanceIndicator, IGDPlus):
+    pass
 
 ################################################################################################################################
 #####################################################   TERMINATIONS   #########################################################
@@ -241,127 +371,3 @@ class MinFitnessTermination(Termination):
         opt_feas = opt[opt_feas_idx]
         
         return 1 if len(opt_feas) > 0 and opt_feas[0][0] <= self.f_threshold else 0
-
-################################################################################################################################
-#######################################################    PLOTTING   ###########################################################
-################################################################################################################################
-
-from pymoo.visualization.scatter import Plot
-from pymoo.visualization.fitness_landscape import FitnessLandscape
-from pymoo.util.misc import all_combinations
-from utils.utils import MyMessageBox
-class MyFitnessLandscape(Plot):
-    def __init__(self,
-                 problem,
-                 n_samples_2D=500,
-                 n_samples_3D=30,
-                 colorbar=False,
-                 contour_levels=30,
-                 max_n_solutions=100,
-                 show_best_sol=True,
-                 zoom_on_solutions=False,
-                 **kwargs):
-
-        super().__init__(**kwargs)
-        self.problem = problem
-        self.n_samples_2D = n_samples_2D
-        self.n_samples_3D = n_samples_3D
-        self.colorbar = colorbar
-        self.sets_of_points = []
-        self.sets_labels = []
-        self.contour_levels = contour_levels
-        self.max_n_solutions = max_n_solutions
-        self.show_best_sol = show_best_sol
-        self.zoom_on_solutions = zoom_on_solutions
-
-        self.kwargs_surface = dict(cmap="summer", rstride=1, cstride=1, alpha=0.2)
-        self.kwargs_contour = dict(linestyles="solid", offset=-1)
-        self.kwargs_contour_labels = None
-
-    def _do(self):
-
-        problem, sets_of_points = self.problem, self.sets_of_points
-
-        # find the min and max values of the decision variable between the sets of points
-        if self.zoom_on_solutions and sets_of_points != []:
-            x_min = min([min(points[:, 0]) for points in sets_of_points])
-            x_max = max([max(points[:, 0]) for points in sets_of_points])
-        else:
-            x_min, x_max = problem.xl[0], problem.xu[0]
-
-        if problem.n_var == 1 and problem.n_obj == 1:
-
-            self.init_figure()
-            X = np.linspace(x_min, x_max, self.n_samples_2D)[:, None]
-            Z = problem.evaluate(X, return_values_of=["F"])
-            self.ax.plot(X, Z, alpha=0.2)
-            self.ax.set_xlabel("x")
-            self.ax.set_ylabel("f(x)")
-            
-            self.plot_points()
-
-        elif problem.n_var == 2 and problem.n_obj == 1:
-            n_samples = self.n_samples_3D
-
-            if self.zoom_on_solutions and sets_of_points != []:
-                y_min = min([min(points[:, 1]) for points in sets_of_points])
-                y_max = max([max(points[:, 1]) for points in sets_of_points])
-            else:
-                y_min, y_max = problem.xl[1], problem.xu[1]
-            
-            A = np.linspace(x_min, x_max, n_samples)
-            B = np.linspace(y_min, y_max, n_samples)
-            X = all_combinations(A, B)
-
-            F = np.reshape(problem.evaluate(X, return_values_of=["F"]), (n_samples, n_samples))
-
-            _X = X[:, 0].reshape((n_samples, n_samples))
-            _Y = X[:, 1].reshape((n_samples, n_samples))
-            _Z = F.reshape((n_samples, n_samples))
-
-            self.init_figure(plot_3D=True)
-
-            surf = self.ax.plot_surface(_X, _Y, _Z, **self.kwargs_surface)
-            if self.colorbar:
-                self.fig.colorbar(surf)
-            
-            self.plot_points()
-        else:
-            raise Exception("Only landscapes of problems with one or two variables and one objective can be visualized.") #@IgnoreException
-
-    def plot_points(self):
-        
-        for points, (best_label, gen_label), in zip(self.sets_of_points, self.sets_labels):
-            # if points have 2 dimensions, add the third dimension with the fitness value
-            best_label, gen_label = best_label, gen_label
-            if len(points[0]) in [2,3]:
-                x,y = points[1:, 0], points[1:, 1]
-                best_x, best_y = points[0, 0], points[0, 1]
-                if len(points[0]) == 2:
-                    self.ax.scatter(x, y, s=10, label=gen_label, alpha=0.5)
-                    self.ax.scatter(best_x, best_y, s=50, label=best_label, alpha=1) if self.show_best_sol else None
-                if len(points[0]) == 3:
-                    z, best_z = points[1:, 2], points[0, 2]
-                    self.ax.scatter(x, y, z, s=20, label=gen_label, alpha=0.5)
-                    self.ax.scatter(best_x, best_y, best_z, s=100, label=best_label, alpha=1) if self.show_best_sol else None
-            else:
-                self.sets_of_points = []
-                MyMessageBox(f"Solutions have {len(points[0])-1} dimensions in decision space, only 1 or 2 are supported")
-                    
-    def add(self, points, label):
-        
-        self.legend = True
-        
-        # get the points coordinates from the points arg
-        best_point = points[0, :]
-        
-        # if the number of points is greater than 10, get a random sample of 10 points
-        cutoff = 100
-        if len(points[:, 0]) > cutoff:
-            points = points[np.random.choice(len(points[1:, 0]), cutoff, replace=False), :]
-        gen_label = label
-        best_label = label + f" (Best sol)"
-        
-        points = np.concatenate((best_point[np.newaxis,:], points))
-        self.sets_of_points.append(points)  
-        self.sets_labels.append((best_label, gen_label))
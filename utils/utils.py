@@ -1,4 +1,3 @@
-from PyQt5.QtWidgets import QFileDialog, QMessageBox
 import pickle
 import numpy as np
 
@@ -21,20 +20,22 @@ def setCombobox(combobox, items=None, center_items=False, index_changed_function
         combobox.lineEdit().setReadOnly(True)
     if index_changed_function is not None:
         combobox.currentIndexChanged.connect(index_changed_function)
-class MyMessageBox(QMessageBox):
-    """A class to show a message box with the given text and title."""
-    def __init__(self, text, title="Warning", warning_icon=True):
-        super().__init__()
-
-        self.setIcon(QMessageBox.Warning) if warning_icon else None
-        self.setText(text)
-        self.setWindowTitle(title)
-        self.setStandardButtons(QMessageBox.Ok)
-        self.exec_()
+def MyMessageBox(text, title="Warning", warning_icon=True):
+    """Show a message box with the given text and title. Qt is only imported when a message is shown, 
+    so the modules that use it can be imported in headless runs"""
+    from PyQt5.QtWidgets import QMessageBox
+    
+    message_box = QMessageBox()
+    message_box.setIcon(QMessageBox.Warning) if warning_icon else None
+    message_box.setText(text)
+    message_box.setWindowTitle(title)
+    message_box.setStandardButtons(QMessageBox.Ok)
+    message_box.exec_()
 
 def myFileManager(window_title, file_to_save_name=False, data_to_save=False, default_suffix=".pickle", name_filter="Pickle Files (*.pickle)", keys_to_check=None, moo = None, save_csv_index=False):
     """Open a file dialog to save or load a file. If file_to_save_name is given, save the file. If not, load the file and return the data.
     If keys_to_check is given, check if the loaded dictionary has the correct keys. If moo is given, check if the loaded moo is the same as the given moo."""
+    from PyQt5.QtWidgets import QFileDialog
     
     if (keys_to_check is not None) ^ (moo is not None):
         ValueError("keys_to_check and moo args must be used together in myFileManager function")